@@ -0,0 +1,80 @@
+# Microbenchmark for AppCacheController lookups.
+#
+# Run from the api directory:
+#   python Test/bench_app_cache.py [--apps 100000] [--companies 1000] [--lookups 200000]
+#
+# Prints the per-lookup cost of the indexed cache at increasing fleet sizes, next to the
+# linear scan the cache used to do for super admin key lookups.
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utilities.settings import initialize_config
+initialize_config(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controller.base.types import UserType
+from src.controller.cacheController.appCacheController import AppCacheController
+
+
+def make_rows(apps, companies):
+    return [
+        {"aid": aid, "name": f"app{aid}", "ip": "10.0.0.1", "rest_port": 8000, "ws_port": 9000, "prof_port": 7000,
+         "zid": f"z{aid}", "key": f"key{aid}", "desc": "", "enable": aid % 2, "cid": aid % companies + 1, "cname": f"c{aid % companies + 1}"}
+        for aid in range(1, apps + 1)
+    ]
+
+
+def linear_get_app_key(rows_by_cid, aid):
+    # Previous implementation: scan every company's list
+    for _rows in rows_by_cid.values():
+        for _row in _rows:
+            if _row["aid"] == aid:
+                return _row["key"]
+    return None
+
+
+def bench(label, func, args, lookups):
+    _started = time.perf_counter()
+    for _arg in args:
+        func(*_arg)
+    _elapsed = time.perf_counter() - _started
+    print(f"  {label:<34} {_elapsed / lookups * 1e9:>10.0f} ns/op")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=100000)
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=200000)
+    args = parser.parse_args()
+
+    cache = AppCacheController()
+    random.seed(1)
+
+    for apps in sorted({1000, 10000, args.apps}):
+        rows = make_rows(apps, args.companies)
+        cache.create_app_cache(rows)
+        aids = [random.randint(1, apps) for _ in range(args.lookups)]
+        cids = [aid % args.companies + 1 for aid in aids]
+
+        print(f"{apps} apps / {args.companies} companies")
+        bench("get_app_key(aid, '*')", cache.get_app_key, [(aid, "*") for aid in aids], args.lookups)
+        bench("get_app_key(aid, cid)", cache.get_app_key, list(zip(aids, cids)), args.lookups)
+        bench("getAppById super admin", cache.getAppById, [(aid, "*", UserType.SUPER_ADMIN.value) for aid in aids], args.lookups)
+        bench("getAppById user", cache.getAppById, [(aid, cid, UserType.USER.value) for aid, cid in zip(aids, cids)], args.lookups)
+        bench("getAllApps admin (one company)", cache.getAllApps, [(cid, UserType.ADMIN.value) for cid in cids], args.lookups)
+
+        rows_by_cid = {}
+        for row in rows:
+            rows_by_cid.setdefault(row["cid"], []).append(row)
+        scans = max(1, min(args.lookups, 2000000 // apps))
+        bench("linear scan (previous, '*')", linear_get_app_key, [(rows_by_cid, aid) for aid in aids[:scans]], scans)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Memory benchmark for the cached app rows.
+#
+# Run from the api directory:
+#   python Test/bench_record_memory.py [--rows 10000 100000 1000000] [--companies 1000]
+#
+# Prints the bytes per row (tracemalloc, values included) of the row dicts the cache used to hold
+# and of the records it holds now, then the cost of encoding a list body from each.
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utilities.settings import initialize_config
+initialize_config(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.controller.base.controllerBase import ControllerBase
+from src.utilities.records import make_record
+
+
+def make_row(aid, companies):
+    # same columns and value shapes as SELECT a.*, c.name AS cname
+    return {"aid": aid, "name": f"app{aid}", "ip": f"10.0.{aid // 256 % 256}.{aid % 256}", "rest_port": 8000 + aid % 1000, "ws_port": 9000 + aid % 1000,
+            "prof_port": 7000 + aid % 1000, "zid": f"z{aid}", "key": f"key{aid:032d}", "desc": "", "enable": aid % 2, "cid": aid % companies + 1,
+            "cname": f"c{aid % companies + 1}"}
+
+
+def dict_rows(rows, companies):
+    return [make_row(aid, companies) for aid in range(1, rows + 1)]
+
+
+def dict_rows_with_public_copy(rows, companies):
+    # previous cache: the row (with key) plus a copy without the key shared by every read
+    _held = []
+    for aid in range(1, rows + 1):
+        _row = make_row(aid, companies)
+        _held.append((_row, {k: v for k, v in _row.items() if k != "key"}))
+    return _held
+
+
+def records(rows, companies):
+    return [make_record("app", make_row(aid, companies), hidden=("key",)) for aid in range(1, rows + 1)]
+
+
+def measure(build, rows, companies):
+    gc.collect()
+    tracemalloc.start()
+    _held = build(rows, companies)
+    _size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del _held
+    gc.collect()
+    return _size / rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--companies", type=int, default=1000)
+    args = parser.parse_args()
+
+    builds = [("dict rows", dict_rows), ("dict rows + public copy (previous)", dict_rows_with_public_copy), ("records, JSON included", records)]
+    print(f"{'rows':>9}  " + "  ".join(f"{label:>34}" for label, _ in builds) + "   (bytes per row)")
+    for rows in args.rows:
+        print(f"{rows:>9}  " + "  ".join(f"{measure(build, rows, args.companies):>34.0f}" for _, build in builds))
+
+    rows = min(args.rows)
+    _dicts = [{k: v for k, v in make_row(aid, args.companies).items() if k != "key"} for aid in range(1, rows + 1)]
+    _records = records(rows, args.companies)
+    _started = time.perf_counter()
+    _encoded = ControllerBase().encode_response(_dicts)
+    _dict_elapsed = time.perf_counter() - _started
+    _started = time.perf_counter()
+    _joined = b'{"data":[' + b",".join(_record.json for _record in _records) + b']}'
+    _record_elapsed = time.perf_counter() - _started
+    assert json.loads(_encoded) == json.loads(_joined)
+    print(f"list body of {rows} rows: encode_response {_dict_elapsed * 1e3:.1f} ms, join of record JSON {_record_elapsed * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
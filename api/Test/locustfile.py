@@ -6,6 +6,7 @@ class FastAPIUser(HttpUser):
     auth_token = None
 
     def on_start(self):
+        self.etags = {}
         if not FastAPIUser.auth_token:
             # Perform login and store the token
             with self.client.post("/auth/login", json={"userName": "user", "password": "123456"}, catch_response=True) as response:
@@ -19,14 +20,19 @@ class FastAPIUser(HttpUser):
 
     # get request
     def get_request_with_auth(self, method, url, **kwargs):
+        headers = kwargs.pop("headers", {})
         if self.auth_token:
-            headers = kwargs.pop("headers", {})
             headers["Authorization"] = f"Bearer {self.auth_token}"
-            kwargs["headers"] = headers
+        # poll like the dashboard does: send the last ETag, so unchanged lists come back as 304
+        if method == "GET" and url in self.etags:
+            headers["If-None-Match"] = self.etags[url]
+        kwargs["headers"] = headers
         with self.client.request(method, url, catch_response=True, **kwargs) as response:
             if response.status_code >= 400:
                 response.failure(f"{method} {url} failed: {response.text}")
             else:
+                if response.headers.get("ETag"):
+                    self.etags[url] = response.headers["ETag"]
                 response.success()
         return response
 
@@ -34,28 +40,28 @@ class FastAPIUser(HttpUser):
     @task
     def getAllApplication(self):
         response = self.get_request_with_auth("GET", "/application")
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             response.failure(f"GET /api/v1/application failed: {response.text}")
 
    
     @task
     def getAllAppUnits(self):
         response = self.get_request_with_auth("GET", "/application/appunits/2")
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             response.failure(f"GET /api/v1/application/appUnits/2 failed: {response.text}")
 
    
     @task
     def getAllCompany(self):
         response = self.get_request_with_auth("GET", "/company")
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             response.failure(f"GET /api/v1/company failed: {response.text}")
 
    
     @task
     def getAllUsers(self):
         response = self.get_request_with_auth("GET", "/user")
-        if response.status_code != 200:
+        if response.status_code not in (200, 304):
             response.failure(f"GET /api/v1/user failed: {response.text}")
 
    
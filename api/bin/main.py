@@ -44,14 +44,23 @@ sys.path.insert(0, f"{base_dir}/src/controller/cacheController/")  # add the cur
 
 from src.model.app_manager import AppManager
 from src.model.db_manager import DBManager
+from src.model.change_manager import ChangeManager
 from src.routers.login import LoginRoute
 from src.routers.app import AppRoute
 from src.routers.company import CompanyRoute
 from src.routers.user import UserRoute
 from src.routers.application import ApplicationRoute 
+from src.routers.admin import AdminRoute
+from src.routers.ws import WsRoute
+from src.routers.events import EventRoute
 from src.controller.cacheController.appCacheController import AppCacheController, PortCacheController
+from src.controller.cacheController.metricsScraper import MetricsScraper
+from src.controller.cacheController.sessionController import SessionController
+from src.controller.cacheController.invalidationBus import InvalidationBus
 from src.utilities.settings import initialize_config, get_all_config
 from src.utilities.logger import start_logger
+from src.utilities.upstream_client import UpstreamClient
+from src.ws.websocket_hub import WebSocketHub
 
 database_mgr = None
 configuration = None 
@@ -114,6 +123,7 @@ def Set_CORS():
             allow_credentials=True,
             allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             allow_headers=["*"],
+            expose_headers=["X-Auth-Token"],
         )
     except:
         pass
@@ -142,6 +152,15 @@ app.include_router(router=app_route.router, prefix="/app", tags=["auth"])
 login_route = LoginRoute(base_dir)
 app.include_router(router=login_route.router, prefix="/auth")
 
+admin_route = AdminRoute(base_dir)
+app.include_router(router=admin_route.router, prefix="/admin", tags=["auth"])
+
+ws_route = WsRoute(base_dir)
+app.include_router(router=ws_route.router, prefix="/ws")
+
+event_route = EventRoute(base_dir)
+app.include_router(router=event_route.router, prefix="/events", tags=["auth"])
+
 
 Set_CORS()
 
@@ -169,6 +188,12 @@ def startup() -> None:
     else:
         logging.info(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [WARNING] - {configuration['APP_NAME']} started successfully.")
         logging.info(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [WARNING] - Serving on {configuration['HOST']}:{configuration['PORT']}")
+        # evicted companies are read back from the database
+        app_cache.set_loader(app_mgr)
+        # read before the caches are loaded, the invalidation bus replays what other workers commit meanwhile
+        _journal_range, _err = ChangeManager(base_dir).getVersionRange()
+        if _err:
+            logging.error(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [ERROR] - Failed to read the change journal.")
         _app_data, _err = app_mgr.getAllApps()
         if _err:
             logging.error(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [ERROR] - Failed to fetch app data.")
@@ -176,6 +201,10 @@ def startup() -> None:
             app_cache.create_app_cache(_app_data) 
             logging.info(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [WARNING] - app Table data successfully loaded to cache")
             
+        _result, _err = ChangeManager(base_dir).pruneChanges(int(configuration.get("CHANGE_LOG_RETENTION", 100000)))
+        if _err:
+            logging.error(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [ERROR] - Failed to prune the change journal.")
+
         _app_ports, _err = app_mgr.getAppPorts()
         if _err:
             logging.error(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [ERROR] - Failed to fetch app ports.")
@@ -183,6 +212,14 @@ def startup() -> None:
             port_cache.create_port_cache(_app_ports) 
             logging.info(f"[{__name__}]: [{startup.__name__}]: {datetime.now()}: [WARNING] - app ports data successfully loaded to cache")
 
+        # keep the caches of this worker in step with the writes of the others
+        InvalidationBus().start(base_dir, since=_journal_range[1] if _journal_range else None)
+
+"""Start the background scrape of the monitored apps, once the app cache is loaded."""
+@app.on_event("startup")
+async def start_scraper() -> None:
+    MetricsScraper().start()
+
 """Shutdown handler of the fastapi application. Clears all the resources before terminating
 Returns:
     None: returns None
@@ -197,6 +234,11 @@ async def shutdown() -> None:
     try:
         logging.info(f"[{__name__}]: [{shutdown.__name__}]: {datetime.now()}: [WARNING] - {configuration['APP_NAME']} is shutting down")
         ### close and clear resources that we allocate to mongoDB
+        await MetricsScraper().stop()
+        InvalidationBus().stop()
+        await WebSocketHub().close()
+        await UpstreamClient().close()
+        SessionController().store.close()
         if database_mgr.db_connected:
             database_mgr.close_connection()
     except:
@@ -0,0 +1,12 @@
+-- 0001_access_path_indexes.sql
+
+-- App units are always looked up by company and zone (AppManager.getAllAppUnits, delAllAppUnit)
+CREATE INDEX IF NOT EXISTS idx_appUnit_cid_zid ON appUnit (cid, zid);
+
+-- Login matches on name OR email (AuthManager.validateUserLogin), one index per side of the OR
+CREATE INDEX IF NOT EXISTS idx_user_name ON user (name);
+CREATE INDEX IF NOT EXISTS idx_user_email ON user (email);
+
+-- Users and apps listed per company
+CREATE INDEX IF NOT EXISTS idx_user_cid ON user (cid);
+CREATE INDEX IF NOT EXISTS idx_app_cid ON app (cid);
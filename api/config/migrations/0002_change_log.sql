@@ -0,0 +1,102 @@
+-- 0002_change_log.sql
+
+-- Change journal read by GET /<collection>/changes. Every committed insert, update and delete on the
+-- app, appUnit, user and company tables appends one row; version is the sync cursor handed to clients.
+-- cid is the company the row belongs to, so a client only ever sees entries of companies it can read.
+CREATE TABLE IF NOT EXISTS changeLog (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    tbl TEXT NOT NULL,
+    rid INTEGER NOT NULL,
+    op TEXT NOT NULL,                       -- I(nsert), U(pdate), D(elete)
+    cid,
+    ts TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+);
+
+-- Latest change per row after a cursor (ChangeManager.getChanges)
+CREATE INDEX IF NOT EXISTS idx_changeLog_tbl_version ON changeLog (tbl, version);
+CREATE INDEX IF NOT EXISTS idx_changeLog_tbl_cid_version ON changeLog (tbl, cid, version);
+
+-- Rows that exist before the journal starts are recorded as inserts, so since=0 returns the full table
+INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'company', cid, 'I', cid FROM company;
+INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'user', uid, 'I', cid FROM user;
+INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'app', aid, 'I', cid FROM app;
+INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'appUnit', id, 'I', cid FROM appUnit;
+
+
+-- app
+CREATE TRIGGER IF NOT EXISTS trg_app_changeLog_insert AFTER INSERT ON app
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('app', NEW.aid, 'I', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_app_changeLog_update AFTER UPDATE ON app
+BEGIN
+    -- a row moved to another company disappears for the old one
+    INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'app', OLD.aid, 'D', OLD.cid WHERE OLD.cid IS NOT NEW.cid;
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('app', NEW.aid, 'U', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_app_changeLog_delete AFTER DELETE ON app
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('app', OLD.aid, 'D', OLD.cid);
+END;
+
+
+-- appUnit
+CREATE TRIGGER IF NOT EXISTS trg_appUnit_changeLog_insert AFTER INSERT ON appUnit
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('appUnit', NEW.id, 'I', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_appUnit_changeLog_update AFTER UPDATE ON appUnit
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'appUnit', OLD.id, 'D', OLD.cid WHERE OLD.cid IS NOT NEW.cid;
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('appUnit', NEW.id, 'U', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_appUnit_changeLog_delete AFTER DELETE ON appUnit
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('appUnit', OLD.id, 'D', OLD.cid);
+END;
+
+
+-- user
+CREATE TRIGGER IF NOT EXISTS trg_user_changeLog_insert AFTER INSERT ON user
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('user', NEW.uid, 'I', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_changeLog_update AFTER UPDATE ON user
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'user', OLD.uid, 'D', OLD.cid WHERE OLD.cid IS NOT NEW.cid;
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('user', NEW.uid, 'U', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_changeLog_delete AFTER DELETE ON user
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('user', OLD.uid, 'D', OLD.cid);
+END;
+
+
+-- company
+CREATE TRIGGER IF NOT EXISTS trg_company_changeLog_insert AFTER INSERT ON company
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('company', NEW.cid, 'I', NEW.cid);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_company_changeLog_update AFTER UPDATE ON company
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('company', NEW.cid, 'U', NEW.cid);
+END;
+
+-- app and user rows carry the company name (cname), so a rename changes them too
+CREATE TRIGGER IF NOT EXISTS trg_company_changeLog_rename AFTER UPDATE OF name ON company WHEN OLD.name IS NOT NEW.name
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'app', aid, 'U', cid FROM app WHERE cid = NEW.cid;
+    INSERT INTO changeLog (tbl, rid, op, cid) SELECT 'user', uid, 'U', cid FROM user WHERE cid = NEW.cid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_company_changeLog_delete AFTER DELETE ON company
+BEGIN
+    INSERT INTO changeLog (tbl, rid, op, cid) VALUES ('company', OLD.cid, 'D', OLD.cid);
+END;
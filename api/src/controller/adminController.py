@@ -0,0 +1,252 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime
+import logging
+from src.controller.base.controllerBase import ControllerBase
+from src.controller.base.types import UserType
+from src.controller.cacheController.appCacheController import AppCacheController, PortCacheController
+from src.controller.cacheController.sessionController import SessionController
+from src.model.app_manager import AppManager
+from src.model.db_manager import DBManager
+from src.controller.cacheController.metricsScraper import MetricsScraper
+from src.controller.cacheController.appEvents import AppEvents
+from src.controller.cacheController.invalidationBus import InvalidationBus
+from src.utilities.single_flight import get_single_flight_metrics
+from src.utilities.upstream_client import UpstreamClient
+from src.ws.websocket_hub import WebSocketHub
+
+
+class AdminController():
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.database_mgr = DBManager(base_dir)
+        self.app_mgr = AppManager(base_dir)
+        self.app_cache = AppCacheController()
+        self.port_cache = PortCacheController()
+        self.session_mgr = SessionController()
+        self.upstream = UpstreamClient()
+        self.scraper = MetricsScraper()
+        self.ws_hub = WebSocketHub()
+        self.app_events = AppEvents()
+        self.invalidation_bus = InvalidationBus()
+        self.controller_base = ControllerBase()
+
+
+    """
+    Check that the token belongs to a super admin.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        int: None when access is granted, otherwise the HTTP status code to return.
+    """
+    def verifySuperAdmin(self, token: str):
+        _user_info, _err = self.session_mgr.get_current_user_data(token)
+        if _err:
+            logging.error(f"[{self.__class__.__name__}: {self.verifySuperAdmin.__name__}: {datetime.now()}]: [ERROR] - Error retrieving user type: {_err}")
+            return 500
+        if _user_info is None:
+            logging.warning(f"[{self.__class__.__name__}: {self.verifySuperAdmin.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
+            return 401
+        if _user_info.userType != UserType.SUPER_ADMIN.value:
+            logging.warning(f"[{self.__class__.__name__}: {self.verifySuperAdmin.__name__}: {datetime.now()}]: [WARNING] - Forbidden: super admin access required")
+            return 403
+        return None
+
+
+    """
+    Retrieves the database connection pool metrics.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the pool size and checkout wait metrics.
+    """
+    def getDbPoolMetrics(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            _metrics = self.database_mgr.get_pool_metrics()
+            if _metrics is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.getDbPoolMetrics.__name__}: {datetime.now()}]: [WARNING] - Connection pool mode is disabled")
+                return self.controller_base.generate_response({"enabled": False, "transactions": self.database_mgr.get_transaction_metrics()}, 200)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getDbPoolMetrics.__name__}: {datetime.now()}]: [INFO] - Connection pool metrics retrieved successfully")
+            return self.controller_base.generate_response({"enabled": True, **_metrics, "transactions": self.database_mgr.get_transaction_metrics()}, 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getDbPoolMetrics.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Retrieves the metrics of the upstream client used to call the monitored apps.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the request counters, per-host latency, pooled connections, scraper and coalescing counters.
+    """
+    def getUpstreamMetrics(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getUpstreamMetrics.__name__}: {datetime.now()}]: [INFO] - Upstream client metrics retrieved successfully")
+            return self.controller_base.generate_response({**self.upstream.get_metrics(), "scraper": self.scraper.get_metrics(), "coalescing": get_single_flight_metrics(), "events": self.app_events.get_metrics()}, 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getUpstreamMetrics.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Retrieves the circuit breaker state of every monitored app called so far.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing one entry per target with its state, counters and the apps behind it.
+    """
+    def getCircuitBreakers(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            _aids = {}
+            for _app in self.app_cache.getAllApps('*', UserType.SUPER_ADMIN.value) or []:
+                _aids.setdefault(f"{_app['ip']}:{_app['rest_port']}", []).append(_app['aid'])
+
+            _breakers = self.upstream.get_breakers()
+            for _breaker in _breakers:
+                _breaker["aids"] = _aids.get(_breaker["target"], [])
+
+            logging.info(f"[{self.__class__.__name__}: {self.getCircuitBreakers.__name__}: {datetime.now()}]: [INFO] - Circuit breaker state retrieved successfully")
+            return self.controller_base.generate_response(_breakers, 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getCircuitBreakers.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Retrieves the state of the shared app WebSocket streams and the throughput of every dashboard connection.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the upstream streams and per-connection frame, byte, drop and heartbeat counters.
+    """
+    def getWebSocketMetrics(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getWebSocketMetrics.__name__}: {datetime.now()}]: [INFO] - WebSocket metrics retrieved successfully")
+            return self.controller_base.generate_response(self.ws_hub.get_metrics(), 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getWebSocketMetrics.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Rebuilds the app and port caches from the database.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the number of cached apps.
+    """
+    async def resyncAppCache(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            _app_data, _err = await self.app_mgr.getAllAppsAsync()
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.resyncAppCache.__name__}: {datetime.now()}]: [ERROR] - Error retrieving apps: {_err}")
+                return self.controller_base.generate_response(None, 500)
+            self.app_cache.create_app_cache(_app_data)
+
+            _app_ports, _err = await self.app_mgr.getAppPortsAsync()
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.resyncAppCache.__name__}: {datetime.now()}]: [ERROR] - Error retrieving app ports: {_err}")
+                return self.controller_base.generate_response(None, 500)
+            self.port_cache.create_port_cache(_app_ports)
+
+            logging.info(f"[{self.__class__.__name__}: {self.resyncAppCache.__name__}: {datetime.now()}]: [INFO] - App cache resynced from the database")
+            return self.controller_base.generate_response({"apps": len(_app_data or [])}, 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.resyncAppCache.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Retrieves the metrics of the cache invalidation bus of this worker.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the poll counters, the last applied journal version and the propagation lag.
+    """
+    def getInvalidationMetrics(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getInvalidationMetrics.__name__}: {datetime.now()}]: [INFO] - Invalidation bus metrics retrieved successfully")
+            return self.controller_base.generate_response(self.invalidation_bus.get_metrics(), 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getInvalidationMetrics.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+    Retrieves the size of the app cache against its bounds.
+
+    Args:
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing the cached rows, approximate bytes, resident companies and read-through counters.
+    """
+    def getAppCacheMetrics(self, token: str):
+        try:
+            _status = self.verifySuperAdmin(token)
+            if _status:
+                return self.controller_base.generate_response(None, _status)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getAppCacheMetrics.__name__}: {datetime.now()}]: [INFO] - App cache metrics retrieved successfully")
+            return self.controller_base.generate_response(self.app_cache.get_metrics(), 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getAppCacheMetrics.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
@@ -11,21 +11,30 @@
 
 # #######################################################################################################
  
+import asyncio
+from collections import deque
+from contextlib import AsyncExitStack
 from datetime import datetime
+import json
 import logging
-import requests
+import time
+import httpx
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from src.controller.base.controllerBase import ControllerBase
 from src.controller.base.types import ResponseModel, UserType
 # from app_manager import AppManager
 from src.controller.cacheController.sessionController import SessionController
 from src.controller.cacheController.appCacheController import AppCacheController
+from src.controller.cacheController.metricsScraper import MetricsScraper
+from src.controller.cacheController.appEvents import AppEvents
+from src.utilities.circuit_breaker import CircuitOpenError
+from src.utilities.single_flight import get_single_flight
+from src.utilities.upstream_client import UpstreamClient
+from src.utilities.settings import get_config
 from classy_fastapi import Routable
-from requests.adapters import HTTPAdapter
-from requests.exceptions import RequestException
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor
 
 class AppController(Routable):
     def __init__(self, base_dir) -> None:
@@ -33,7 +42,17 @@ class AppController(Routable):
         self.session_mgr = SessionController()
         self.app_cache = AppCacheController()
         self.controller_base = ControllerBase()
-        self.executor = ThreadPoolExecutor(max_workers=10)  # Adjust the number of workers as needed
+        self.upstream = UpstreamClient()
+        self.scraper = MetricsScraper()
+        self.app_events = AppEvents()
+        self.single_flight = get_single_flight("upstream", float(get_config("UPSTREAM_COALESCE_TTL", 0.5)))
+        self.batch_endpoints = {"info": "/info", "status": "/status", "live": "/live"}
+        self.batch_max_targets = int(get_config("BATCH_MAX_TARGETS", 2000))
+        self.batch_concurrency = int(get_config("BATCH_CONCURRENCY", 50))
+        self.batch_deadline = float(get_config("BATCH_TARGET_DEADLINE", 3))
+        self.log_tail_max = int(get_config("LOG_TAIL_MAX", 10000))
+        self.log_follow_interval = float(get_config("LOG_FOLLOW_INTERVAL", 2))
+        self.log_follow_max = float(get_config("LOG_FOLLOW_MAX", 3600))
 
 
     """
@@ -46,20 +65,21 @@ class AppController(Routable):
             token (str): Authorization header containing access token.
             
         Returns:
-            JSONResponse: Response containing status code and data.
+            JSONResponse: Response containing status code and data, served from the latest scrape (with its Age) when there is one.
     """
-    def getAppInfo(self, aid: int, ip: str, port: int, token: str):
+    async def getAppInfo(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info is None:
                 logging.warning(f"[{self.__class__.__name__}: {self.getAppInfo.__name__}: {datetime.now()}]: [WARNING] - Unauthorized access")
                 return self.controller_base.generate_response(None, 401)
                 
+            _snapshot = await self.getSnapshot(aid, "info", user_info.cid)
+            if _snapshot is not None:
+                return _snapshot
+
             _url = f"http://{ip}:{port}/info"
-            # return self.sendHttpRequest(aid, _url, user_info.cid)
-            future = self.executor.submit(self.sendHttpRequest, aid, _url, user_info.cid)
-            response = future.result()  # Block until the thread completes
-            return response
+            return await self.sendHttpRequest(aid, _url, user_info.cid, coalesce=True)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.getAppInfo.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -75,18 +95,21 @@ class AppController(Routable):
             token (str): Authorization header containing access token.
             
         Returns:
-            JSONResponse: Response containing status code and data.
+            JSONResponse: Response containing status code and data, served from the latest scrape (with its Age) when there is one.
     """
-    def getAppStatus(self, aid: int, ip: str, port: int, token: str):
+    async def getAppStatus(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info is None:
                 logging.warning(f"[{self.__class__.__name__}: {self.getAppStatus.__name__}: {datetime.now()}]: [WARNING] - Unauthorized access")
                 return self.controller_base.generate_response(None, 401)
                 
+            _snapshot = await self.getSnapshot(aid, "status", user_info.cid)
+            if _snapshot is not None:
+                return _snapshot
+
             _url = f"http://{ip}:{port}/status"
-            _aa= self.sendHttpRequest(aid, _url, user_info.cid)
-            return _aa
+            return await self.sendHttpRequest(aid, _url, user_info.cid, coalesce=True)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.getAppStatus.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -104,7 +127,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def liveMonitoring(self, aid: int, ip: str, port: int, token: str):
+    async def liveMonitoring(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info is None:
@@ -112,7 +135,7 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 401)
                 
             _url = f"http://{ip}:{port}/live"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid, coalesce=True, passthrough=True)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.liveMonitoring.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -131,7 +154,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def retrieveLogs(self, aid: int, ip: str, port: int, token: str):
+    async def retrieveLogs(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info is None:
@@ -139,13 +162,215 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 401)
                 
             _url = f"http://{ip}:{port}/admin/log"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid, coalesce=True, passthrough=True)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.retrieveLogs.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
             return self.controller_base.generate_response(None, 500)
 
 
+    """
+        API route to stream the log of an app.
+
+        The log is the body of the app's /admin/log, addressed in bytes. Reads from an offset ask
+        the app for a Range and skip the leading bytes themselves when it sends the whole body.
+        Follow mode polls the app for the bytes past the last offset sent until the client leaves
+        or log_follow_max seconds have passed. As SSE every event carries whole lines and its id is
+        the offset after them, so an EventSource resumes through Last-Event-ID; as chunked text the
+        client resumes with offset = X-Log-Offset + bytes received. Nothing is buffered beyond the
+        chunk in transit, or the last N lines for tail.
+
+        Parameters:
+            aid (int): Application ID.
+            tail (int): Only send the last N lines (of the bytes after offset).
+            offset (int): Byte offset to start from.
+            follow (bool): Keep the stream open and send new log bytes as they are written.
+            sse (bool): Send Server-Sent Events instead of plain chunked text.
+            last_event_id (str): Last-Event-ID header of a reconnecting EventSource, overrides offset and tail.
+            accept_encoding (str): Accept-Encoding header of the request, gzip is applied on the fly.
+            token (str): Authorization header containing access token.
+
+        Returns:
+            StreamingResponse: The log stream, or a JSON error response.
+    """
+    async def streamLogs(self, aid: int, tail: int, offset: int, follow: bool, sse: bool, last_event_id: str, accept_encoding: str, token: str):
+        try:
+            user_info = self.getUserData(token)
+            if user_info is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - Unauthorized access")
+                return self.controller_base.generate_response(None, 401)
+
+            if last_event_id:
+                if not last_event_id.isdigit():
+                    logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Invalid Last-Event-ID {last_event_id}")
+                    return self.controller_base.generate_response(None, 400)
+                offset, tail = int(last_event_id), None
+
+            if offset < 0 or (tail is not None and not 0 < tail <= self.log_tail_max):
+                logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Invalid offset {offset} or tail {tail}")
+                return self.controller_base.generate_response(None, 400)
+
+            _app = await self.app_cache.getAppByIdAsync(aid, user_info.cid, user_info.userType)
+            _key = await self.app_cache.get_app_key_async(aid, user_info.cid) if _app is not None else None
+            if _key is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - Application not found")
+                return self.controller_base.generate_response(None, 404)
+            _url = f"http://{_app['ip']}:{_app['rest_port']}/admin/log"
+
+            # the first read is made up front, so an unreachable app still gets a proper status code
+            try:
+                _stack, _response = await self.openLog(_url, _key, offset)
+            except CircuitOpenError as e:
+                logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - {str(e)}")
+                return self.controller_base.generate_response(None, 503)
+            if _response is None:
+                return self.controller_base.generate_response(None, 500)
+
+            _state = {"stack": _stack, "offset": offset}
+
+            async def _log():
+                _response_now = _response
+                _pending = b""
+                _deadline = time.monotonic() + self.log_follow_max
+                _first = True
+                try:
+                    while True:
+                        if _response_now is not None:
+                            _chunks = self.readLog(_response_now, _state)
+                            if _first and tail is not None:
+                                _chunks = self.tailLog(_chunks, tail)
+                            async for _chunk in _chunks:
+                                if not sse:
+                                    yield _chunk
+                                    continue
+                                _pending += _chunk
+                                _end = _pending.rfind(b"\n") + 1
+                                if not _end and len(_pending) < 65536:
+                                    continue
+                                _end = _end or len(_pending)
+                                yield self.formatLogEvent(_pending[:_end], _state["offset"] - len(_pending) + _end)
+                                _pending = _pending[_end:]
+                            await _state["stack"].aclose()
+                        _first = False
+
+                        if not follow or time.monotonic() >= _deadline:
+                            break
+                        await asyncio.sleep(self.log_follow_interval)
+                        if sse:
+                            yield b": keepalive\n\n"
+                        try:
+                            _state["stack"], _response_now = await self.openLog(_url, _key, _state["offset"])
+                        except httpx.HTTPError as e:
+                            # app unreachable for now (or its circuit is open), try again on the next poll
+                            logging.warning(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [WARNING] - Following log of app {aid} failed: {str(e)}")
+                            _response_now = None
+
+                    if sse and _pending:
+                        yield self.formatLogEvent(_pending, _state["offset"])
+                finally:
+                    await _state["stack"].aclose()
+
+            # runs even when the client left before the first chunk, so the upstream response is never left open
+            async def _close():
+                await _state["stack"].aclose()
+
+            _headers = {"X-Log-Offset": str(offset), "Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            logging.info(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [INFO] - Streaming log of app {aid} from offset {offset} (tail {tail}, follow {follow}, sse {sse})")
+            return self.controller_base.generate_stream_response(
+                _log(), "text/event-stream" if sse else "text/plain; charset=utf-8", accept_encoding, _headers, BackgroundTask(_close))
+
+        except httpx.HTTPError as e:
+            logging.error(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [ERROR] - Connection error: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.streamLogs.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
+    """
+        Open a streamed read of an app log from a byte offset.
+
+        Parameters:
+            _url (str): URL of the app log.
+            _key (str): API key of the app.
+            start (int): Byte offset to read from.
+
+        Returns:
+            tuple: The exit stack holding the upstream response open and the response, which is None when the app answered with an error.
+    """
+    async def openLog(self, _url: str, _key: str, start: int):
+        # identity encoding keeps the offsets in bytes of the log itself
+        _headers = {"apikey": _key, "Accept-Encoding": "identity"}
+        if start > 0:
+            _headers["Range"] = f"bytes={start}-"
+
+        _stack = AsyncExitStack()
+        _response = await _stack.enter_async_context(self.upstream.stream("GET", _url, headers=_headers))
+        if _response.status_code not in (200, 206, 416):
+            logging.error(f"[{self.__class__.__name__}: {self.openLog.__name__}: {datetime.now()}]: [ERROR] - Failed to retrieve the log from the external server. Status code: {_response.status_code}")
+            await _stack.aclose()
+            return _stack, None
+        return _stack, _response
+
+
+    """
+        Yield the log bytes of an upstream response past state["offset"], advancing it.
+
+        Parameters:
+            _response (httpx.Response): Streamed upstream response from openLog.
+            state (dict): Holds the current byte offset.
+    """
+    async def readLog(self, _response, state: dict):
+        # 416: nothing past the offset yet
+        if _response.status_code == 416:
+            return
+
+        _skip = 0
+        if _response.status_code == 200:
+            _length = _response.headers.get("content-length")
+            if _length is not None and _length.isdigit() and int(_length) < state["offset"]:
+                # the log is shorter than what was already sent: rotated, start over
+                logging.info(f"[{self.__class__.__name__}: {self.readLog.__name__}: {datetime.now()}]: [INFO] - Log rotated, reading from the start")
+                state["offset"] = 0
+            _skip = state["offset"]
+
+        async for _chunk in _response.aiter_bytes():
+            if _skip:
+                if len(_chunk) <= _skip:
+                    _skip -= len(_chunk)
+                    continue
+                _chunk, _skip = _chunk[_skip:], 0
+            state["offset"] += len(_chunk)
+            yield _chunk
+
+
+    """
+        Keep only the last lines of a byte stream, holding no more than those lines in memory.
+
+        Parameters:
+            chunks: Async iterator of bytes.
+            lines (int): Number of lines to keep.
+    """
+    async def tailLog(self, chunks, lines: int):
+        _lines = deque(maxlen=lines)
+        _partial = b""
+        async for _chunk in chunks:
+            _parts = (_partial + _chunk).split(b"\n")
+            _partial = _parts.pop()
+            _lines.extend(_part + b"\n" for _part in _parts)
+        if _partial:
+            _lines.append(_partial)
+        if _lines:
+            yield b"".join(_lines)
+
+
+    """Encode log bytes as one SSE event of whole lines, its id the offset after them."""
+    def formatLogEvent(self, data: bytes, offset: int):
+        _lines = data.decode("utf-8", errors="replace").splitlines() or [""]
+        return (f"id: {offset}\n" + "".join(f"data: {_line}\n" for _line in _lines) + "\n").encode("utf-8")
+
+
     """
         API route to reload configuration.
 
@@ -158,7 +383,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def reloadConfiguration(self, aid: int, ip: str, port: int, token: str):
+    async def reloadConfiguration(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -166,7 +391,10 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/config/reload"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            _response = await self.sendHttpRequest(aid, _url, user_info.cid)
+            if _response.status_code == 200 and await self.isAppUrl(aid, _url):
+                self.app_events.config_reloaded(aid)
+            return _response
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.reloadConfiguration.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -185,7 +413,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def stopWSMonitor(self, aid: int, ip: str, port: int, token: str):
+    async def stopWSMonitor(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             # if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -193,7 +421,7 @@ class AppController(Routable):
             #     return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/monitor/stop"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.stopWSMonitor.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -212,7 +440,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def startWSMonitor(self, aid: int, ip: str, port: int, token: str):
+    async def startWSMonitor(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             # if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -220,7 +448,7 @@ class AppController(Routable):
             #     return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/monitor/start"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.startWSMonitor.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -239,7 +467,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def stopProfiler(self, aid: int, ip: str, port: int, token: str):
+    async def stopProfiler(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -247,7 +475,7 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/profiler/stop"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.stopProfiler.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -266,7 +494,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def startProfiler(self, aid: int, ip: str, port: int, token: str):
+    async def startProfiler(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -274,7 +502,7 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/profiler/start"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.startProfiler.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -293,7 +521,7 @@ class AppController(Routable):
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def saveConfiguration(self, aid: int, ip: str, port: int, token: str):
+    async def saveConfiguration(self, aid: int, ip: str, port: int, token: str):
         try:
             user_info = self.getUserData(token)
             if user_info.userType not in {UserType.SUPER_ADMIN.value, UserType.ADMIN.value}:
@@ -301,7 +529,7 @@ class AppController(Routable):
                 return self.controller_base.generate_response(None, 403)
                 
             _url = f"http://{ip}:{port}/admin/config/save"
-            return self.sendHttpRequest(aid, _url, user_info.cid)
+            return await self.sendHttpRequest(aid, _url, user_info.cid)
 
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.saveConfiguration.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -309,6 +537,92 @@ class AppController(Routable):
 
 
 
+    """
+        Answer from the latest background scrape of the app.
+
+        Parameters:
+            aid (int): Application ID.
+            endpoint (str): Scraped endpoint (status, info).
+            cid (int): Company ID of the user.
+
+        Returns:
+            JSONResponse: The snapshot with an Age header in seconds, or None when there is no fresh snapshot the user may see.
+    """
+    async def getSnapshot(self, aid: int, endpoint: str, cid):
+        _snapshot = self.scraper.get_snapshot(aid, endpoint)
+        if _snapshot is None or await self.app_cache.get_app_key_async(aid, cid) is None:
+            return None
+
+        _data, _status, _age = _snapshot
+        return self.controller_base.generate_response(_data, _status, {"Age": str(int(_age))})
+
+
+    """
+        API route to query several apps at once.
+
+        Every (aid, endpoint) pair is queried concurrently, at most batch_concurrency at a time and
+        each within batch_target_deadline seconds, and written to the NDJSON stream as soon as it
+        finishes, so one slow or dead app neither delays nor fails the others.
+
+        Parameters:
+            aids (list): Application IDs.
+            endpoints (list): Endpoints to query on every app (info, status, live).
+            token (str): Authorization header containing access token.
+
+        Returns:
+            StreamingResponse: One {"aid", "endpoint", "status", "data"} JSON line per target, or a JSON error response.
+    """
+    async def batchRequest(self, aids: list, endpoints: list, token: str):
+        try:
+            user_info = self.getUserData(token)
+            if user_info is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.batchRequest.__name__}: {datetime.now()}]: [WARNING] - Unauthorized access")
+                return self.controller_base.generate_response(None, 401)
+
+            _aids = list(dict.fromkeys(aids))
+            _endpoints = list(dict.fromkeys(endpoints))
+            if not _aids or not _endpoints or any(_endpoint not in self.batch_endpoints for _endpoint in _endpoints) \
+                    or len(_aids) * len(_endpoints) > self.batch_max_targets:
+                logging.warning(f"[{self.__class__.__name__}: {self.batchRequest.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Invalid batch of {len(_aids)} app(s) and endpoints {_endpoints}")
+                return self.controller_base.generate_response(None, 400)
+
+            _semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+            async def _query(aid, endpoint):
+                # the cache decides which apps the user can see and where they listen
+                _app = await self.app_cache.getAppByIdAsync(aid, user_info.cid, user_info.userType)
+                if _app is None:
+                    return {"aid": aid, "endpoint": endpoint, "status": 404, "data": None}
+
+                _url = f"http://{_app['ip']}:{_app['rest_port']}{self.batch_endpoints[endpoint]}"
+                async with _semaphore:
+                    try:
+                        _data, _status = await asyncio.wait_for(self.fetchAppData(aid, _url, user_info.cid, coalesce=True), self.batch_deadline)
+                    except asyncio.TimeoutError:
+                        logging.warning(f"[{self.__class__.__name__}: {self.batchRequest.__name__}: {datetime.now()}]: [WARNING] - App {aid} did not answer {endpoint} within {self.batch_deadline}s")
+                        _data, _status = None, 504
+                return {"aid": aid, "endpoint": endpoint, "status": _status, "data": _data}
+
+            _tasks = [asyncio.create_task(_query(_aid, _endpoint)) for _aid in _aids for _endpoint in _endpoints]
+
+            async def _stream():
+                try:
+                    for _next in asyncio.as_completed(_tasks):
+                        _result = await _next
+                        yield json.dumps(_result, separators=(",", ":")).encode("utf-8") + b"\n"
+                finally:
+                    # client went away or the stream failed: stop the remaining upstream calls
+                    for _task in _tasks:
+                        _task.cancel()
+
+            logging.info(f"[{self.__class__.__name__}: {self.batchRequest.__name__}: {datetime.now()}]: [INFO] - Querying {len(_tasks)} target(s)")
+            return StreamingResponse(_stream(), media_type="application/x-ndjson")
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.batchRequest.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
+
+
     """
         Check user type based on the provided authorization header.
 
@@ -342,11 +656,13 @@ class AppController(Routable):
             aid (int): Application ID.
             _url (str): URL for the HTTP request.
             token (str): Authorization header containing access token.
+            coalesce (bool): Share the call with identical concurrent reads (read-only endpoints only).
+            passthrough (bool): Send the upstream JSON to the client as is instead of decoding and encoding it again.
 
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def sendHttpRequest(self, aid: int, _url: str, cid: int):
+    async def sendHttpRequest(self, aid: int, _url: str, cid: int, coalesce: bool = False, passthrough: bool = False):
         # try:
         #     _key = self.app_cache.get_app_key(aid, cid)
         #     if _key is None:
@@ -364,30 +680,100 @@ class AppController(Routable):
             #     return self.controller_base.generate_response(None, 500)
 
 
+        _data, _status = await self.fetchAppData(aid, _url, cid, coalesce, passthrough)
+        if passthrough and _status == 200:
+            return self.controller_base.generate_passthrough_response(_data)
+        return self.controller_base.generate_response(_data, _status)
+
+
+    """
+        Check that a URL points at the cached address of an app, not at an ip and port taken from the request only.
+
+        Parameters:
+            aid (int): Application ID.
+            _url (str): URL of the upstream call.
+
+        Returns:
+            bool: True when the URL starts with the app's http://ip:rest_port/.
+    """
+    async def isAppUrl(self, aid: int, _url: str):
+        _app = await self.app_cache.getAppByIdAsync(aid, '*', UserType.SUPER_ADMIN.value)
+        return _app is not None and _url.startswith(f"http://{_app['ip']}:{_app['rest_port']}/")
+
+
+    """
+        Query a monitored app and return its data with the status code to answer with.
+
+        Parameters:
+            aid (int): Application ID.
+            _url (str): URL for the HTTP request.
+            cid (int): Company ID of the user.
+            coalesce (bool): Share the call with identical concurrent reads (read-only endpoints only).
+            raw (bool): Return the undecoded upstream body (bytes) as data.
+
+        Returns:
+            tuple: The upstream data (None on failure) and the HTTP status code.
+    """
+    async def fetchAppData(self, aid: int, _url: str, cid: int, coalesce: bool = False, raw: bool = False):
         try:
-            _key = self.app_cache.get_app_key(aid, cid)
+            _key = await self.app_cache.get_app_key_async(aid, cid)
             if _key is None:
-                logging.warning(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [WARNING] - Application key not found")
-                return self.controller_base.generate_response(None, 404)
-        
-            headers = {"apikey": _key}
-            _response = requests.get(_url, headers=headers, timeout=5)  # Add a timeout
-            
-            if _response.status_code == 200:
-                logging.info(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [INFO] - Data retrieved successfully from the external server. Status code: {_response.status_code}")
-                return self.controller_base.generate_response(_response.json(), 200)
-            else:
-                logging.error(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [ERROR] - Failed to retrieve data from the external server. Status code: {_response.status_code}")
-                return self.controller_base.generate_response(None, 500)
+                logging.warning(f"[{self.__class__.__name__}: {self.fetchAppData.__name__}: {datetime.now()}]: [WARNING] - Application key not found")
+                return None, 404
+
+            # the ip and port come from the request body: only calls to the app's own address say anything about its health
+            _observed = await self.isAppUrl(aid, _url)
+
+            async def _fetch():
+                # every answer doubles as a health probe of the app for GET /events
+                _started = time.perf_counter()
+                try:
+                    _data, _status = await self.getUpstreamData(_url, _key, raw)
+                except httpx.HTTPError:
+                    if _observed:
+                        self.app_events.observe(aid, False)
+                    raise
+                if _observed:
+                    _probe = _url.endswith(tuple(self.scraper.endpoints.values()))
+                    self.app_events.observe(aid, _status == 200, (time.perf_counter() - _started) * 1000 if _probe else None)
+                return _data, _status
+
+            if coalesce:
+                # the caller is authorised above, identical reads then share one upstream call
+                return await self.single_flight.do((aid, _url, raw), _fetch)
+            return await _fetch()
         
-        except RequestException as e:
-            logging.error(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [ERROR] - Connection error: {str(e)}")
-            return self.controller_base.generate_response(None, 500)
+        except CircuitOpenError as e:
+            logging.warning(f"[{self.__class__.__name__}: {self.fetchAppData.__name__}: {datetime.now()}]: [WARNING] - {str(e)}")
+            return None, 503
+
+        except httpx.HTTPError as e:
+            logging.error(f"[{self.__class__.__name__}: {self.fetchAppData.__name__}: {datetime.now()}]: [ERROR] - Connection error: {str(e)}")
+            return None, 500
         
         except Exception as e:
-            logging.error(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
-            return self.controller_base.generate_response(None, 500)
-    
-        # except Exception as e:
-        #     logging.error(f"[{self.__class__.__name__}: {self.sendHttpRequest.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
-        #     return self.controller_base.generate_response(None, 500)
+            logging.error(f"[{self.__class__.__name__}: {self.fetchAppData.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return None, 500
+
+
+    """
+        Send the GET request to the monitored app.
+
+        Parameters:
+            _url (str): URL for the HTTP request.
+            _key (str): API key of the app.
+            raw (bool): Return the body bytes instead of the decoded JSON.
+
+        Returns:
+            tuple: The upstream data (None on failure) and the HTTP status code. Connection errors are raised.
+    """
+    async def getUpstreamData(self, _url: str, _key: str, raw: bool = False):
+        headers = {"apikey": _key}
+        _response = await self.upstream.get(_url, headers=headers)
+        
+        if _response.status_code == 200:
+            logging.info(f"[{self.__class__.__name__}: {self.getUpstreamData.__name__}: {datetime.now()}]: [INFO] - Data retrieved successfully from the external server. Status code: {_response.status_code}")
+            return (_response.content if raw else _response.json()), 200
+        else:
+            logging.error(f"[{self.__class__.__name__}: {self.getUpstreamData.__name__}: {datetime.now()}]: [ERROR] - Failed to retrieve data from the external server. Status code: {_response.status_code}")
+            return None, 500
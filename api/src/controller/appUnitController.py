@@ -30,6 +30,7 @@ from src.controller.base.types import ResponseModel, ApplicationModel
 from src.model.app_manager import AppManager
 from src.controller.cacheController.sessionController import  SessionController
 from src.controller.cacheController.appCacheController import AppCacheController
+from src.controller.cacheController.versionController import Collection, VersionController
 from src.controller.base.controllerBase import ControllerBase
 from src.templates.config_template import appconfig_template, mainconfig_template
 from src.utilities.utilities import create_directory, copy_directory, deep_copy, merge_directories, move_directory, remove_file, remove_directory, create_path, save_binary, save_file, extractZipFile
@@ -41,6 +42,7 @@ class AppUnitController(Routable):
         self.session_mgr = SessionController()
         self.app_cache = AppCacheController()
         self.controller_base = ControllerBase()
+        self.versions = VersionController()
         
         self.configuration = configuration
         self.Temp_dest_folder = self.configuration.get("TEMP_DEST_FOLDER")
@@ -56,7 +58,7 @@ class AppUnitController(Routable):
     Returns:
         JSONResponse: A JSON response containing the list of applications.
     """
-    async def getAppUnits(self, token: str, zid: str, cid: int):
+    async def getAppUnits(self, token: str, zid: str, cid: int, if_none_match: str = None):
         _user_data = None
         _err = None
         try:
@@ -70,17 +72,22 @@ class AppUnitController(Routable):
 
             # _app_data, _err = self.app_mgr.getAllApps(_user_data.userType, _user_data.cid)
             # self.app_cache.create_app_cache(_app_data) 
-            _app_data, _err = self.app_mgr.getAllAppUnits( _user_data.userType, cid, zid)
+            # taken before the query, so a concurrent change can only make the tag older than the data
+            _etag = self.versions.get_etag(Collection.APP_UNIT, cid, zid)
+            if self.controller_base.is_not_modified(if_none_match, _etag):
+                return self.controller_base.generate_not_modified(_etag)
+
+            _app_data, _err = await self.app_mgr.getAllAppUnitsAsync(_user_data.userType, cid, zid)
 
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.getAppUnits.__name__}: {datetime.now()}]: [ERROR] - Error retrieving application units data: {_err}")
                 return self.controller_base.generate_response(None, 500)
             elif not _app_data:
                 logging.warning(f"[{self.__class__.__name__}: {self.getAppUnits.__name__}: {datetime.now()}]: [WARNING] - Application units not found")
-                return self.controller_base.generate_response(None, 200)
+                return self.controller_base.generate_response(None, 200, {"ETag": _etag})
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.getAppUnits.__name__}: {datetime.now()}]: [INFO] - Application units data retrieved successfully")
-                return self.controller_base.generate_response(_app_data, 200)
+                return self.controller_base.generate_response(_app_data, 200, {"ETag": _etag})
     
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.getAppUnits.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(_e)}")
@@ -150,6 +157,7 @@ class AppUnitController(Routable):
                 return self.controller_base.generate_response(None, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [INFO] - Application units data deleted successfully")
+                self.versions.bump(Collection.APP_UNIT)
                 return self.controller_base.generate_response(result, 200)
             
         except Exception as _e:
@@ -257,7 +265,7 @@ class AppUnitController(Routable):
                 return self.controller_base.generate_response(None, 401)
             
 
-            _app_data, _err = self.app_mgr.getAppUnit(_user_data.userType, cid, id)
+            _app_data, _err = await self.app_mgr.getAppUnitAsync(_user_data.userType, cid, id)
 
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [ERROR] - Error retrieving application units data: {_err}")
@@ -282,6 +290,7 @@ class AppUnitController(Routable):
                 return self.controller_base.generate_response(None, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [INFO] - Application units data deleted successfully")
+                self.versions.bump(Collection.APP_UNIT)
                 return self.controller_base.generate_response(_app_data, 200)
     
         except Exception as _e:
@@ -396,7 +405,7 @@ class AppUnitController(Routable):
             #     logging.info(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [INFO] - Application units data deleted successfully")
             #     return self.controller_base.generate_response(_app_data, 200)
 
-            _app_data, _err = self.app_mgr.getAppUnit(_user_data.userType, cid, id)
+            _app_data, _err = await self.app_mgr.getAppUnitAsync(_user_data.userType, cid, id)
             if file:
 
                 if _err:
@@ -428,6 +437,7 @@ class AppUnitController(Routable):
                     return self.controller_base.generate_response(None, 404)
                 else:
                     logging.info(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [INFO] - Application units data deleted successfully")
+                    self.versions.bump(Collection.APP_UNIT)
                     return self.controller_base.generate_response(_app_data, 200)
             
             else:
@@ -446,6 +456,7 @@ class AppUnitController(Routable):
                     return self.controller_base.generate_response(None, 404)
                 else:
                     logging.info(f"[{self.__class__.__name__}: {self.deleteAppUnit.__name__}: {datetime.now()}]: [INFO] - Application units data deleted successfully")
+                    self.versions.bump(Collection.APP_UNIT)
                     return self.controller_base.generate_response(_app_data, 200)
             
 
@@ -31,6 +31,7 @@ from src.controller.base.types import ResponseModel, ApplicationModel
 from src.model.app_manager import AppManager
 from src.controller.cacheController.sessionController import  SessionController
 from src.controller.cacheController.appCacheController import AppCacheController, PortCacheController
+from src.controller.cacheController.versionController import Collection, VersionController
 from src.controller.base.controllerBase import ControllerBase
 from src.templates.config_template import appconfig_template, mainconfig_template
 from src.utilities.utilities import create_directory, copy_directory, create_build_sh, create_run_sh, deep_copy, execute_sh,  merge_directories, move_directory, remove_file, remove_directory, create_path, save_binary, save_file
@@ -43,6 +44,7 @@ class ApplicationController(Routable):
         self.app_cache = AppCacheController()
         self.port_cache = PortCacheController()
         self.controller_base = ControllerBase()
+        self.versions = VersionController()
         
         self.configuration = configuration
         self.Temp_dest_folder = self.configuration.get("TEMP_DEST_FOLDER")
@@ -55,7 +57,7 @@ class ApplicationController(Routable):
     Returns:
         JSONResponse: A JSON response containing the list of applications.
     """
-    def getApps(self, token: str):
+    async def getApps(self, token: str, if_none_match: str = None):
         _user_data = None
         _err = None
         try:
@@ -69,17 +71,16 @@ class ApplicationController(Routable):
 
             # _app_data, _err = self.app_mgr.getAllApps(_user_data.userType, _user_data.cid)
             # self.app_cache.create_app_cache(_app_data) 
-            _app_data = self.app_cache.getAllApps(_user_data.cid, _user_data.userType)
+            _etag = self.versions.get_etag(Collection.APPLICATION, _user_data.userType, _user_data.cid)
+            if self.controller_base.is_not_modified(if_none_match, _etag):
+                return self.controller_base.generate_not_modified(_etag)
 
-            if _err:
-                logging.error(f"[{self.__class__.__name__}: {self.getApps.__name__}: {datetime.now()}]: [ERROR] - Error retrieving applications data: {_err}")
-                return self.controller_base.generate_response(None, 500)
-            elif not _app_data:
-                logging.warning(f"[{self.__class__.__name__}: {self.getApps.__name__}: {datetime.now()}]: [WARNING] - Applications not found")
-                return self.controller_base.generate_response(_app_data, 200)
-            else:
-                logging.info(f"[{self.__class__.__name__}: {self.getApps.__name__}: {datetime.now()}]: [INFO] - Applications data retrieved successfully")
-                return self.controller_base.generate_response(_app_data, 200)
+            # the body is encoded once per cache version, identical requests reuse the bytes
+            _body, _version = await self.app_cache.get_encoded_apps_async(_user_data.cid, _user_data.userType)
+            _etag = self.versions.get_etag(Collection.APPLICATION, _user_data.userType, _user_data.cid, version=_version)
+
+            logging.info(f"[{self.__class__.__name__}: {self.getApps.__name__}: {datetime.now()}]: [INFO] - Applications data retrieved successfully")
+            return self.controller_base.generate_raw_response(_body, 200, {"X-Cache-Version": str(_version), "ETag": _etag})
     
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.getApps.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(_e)}")
@@ -124,7 +125,8 @@ class ApplicationController(Routable):
                 return self.controller_base.generate_response(None, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.getApp.__name__}: {datetime.now()}]: [INFO] - Application data retrieved successfully")
-                return self.controller_base.generate_response(_app_data, 200)
+                # the cached record already holds its JSON
+                return self.controller_base.generate_passthrough_response(_app_data.json)
         
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.getApp.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(_e)}")
@@ -178,34 +180,41 @@ class ApplicationController(Routable):
                 logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
                 return self.controller_base.generate_response(None, 500)
 
-            # add application to app table
-            result, _err = self.app_mgr.addApp(name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid, _user_data.userType, _user_data.cid, _user_data.userName)
-            if _err:
-                logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
-                return self.controller_base.generate_response(None, 500)
-            elif not result:
-                logging.warning(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [WARNING] - Application added not successfully")
-                return self.controller_base.generate_response(None, 404)
-            
-            # add application to app unit table
-            auResult, _err = await self.app_mgr.addAppUnit(zid, appUnit_name, appUnit_ifname, appUnit_path, appUnit_enable, appUnit_pool_size, appUnit_uname, _user_data.userType, _user_data.userName, cid)
-            if _err:
-                logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding app unit: {_err}")
-                return self.controller_base.generate_response(None, 500)
-            elif not result:
-                logging.warning(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [WARNING] - App unit added not successfully")
-                return self.controller_base.generate_response(None, 404)
+            # app and app unit rows are committed together
+            async with self.app_mgr.transaction() as _tx:
+                # add application to app table
+                result, _err = await self.app_mgr.addAppAsync(name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid, _user_data.userType, _user_data.cid, _user_data.userName)
+                if _err:
+                    logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
+                    return self.controller_base.generate_response(None, 500)
+                elif not result:
+                    _tx.rollback()
+                    logging.warning(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [WARNING] - Application added not successfully")
+                    return self.controller_base.generate_response(None, 404)
+
+                # add application to app unit table
+                auResult, _err = await self.app_mgr.addAppUnit(zid, appUnit_name, appUnit_ifname, appUnit_path, appUnit_enable, appUnit_pool_size, appUnit_uname, _user_data.userType, _user_data.userName, cid)
+                if _err:
+                    logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding app unit: {_err}")
+                    return self.controller_base.generate_response(None, 500)
+                elif not auResult:
+                    _tx.rollback()
+                    logging.warning(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [WARNING] - App unit added not successfully")
+                    return self.controller_base.generate_response(None, 404)
 
             
-            _app_data, _err = self.app_mgr.getAllApps()
+            # read back only the new row (with its company name) for the cache
+            _app_data, _err = await self.app_mgr.getAppByIdAsync(result[0]['aid'])
             
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
                 return self.controller_base.generate_response(None, 500)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [INFO] - Application added successfully")
-                self.app_cache.create_app_cache(_app_data)
+                if _app_data:
+                    self.app_cache.upsert(_app_data[0])
                 self.port_cache.update_port_cache(rest_port, ws_port, prof_port)
+                self.versions.bump(Collection.APP_UNIT)
                 
                 return self.controller_base.generate_response(result, 200)
             
@@ -379,7 +388,7 @@ class ApplicationController(Routable):
     Returns:
         JSONResponse: A JSON response indicating the result of the operation.
     """
-    def updateApp(self, aid: int, name: str, ip: str, rest_port: int, ws_port: int, zid: str, key: str, desc: str, enable: int, cid: int, token: str):
+    async def updateApp(self, aid: int, name: str, ip: str, rest_port: int, ws_port: int, zid: str, key: str, desc: str, enable: int, cid: int, token: str):
         try:
             # if any(param is None for param in(aid, name, ip, rest_port, ws_port, zid, key, desc, enable, cid)):
             #     logging.warning(f"[{self.__class__.__name__}: {self.updateApp.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
@@ -393,7 +402,7 @@ class ApplicationController(Routable):
                 logging.warning(f"[{self.__class__.__name__}: {self.updateApp.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
                 return self.controller_base.generate_response(None, 401)
             
-            result, _err = self.app_mgr.updateApp(aid, name, ip, rest_port, ws_port, zid, key, desc, enable, cid, _user_data.userType, _user_data.cid, _user_data.userName)
+            result, _err = await self.app_mgr.updateAppAsync(aid, name, ip, rest_port, ws_port, zid, key, desc, enable, cid, _user_data.userType, _user_data.cid, _user_data.userName)
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.updateApp.__name__}: {datetime.now()}]: [ERROR] - Error updating application: {_err}")
                 return self.controller_base.generate_response(None, 500)
@@ -408,12 +417,15 @@ class ApplicationController(Routable):
             #     os.rename(_current_path, _new_path)
                 
             
-            _app_data, _err = self.app_mgr.getAllApps()
+            _app_data, _err = await self.app_mgr.getAppByIdAsync(aid)
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
                 return self.controller_base.generate_response(None, 500)
             else:
-                self.app_cache.create_app_cache(_app_data)
+                if _app_data:
+                    self.app_cache.upsert(_app_data[0])
+                else:
+                    self.app_cache.remove(aid)
                 logging.info(f"[{self.__class__.__name__}: {self.updateApp.__name__}: {datetime.now()}]: [INFO] - Application updated successfully")
                 return self.controller_base.generate_response(result, 200)
             
@@ -454,28 +466,50 @@ class ApplicationController(Routable):
                 return self.controller_base.generate_response(None, 401)
             
 
-            _cache_app_data= self.app_cache.deleteAppById(aid, cid, _user_data.userType)
+            _cache_app_data= await self.app_cache.deleteAppByIdAsync(aid, cid, _user_data.userType)
 
             # await self.deleteAppData(cid, _cache_app_data["zid"])
             await self.deleteAppData(_cache_app_data['cname'], _cache_app_data["zid"])
-            await self.app_mgr.delAllAppUnit( _user_data.userType, _user_data.userName, cid, _cache_app_data["zid"])
 
-            result, _err = self.app_mgr.deleteApp(aid, _user_data.userType, cid, _user_data.userName)
-            if _err:
-                logging.error(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [ERROR] - Error deleting application: {_err}")
+            # app units and app row are removed in one commit
+            try:
+                async with self.app_mgr.transaction() as _tx:
+                    _result, _err = await self.app_mgr.delAllAppUnit( _user_data.userType, _user_data.userName, cid, _cache_app_data["zid"])
+                    if _err:
+                        # the transaction is rolled back, put the app back into the cache
+                        self.app_cache.upsert(_cache_app_data)
+                        logging.error(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [ERROR] - Error deleting application units: {_err}")
+                        return self.controller_base.generate_response(None, 500)
+
+                    result, _err = await self.app_mgr.deleteAppAsync(aid, _user_data.userType, cid, _user_data.userName)
+                    if _err:
+                        # the rows are still there, put the app back into the cache
+                        self.app_cache.upsert(_cache_app_data)
+                        logging.error(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [ERROR] - Error deleting application: {_err}")
+                        return self.controller_base.generate_response(None, 500)
+                    elif not result:
+                        _tx.rollback()
+                        self.app_cache.upsert(_cache_app_data)
+                        logging.warning(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [WARNING] - Application deleted not successfully")
+                        return self.controller_base.generate_response(None, 404)
+            except Exception:
+                # the commit raised: nothing was deleted, put the app back into the cache
+                self.app_cache.upsert(_cache_app_data)
+                raise
+
+            if _tx.failed is not None:
+                # a statement failed without being reported, nothing was committed
+                self.app_cache.upsert(_cache_app_data)
+                logging.error(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [ERROR] - Application delete rolled back: {_tx.failed}")
                 return self.controller_base.generate_response(None, 500)
-            elif not result:
-                logging.warning(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [WARNING] - Application deleted not successfully")
-                return self.controller_base.generate_response(None, 404)
             
             # if _err:
             #     logging.error(f"[{self.__class__.__name__}: {self.addApp.__name__}: {datetime.now()}]: [ERROR] - Error adding application: {_err}")
             #     return self.controller_base.generate_response(None, 500)
-            else:
-                _app_data, _err = self.app_mgr.getAllApps()
-                self.app_cache.create_app_cache(_app_data)
-                logging.info(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [INFO] - Application deleted successfully")
-                return self.controller_base.generate_response(result, 200)
+            # the row was already dropped from the cache by deleteAppById
+            self.versions.bump(Collection.APP_UNIT)
+            logging.info(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [INFO] - Application deleted successfully")
+            return self.controller_base.generate_response(result, 200)
             
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.deleteApp.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(_e)}")
@@ -11,7 +11,9 @@
 
 # #######################################################################################################
  
-from fastapi.responses import JSONResponse
+import json
+import zlib
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from src.controller.base.types import ResponseModel
 
 
@@ -26,12 +28,144 @@ class ControllerBase:
         Parameters:
             data: Data to be included in the response.
             status_code (int): HTTP status code.
+            headers (dict): Extra response headers, sent with success responses.
             
         Returns:
             JSONResponse: Response containing status code and data.
     """
-    def generate_response(self, data, status_code: int):
+    def generate_response(self, data, status_code: int, headers: dict = None):
         if status_code != 200:
             return JSONResponse(content=None, status_code=status_code)
         _content = ResponseModel(status_code=status_code, data=data)
-        return JSONResponse(content=_content.dict(), status_code=status_code)
+        return JSONResponse(content=_content.dict(), status_code=status_code, headers=headers)
+
+
+    """
+        Encode a success response body once, in the same form generate_response sends it,
+        so it can be cached and sent again as is.
+
+        Parameters:
+            data: Data to be included in the response.
+
+        Returns:
+            bytes: The encoded response body.
+    """
+    def encode_response(self, data):
+        _content = ResponseModel(data=data)
+        return json.dumps(_content.dict(), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+    """
+        Generate a response from an already encoded body.
+
+        Parameters:
+            body (bytes): The encoded response body.
+            status_code (int): HTTP status code.
+            headers (dict): Extra response headers.
+
+        Returns:
+            Response: Response containing the body as is.
+    """
+    def generate_raw_response(self, body: bytes, status_code: int = 200, headers: dict = None):
+        return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+    """
+        Generate a success response around a JSON body received from elsewhere, without decoding it.
+
+        The body is sent as is between the {"data": prefix and the } suffix, which gives the same
+        envelope as generate_response.
+
+        Parameters:
+            body (bytes): The JSON encoded data.
+            headers (dict): Extra response headers.
+
+        Returns:
+            StreamingResponse: Response sending prefix, body and suffix with the total Content-Length.
+    """
+    def generate_passthrough_response(self, body: bytes, headers: dict = None):
+        _body = body or b"null"
+
+        async def _parts():
+            yield b'{"data":'
+            yield _body
+            yield b'}'
+
+        _headers = {"Content-Length": str(len(_body) + 9), **(headers or {})}
+        return StreamingResponse(_parts(), status_code=200, headers=_headers, media_type="application/json")
+
+
+    """
+        Generate a streamed response, gzip compressed on the fly when the client accepts it.
+
+        Every chunk is flushed through the compressor on its own, so a long-lived stream (follow,
+        SSE) reaches the client as it is produced instead of when the compressor's buffer fills.
+
+        Parameters:
+            chunks: Async iterator of bytes.
+            media_type (str): Content type of the stream.
+            accept_encoding (str): The Accept-Encoding header of the request, or None.
+            headers (dict): Extra response headers.
+            background (BackgroundTask): Task run once the response is finished.
+
+        Returns:
+            StreamingResponse: The streamed response.
+    """
+    def generate_stream_response(self, chunks, media_type: str, accept_encoding: str = None, headers: dict = None, background=None):
+        _headers = dict(headers or {})
+        if not accept_encoding or "gzip" not in accept_encoding.lower():
+            return StreamingResponse(chunks, media_type=media_type, headers=_headers, background=background)
+
+        async def _compressed():
+            _compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            try:
+                async for _chunk in chunks:
+                    _data = _compressor.compress(_chunk) + _compressor.flush(zlib.Z_SYNC_FLUSH)
+                    if _data:
+                        yield _data
+                yield _compressor.flush()
+            finally:
+                # release the source right away when the client goes away
+                if hasattr(chunks, "aclose"):
+                    await chunks.aclose()
+
+        _headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+        return StreamingResponse(_compressed(), media_type=media_type, headers=_headers, background=background)
+
+
+    """
+        Check an If-None-Match request header against the current ETag of a resource.
+
+        Parameters:
+            if_none_match (str): The If-None-Match header value, or None.
+            etag (str): The current ETag of the resource.
+
+        Returns:
+            bool: True when the client copy is current and a 304 can be sent.
+    """
+    def is_not_modified(self, if_none_match, etag: str):
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+        for _tag in if_none_match.split(","):
+            _tag = _tag.strip()
+            if _tag.startswith("W/"):
+                _tag = _tag[2:]
+            if _tag == etag:
+                return True
+        return False
+
+
+    """
+        Generate a 304 Not Modified response.
+
+        Parameters:
+            etag (str): The current ETag of the resource.
+
+        Returns:
+            Response: Empty response carrying the ETag.
+    """
+    def generate_not_modified(self, etag: str):
+        return Response(status_code=304, headers={"ETag": etag})
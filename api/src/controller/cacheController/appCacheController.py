@@ -12,11 +12,17 @@
 # #######################################################################################################
 
 import logging
+from collections import OrderedDict
 from datetime import datetime
+import threading
 import cachetools
 from src.controller.cacheController.sessionController import SessionController
+from src.controller.base.controllerBase import ControllerBase
+from src.controller.cacheController.versionController import Collection, VersionController
 from src.controller.base.types import UserType
+from src.utilities.records import Record, make_record
 from src.utilities.settings import get_config
+from src.ws.websocket_hub import WebSocketHub
 
 def singleton(cls):
     instances = {}
@@ -30,27 +36,310 @@ def singleton(cls):
 
 
 
+"""Cache of the app rows behind the application endpoints.
+
+    Apps are held per company: a company is resident with all of its apps, or not at all. When
+    app_cache_max_rows or app_cache_max_bytes (approximate, see Record.size) is exceeded, the least
+    recently used companies are evicted whole, never the one just used. A lookup that misses a
+    company that is not resident reads it through the loader (AppManager, set at startup) and makes
+    it resident again, so an evicted company is slower to read, never missing. While every company
+    is resident (the cache is complete) a miss is a real miss and the database is not touched.
+    Callers on the event loop use the Async variants, whose reads run on the database executor.
+    Lists over every company read the whole table once instead, and a full read that fits within
+    the bounds makes the cache complete again.
+
+    Rows are held as app records (src.utilities.records), read like the row dicts with the key
+    hidden. Reads return the records themselves and list bodies are the join of their JSON.
+"""
 @singleton
 class AppCacheController:
     def __init__(self):
         super().__init__()
-        self._app_cache = cachetools.TTLCache(maxsize=int(get_config("APP_CACHE_SIZE")), ttl=60 * 60 * 24 * 356 * 1000)
+        # Indexes over the app records, all guarded by _lock:
+        #   _apps     aid -> record
+        #   _by_cid   cid -> {aid: record}
+        #   _enabled  cid -> {aid: record} for enabled apps only
+        #   _sizes    aid -> approximate bytes of the record
+        #   _resident cid -> approximate bytes of the company, least recently used first
+        #   _encoded  (cid, user type) -> encoded GET /application body of the current version
+        self._apps = {}
+        self._by_cid = {}
+        self._enabled = {}
+        self._sizes = {}
+        self._resident = OrderedDict()
+        self._bytes = 0
+        self._complete = True
+        self._encoded = {}
+        self._version = 0
+        self._loader = None
+        self.max_rows = int(get_config("APP_CACHE_MAX_ROWS", 0))
+        self.max_bytes = int(get_config("APP_CACHE_MAX_BYTES", 0))
+        self._metrics = {"misses": 0, "loads": 0, "evictions": 0}
+        self.versions = VersionController()
+        self._lock = threading.RLock()
         self.session_mgr = SessionController()
+        self.controller_base = ControllerBase()
+        self.ws_hub = WebSocketHub()
+
+
+    def set_loader(self, loader):
+        """Set the source of the companies that are not resident (an AppManager)."""
+        self._loader = loader
+
+
+    def _bump_version(self):
+        """Invalidate the encoded responses after a change. Caller holds the lock."""
+        # shared with the ETags of GET /application
+        self._version = self.versions.bump(Collection.APPLICATION)
+        self._encoded = {}
+
+
+    def _record(self, row):
+        """Return the record of an app row read from the database (or the record itself)."""
+        return row if isinstance(row, Record) else make_record("app", row, hidden=("key",))
+
+
+    def _index_row(self, record):
+        """Add a record to every index and make its company resident. Caller holds the lock."""
+        _aid = record['aid']
+        _size = record.size()
+
+        self._apps[_aid] = record
+        self._sizes[_aid] = _size
+        self._by_cid.setdefault(record['cid'], {})[_aid] = record
+        if record['enable'] == 1:
+            self._enabled.setdefault(record['cid'], {})[_aid] = record
+        self._resident[record['cid']] = self._resident.get(record['cid'], 0) + _size
+        self._bytes += _size
+
+
+    def _unindex_row(self, aid):
+        """Remove a record from every index and return it. Caller holds the lock."""
+        _row = self._apps.pop(aid, None)
+        if _row is None:
+            return None
+
+        _size = self._sizes.pop(aid, 0)
+        self._bytes -= _size
+        if _row['cid'] in self._resident:
+            # the company stays resident, even with no app left
+            self._resident[_row['cid']] -= _size
+        for _index in (self._by_cid, self._enabled):
+            _apps = _index.get(_row['cid'])
+            if _apps is not None:
+                _apps.pop(aid, None)
+                if not _apps:
+                    del _index[_row['cid']]
+        return _row
+
+
+    def _over_bound(self):
+        return (self.max_rows > 0 and len(self._apps) > self.max_rows) or (self.max_bytes > 0 and self._bytes > self.max_bytes)
+
+
+    def _evict(self, keep_cid=None):
+        """Evict least recently used companies until the cache is within its bounds. Caller holds the lock."""
+        for _cid in list(self._resident):
+            if not self._over_bound():
+                return
+            if _cid == keep_cid:
+                continue
+            for _aid in list(self._by_cid.get(_cid, {})):
+                self._unindex_row(_aid)
+            del self._resident[_cid]
+            self._complete = False
+            self._metrics["evictions"] += 1
+            logging.info(f"[{self.__class__.__name__}: {self._evict.__name__}: {datetime.now()}]: [INFO] - Apps of company {_cid} evicted from cache")
+
+
+    def _store_company(self, cid, version, rows, err):
+        """Make a company read by the loader resident, unless the cache changed during the read.
+
+        Returns aid -> record of the company, or None when the read failed. When the cache changed during the read
+        the records are returned without being cached, they may be older than the change.
+        """
+        if err:
+            logging.error(f"[{self.__class__.__name__}: {self._store_company.__name__}: {datetime.now()}]: [ERROR] - An error occurred while reading apps of company {cid}: {str(err)}")
+            return None
+
+        _records = [self._record(_row) for _row in rows or []]
+        with self._lock:
+            self._metrics["loads"] += 1
+            if version == self._version and cid not in self._resident:
+                self._resident[cid] = 0
+                for _record in _records:
+                    self._index_row(_record)
+                self._evict(cid)
+        return {_record['aid']: _record for _record in _records}
+
+
+    def _load_company(self, cid):
+        """Read the apps of a company through the loader and make it resident. None when there is no loader or the read failed."""
+        if self._loader is None:
+            return None
+        with self._lock:
+            _version = self._version
+        _rows, _err = self._loader.getAppsByCid(cid)
+        return self._store_company(cid, _version, _rows, _err)
+
+
+    async def _load_company_async(self, cid):
+        """_load_company, with the read run off the event loop."""
+        if self._loader is None:
+            return None
+        with self._lock:
+            _version = self._version
+        _rows, _err = await self._loader.getAppsByCidAsync(cid)
+        return self._store_company(cid, _version, _rows, _err)
+
+
+    def _close_streams(self, aid, old=None, new=None):
+        """Close the relayed WebSocket streams of an app that was removed (new is None), disabled or moved."""
+        if new is None or new['enable'] != 1 or (old is not None and (old['ip'], old['ws_port']) != (new['ip'], new['ws_port'])):
+            self.ws_hub.close_app(aid)
+
+
+    def _touch(self, cid):
+        """Mark a company as the most recently used. Only kept up while the cache is bounded."""
+        if self.max_rows > 0 or self.max_bytes > 0:
+            with self._lock:
+                if cid in self._resident:
+                    self._resident.move_to_end(cid)
+
+
+    def _cached_company_apps(self, cid, enabled_only):
+        """Return (aid -> record, True) when the cache can answer for a company, (None, False) when it has to be read through."""
+        # hits are served without the lock, like the unbounded cache was
+        if cid in self._resident:
+            self._touch(cid)
+            return (self._enabled if enabled_only else self._by_cid).get(cid, {}), True
+        with self._lock:
+            if cid in self._resident or self._complete or self._loader is None:
+                return (self._enabled if enabled_only else self._by_cid).get(cid, {}), True
+            self._metrics["misses"] += 1
+        return None, False
+
+
+    def _company_apps(self, cid, enabled_only=False):
+        """Return aid -> record of the apps of a company, read through when it is not resident."""
+        _apps, _answered = self._cached_company_apps(cid, enabled_only)
+        if _answered:
+            return _apps
+        _records = self._load_company(cid) or {}
+        return {_aid: _record for _aid, _record in _records.items() if not enabled_only or _record['enable'] == 1}
+
+
+    async def _company_apps_async(self, cid, enabled_only=False):
+        """_company_apps, with the read through run off the event loop."""
+        _apps, _answered = self._cached_company_apps(cid, enabled_only)
+        if _answered:
+            return _apps
+        _records = await self._load_company_async(cid) or {}
+        return {_aid: _record for _aid, _record in _records.items() if not enabled_only or _record['enable'] == 1}
+
+
+    def _cached_app(self, aid):
+        """Return (record, True) when the cache can answer for an app, (None, False) when it has to be read through."""
+        _row = self._apps.get(aid)
+        if _row is not None:
+            self._touch(_row['cid'])
+            return _row, True
+        with self._lock:
+            _row = self._apps.get(aid)
+            if _row is not None or self._complete or self._loader is None:
+                return _row, True
+            self._metrics["misses"] += 1
+        return None, False
+
+
+    def _find_app(self, aid):
+        """Return the record of an app, read through when the cache is not complete."""
+        _row, _answered = self._cached_app(aid)
+        if _answered:
+            return _row
+
+        _rows, _err = self._loader.getAppById(aid)
+        if _err or not _rows:
+            return None
+        # bring in the whole company, the next apps asked for are likely its own
+        return (self._load_company(_rows[0]['cid']) or {}).get(aid) or self._record(_rows[0])
+
+
+    async def _find_app_async(self, aid):
+        """_find_app, with the read through run off the event loop."""
+        _row, _answered = self._cached_app(aid)
+        if _answered:
+            return _row
+
+        _rows, _err = await self._loader.getAppByIdAsync(aid)
+        if _err or not _rows:
+            return None
+        return (await self._load_company_async(_rows[0]['cid']) or {}).get(aid) or self._record(_rows[0])
+
+
+    def _needs_all_rows(self):
+        """Return the cache version when every app has to be read from the database, None when the cache has them all."""
+        with self._lock:
+            if self._complete or self._loader is None:
+                return None
+            self._metrics["misses"] += 1
+            return self._version
+
+
+    def _store_all(self, version, rows, err):
+        """Return the records of a full read, and make the cache complete again when they fit within its bounds.
+
+        A full read does not evict or load companies one by one, so a caller going over every app (the scraper,
+        a super admin list) costs one read instead of cycling every company through the cache.
+        """
+        if err:
+            # better the resident companies than nothing
+            logging.error(f"[{self.__class__.__name__}: {self._store_all.__name__}: {datetime.now()}]: [ERROR] - An error occurred while reading all apps: {str(err)}")
+            return None
+
+        _records = [self._record(_row) for _row in rows or []]
+        if (self.max_rows <= 0 or len(_records) <= self.max_rows) and (self.max_bytes <= 0 or sum(_record.size() for _record in _records) <= self.max_bytes):
+            with self._lock:
+                if version == self._version:
+                    # same rows as the database, so the version (and the ETags) stay as they are
+                    self._apps, self._by_cid, self._enabled, self._sizes = {}, {}, {}, {}
+                    self._resident, self._bytes, self._complete = OrderedDict(), 0, True
+                    for _record in _records:
+                        self._index_row(_record)
+                    self._metrics["loads"] += 1
+        return _records
+
+
+    def _all_rows(self):
+        """Return every app record from the database when the cache is not complete, None when the cache has them all."""
+        _version = self._needs_all_rows()
+        if _version is None:
+            return None
+        _rows, _err = self._loader.getAllApps()
+        return self._store_all(_version, _rows, _err)
+
+
+    async def _all_rows_async(self):
+        """_all_rows, with the read run off the event loop."""
+        _version = self._needs_all_rows()
+        if _version is None:
+            return None
+        _rows, _err = await self._loader.getAllAppsAsync()
+        return self._store_all(_version, _rows, _err)
 
 
     def create_app_cache(self, app_data):
         """Create or update the app cache with the provided data."""
         try:
-            self._app_cache.clear()  # Clear existing cache
+            with self._lock:
+                # Clear existing cache
+                self._apps, self._by_cid, self._enabled, self._sizes = {}, {}, {}, {}
+                self._resident, self._bytes, self._complete = OrderedDict(), 0, True
 
-            for _row in app_data:
-                _cid = _row['cid']
-
-                if _cid not in self._app_cache:
-                    self._app_cache[_cid] = []
-                    self._app_cache[_cid].append(_row)
-                else:
-                    self._app_cache[_cid].append(_row)
+                for _row in app_data or []:
+                    self._index_row(self._record(_row))
+                self._evict()
+                self._bump_version()
 
             logging.info(f"[{self.__class__.__name__}: {self.create_app_cache.__name__}: {datetime.now()}]: [INFO] - App data stored successfully")
             return True, None
@@ -60,136 +349,208 @@ class AppCacheController:
             return None, _e
 
 
+    def upsert(self, row):
+        """Insert or replace a single app row (or record) in the cache."""
+        try:
+            row = self._record(row)
+            with self._lock:
+                # The company or enable flag may have changed, so drop the old row from every index first
+                _old = self._unindex_row(row['aid'])
+                # an app of a company that is not resident is read through when asked for
+                if row['cid'] in self._resident or self._complete:
+                    self._index_row(row)
+                    self._resident.move_to_end(row['cid'])
+                    self._evict(row['cid'])
+                self._bump_version()
+            self._close_streams(row['aid'], _old, row)
+
+            logging.info(f"[{self.__class__.__name__}: {self.upsert.__name__}: {datetime.now()}]: [INFO] - App {row['aid']} stored in cache")
+            return True, None
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.upsert.__name__}: {datetime.now()}]: [ERROR] - An error occurred while storing app in cache: {str(_e)}")
+            return None, _e
+
+
+    def remove(self, aid):
+        """Remove a single app from the cache and return the removed record."""
+        try:
+            with self._lock:
+                _row = self._unindex_row(aid)
+                # the app may belong to a company that is not resident
+                if _row is not None or not self._complete:
+                    self._bump_version()
+            self._close_streams(aid)
+
+            if _row is not None:
+                logging.info(f"[{self.__class__.__name__}: {self.remove.__name__}: {datetime.now()}]: [INFO] - App {aid} removed from cache")
+            return _row
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.remove.__name__}: {datetime.now()}]: [ERROR] - An error occurred while removing app from cache: {str(_e)}")
+            return None
+
+
+    def _app_key(self, row, aid, cid):
+        """Return the key of an app record when it belongs to the cid ('*' for any)."""
+        _key = None
+        if row is not None and (cid == '*' or row['cid'] == cid):
+            _key = row.hidden('key')
+
+        if _key is None:
+            logging.warning(f"[{self.__class__.__name__}: {self.get_app_key.__name__}: {datetime.now()}]: [WARNING] - App key not found in cache for aid: {aid}, cid: {cid}")
+        return _key
+
+
     def get_app_key(self, aid, cid):
         """Retrieve the app key from the cache."""
         try:
-            _key = None
-            if cid == '*':
-                for _value in self._app_cache.values():
-                    if isinstance(_value, list):
-                        for _item in _value:
-                            if isinstance(_item, dict) and _item.get('aid') == aid:
-                                _key = _item.get('key')
-                                break
-                    elif isinstance(_value, dict) and _value.get('aid') == aid:
-                        _key = _value.get('key')
-                        break
-            else:
-                for _item in self._app_cache[cid]:
-                    if _item['aid'] == aid:
-                        _key = _item['key']
-                        break
-
-            if _key is None:
-                logging.warning(f"[{self.__class__.__name__}: {self.get_app_key.__name__}: {datetime.now()}]: [WARNING] - App key not found in cache for aid: {aid}, cid: {cid}")
-            return _key
+            return self._app_key(self._find_app(aid), aid, cid)
 
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.get_app_key.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app key from cache: {str(_e)}")
             return None
 
+    async def get_app_key_async(self, aid, cid):
+        """get_app_key for the event loop, the read through runs on the database executor."""
+        try:
+            return self._app_key(await self._find_app_async(aid), aid, cid)
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_app_key_async.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app key from cache: {str(_e)}")
+            return None
+
+    def _listed(self, rows=None, apps=None):
+        """Return a list of the records read through (rows), of a company (apps) or of every resident company."""
+        if rows is not None:
+            return rows
+        with self._lock:
+            return list((self._apps if apps is None else apps).values())
+
     def getAllApps(self, cid, user_type):
-        """Retrieve all apps based on the user type and cid."""
+        """Retrieve all apps (records) based on the user type and cid."""
         try:
-            _app_data = []
-            # print(self._app_cache)
             if user_type == UserType.SUPER_ADMIN.value:
-                for cid, _data in self._app_cache.items():
-                    if isinstance(_data, list):
-                        # for item in _data:
-                            # if 'key' in item:
-                            #     del item['key']
-                        _app_data.extend(_data)
-                    else:
-                        _app_data.append(_data)
-                # return _app_data
-                if not _app_data:
-                    return []
-                return [
-                    {k: v for k, v in item.items() if k != 'key'}
-                    for item in _app_data
-                ]
-            elif user_type == UserType.ADMIN.value:
-                return [
-                    {k: v for k, v in item.items() if k != 'key'}
-                    for item in self._app_cache.get(cid, [])
-                ]
-            else:
-                return [
-                    {k: v for k, v in item.items() if k != 'key'}
-                    for item in self._app_cache.get(cid, [])
-                    if item['enable'] == 1
-                ]
-                
+                return self._listed(rows=self._all_rows())
+            return self._listed(apps=self._company_apps(cid, enabled_only=user_type != UserType.ADMIN.value))
 
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.getAllApps.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving all apps from cache: {str(_e)}")
             return None
 
+    async def getAllAppsAsync(self, cid, user_type):
+        """getAllApps for the event loop, the read through runs on the database executor."""
+        try:
+            if user_type == UserType.SUPER_ADMIN.value:
+                return self._listed(rows=await self._all_rows_async())
+            return self._listed(apps=await self._company_apps_async(cid, enabled_only=user_type != UserType.ADMIN.value))
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.getAllAppsAsync.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving all apps from cache: {str(_e)}")
+            return None
+
+    def _enabled_rows(self, rows):
+        if rows is not None:
+            return [_row for _row in rows if _row['enable'] == 1]
+        with self._lock:
+            return [_row for _apps in self._enabled.values() for _row in _apps.values()]
+
+    def getEnabledApps(self):
+        """Retrieve the enabled apps (records) of every company."""
+        return self._enabled_rows(self._all_rows())
+
+    async def getEnabledAppsAsync(self):
+        """getEnabledApps for the event loop, the database is read once when the cache is not complete."""
+        return self._enabled_rows(await self._all_rows_async())
+
+    async def get_encoded_apps_async(self, cid, user_type):
+        """Return the encoded GET /application body for the cid and user type, with the cache version it was built from."""
+        # Super admins see every company, so they share one entry
+        _key = ('*', user_type) if user_type == UserType.SUPER_ADMIN.value else (cid, user_type)
+        with self._lock:
+            _body = self._encoded.get(_key)
+            _version = self._version
+        if _body is None:
+            # built outside the lock, it may read through to the database
+            _apps = await self.getAllAppsAsync(cid, user_type)
+            # same bytes as encode_response, from the JSON the records already hold
+            _body = b'{"data":[' + b",".join(_app.json for _app in _apps) + b']}' if _apps is not None else self.controller_base.encode_response(None)
+            with self._lock:
+                if _version == self._version:
+                    self._encoded[_key] = _body
+        return _body, _version
+
     def getAppById(self, app_id, cid, user_type):
         try:
-            _app_data = {}
             if user_type == UserType.SUPER_ADMIN.value:
-                for _data in self._app_cache.values():
-                    if isinstance(_data, list):
-                        for _item in _data:
-                            if _item.get('aid') == app_id:
-                                _app_data = _item
-                                return {k: v for k, v in _app_data.items() if k != 'key'}
+                return self._find_app(app_id)
 
             elif user_type == UserType.ADMIN.value:
-                # Retrieve data for a specific 'cid' and search for the app by ID
-                if cid in self._app_cache:
-                    for _item in self._app_cache[cid]:
-                        if _item.get('aid') == app_id:
-                                _app_data = _item
-                                return {k: v for k, v in _app_data.items() if k != 'key'}
+                # Only apps of the user's company
+                return self._company_apps(cid).get(app_id)
 
             else:
-                # Retrieve data for a specific 'cid' and search for the app by ID if enabled
-                if cid in self._app_cache:
-                    for _item in self._app_cache[cid]:
-                        if _item.get('aid') == app_id and _item.get('enable') == 1:
-                            _app_data = _item
-                            return {k: v for k, v in _app_data.items() if k != 'key'}
-
-            # Return None or an appropriate response if the app was not found
+                # Only enabled apps of the user's company
+                return self._company_apps(cid, enabled_only=True).get(app_id)
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.getAppById.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app by ID from cache: {str(_e)}")
+            return None
+
+    async def getAppByIdAsync(self, app_id, cid, user_type):
+        """getAppById for the event loop, the read through runs on the database executor."""
+        try:
+            if user_type == UserType.SUPER_ADMIN.value:
+                return await self._find_app_async(app_id)
+            return (await self._company_apps_async(cid, enabled_only=user_type != UserType.ADMIN.value)).get(app_id)
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.getAppByIdAsync.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app by ID from cache: {str(_e)}")
+            return None
+
+
+    def _drop_app(self, row, aid, cid, user_type):
+        """Remove an app found for a delete from the cache when the user may delete it, and return its record."""
+        if row is None:
             return None
 
-        except Exception as e:
-            # Handle exceptions (logging, re-raising, etc.)
-            print(f"Error retrieving app by ID: {e}")
+        if user_type != UserType.SUPER_ADMIN.value and (user_type not in (UserType.ADMIN.value, UserType.USER.value) or row['cid'] != cid):
             return None
 
+        with self._lock:
+            self._unindex_row(aid)
+            self._bump_version()
+        self._close_streams(aid)
+        return row
+
 
     def deleteAppById(self, aid: str, cid, user_type):
         """Retrieve an app by its ID based on the user type and cid."""
-        _data = None
-        _row = None
         try:
-            if user_type == UserType.SUPER_ADMIN.value:
-                for cid, _data in self._app_cache.items():
-                    for index, _row in enumerate(_data):
-                        if _row.get('aid') == aid:
-                            del _data[index]
-                            return _row
-                            break
-            elif user_type == UserType.ADMIN.value or user_type == UserType.USER.value:
-                if cid in self._app_cache:
-                    for index, _row in enumerate(self._app_cache[cid]):
-                        if _row.get('aid') == aid:
-                            del self._app_cache[cid][index]
-                            return _row
-                            break
+            return self._drop_app(self._find_app(aid), aid, cid, user_type)
 
         except Exception as _e:
             logging.error(f"[{self.__class__.__name__}: {self.deleteAppById.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app by ID from cache: {str(_e)}")
             del _e
             return None
 
-        finally:
-            # Delete variables
-            del _data
+
+    async def deleteAppByIdAsync(self, aid: str, cid, user_type):
+        """deleteAppById for the event loop, the read through runs on the database executor."""
+        try:
+            return self._drop_app(await self._find_app_async(aid), aid, cid, user_type)
+
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.deleteAppByIdAsync.__name__}: {datetime.now()}]: [ERROR] - An error occurred while retrieving app by ID from cache: {str(_e)}")
+            del _e
+            return None
+
+
+    def get_metrics(self):
+        """Return the size of the cache against its bounds and the read-through counters."""
+        with self._lock:
+            return {**self._metrics, "rows": len(self._apps), "bytes": self._bytes, "companies": len(self._resident), "complete": self._complete,
+                    "max_rows": self.max_rows, "max_bytes": self.max_bytes, "read_through": self._loader is not None}
 
 
     def __del__(self):
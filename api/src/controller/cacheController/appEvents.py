@@ -0,0 +1,201 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+import logging
+import secrets
+import threading
+import time
+from src.utilities.settings import get_config
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+class EventSubscription:
+    """Pending events of one GET /events client, at most one per app.
+
+    A new event of an app that is still pending is merged into it, so a client that reads slowly
+    gets the latest state of each app instead of every intermediate step.
+    """
+    def __init__(self):
+        self._pending = OrderedDict()
+        self._ready = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self.coalesced = 0
+
+
+    def push(self, event):
+        _previous = self._pending.pop(event["aid"], None)
+        if _previous is not None:
+            self.coalesced += 1
+            event = {**_previous, **event, "changes": sorted(set(_previous["changes"]) | set(event["changes"]))}
+        self._pending[event["aid"]] = event
+        self._ready.set()
+
+
+    async def get(self, timeout: float = None, window: float = 0):
+        """Wait for events and return them, oldest first; an empty list when timeout passes without any."""
+        if not self._pending:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+            # let a burst (a scrape round) settle so each app is sent once
+            if window:
+                await asyncio.sleep(window)
+        _events = list(self._pending.values())
+        self._pending.clear()
+        return _events
+
+
+"""State transitions of the monitored apps.
+
+    The scraper and the live calls made for the dashboards report every answer (or failure) of an
+    app through observe(); a config reload through config_reloaded(). Only changes are published:
+    up/down, the latency class (fast / normal / slow against events_latency_thresholds) and config
+    reloads. Each event carries a sequence number, the last events_backlog of them are kept so a
+    client reconnecting with Last-Event-ID gets what it missed.
+"""
+@singleton
+class AppEvents:
+    def __init__(self):
+        _thresholds = str(get_config("EVENTS_LATENCY_THRESHOLDS", "200,1000")).split(",")
+        self.latency_thresholds = sorted(float(_threshold) for _threshold in _thresholds if _threshold.strip())
+        self.latency_classes = ["fast", "normal", "slow"][:len(self.latency_thresholds) + 1]
+        self.backlog_size = int(get_config("EVENTS_BACKLOG", 1000))
+
+        # aid -> {"state", "latency", "config_reload", "ts"}
+        self._states = {}
+        self._backlog = deque(maxlen=self.backlog_size)
+        self._subscriptions = set()
+        self._seq = 0
+        # sequence numbers and backlog belong to this process: the epoch in the event ids tells a
+        # client reconnecting to another worker (or after a restart) apart from one that can resume
+        self.epoch = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._metrics = {"observed": 0, "published": 0}
+
+
+    def event_id(self, seq: int):
+        """Return the SSE event id of a sequence number."""
+        return f"{self.epoch}-{seq}"
+
+
+    def parse_event_id(self, event_id: str):
+        """Return the sequence number of an event id of this process, None for an id of another one.
+
+        Raises ValueError when the id is malformed.
+        """
+        _epoch, _, _seq = event_id.rpartition("-")
+        if not _seq.isdigit():
+            raise ValueError(event_id)
+        return int(_seq) if _epoch == self.epoch else None
+
+
+    def _latency_class(self, latency_ms: float):
+        for _index, _threshold in enumerate(self.latency_thresholds):
+            if latency_ms < _threshold:
+                return self.latency_classes[_index]
+        return self.latency_classes[-1]
+
+
+    def observe(self, aid, up: bool, latency_ms: float = None):
+        """Record an answer (up=True) or a failure of an app; publishes an event when its state or latency class changed."""
+        with self._lock:
+            self._metrics["observed"] += 1
+            _current = self._states.get(aid, {})
+            _changes = {}
+            _state = "up" if up else "down"
+            if _current.get("state") != _state:
+                _changes["state"] = _state
+            if up and latency_ms is not None:
+                _latency = self._latency_class(latency_ms)
+                if _current.get("latency") != _latency:
+                    _changes["latency"] = _latency
+            if _changes:
+                self._publish(aid, _changes)
+
+
+    def config_reloaded(self, aid):
+        """Record a successful config reload of an app."""
+        with self._lock:
+            self._publish(aid, {"config_reload": datetime.now().isoformat()})
+
+
+    def forget(self, aids):
+        """Drop the state of apps that are no longer monitored."""
+        with self._lock:
+            for _aid in [_aid for _aid in self._states if _aid not in aids]:
+                del self._states[_aid]
+
+
+    def _publish(self, aid, changes: dict):
+        self._seq += 1
+        _state = self._states.setdefault(aid, {})
+        _state.update(changes)
+        _state["ts"] = time.time()
+        _event = {"aid": aid, "seq": self._seq, **_state, "changes": sorted(changes)}
+        self._backlog.append(_event)
+        self._metrics["published"] += 1
+
+        for _subscription in list(self._subscriptions):
+            # observe() may run outside the loop the client waits on
+            try:
+                if asyncio.get_running_loop() is _subscription._loop:
+                    _subscription.push(_event)
+                    continue
+            except RuntimeError:
+                pass
+            _subscription._loop.call_soon_threadsafe(_subscription.push, _event)
+
+        logging.info(f"[{self.__class__.__name__}: {self._publish.__name__}: {datetime.now()}]: [INFO] - App {aid}: {changes}")
+
+
+    def subscribe(self, last_seq: int = None):
+        """Subscribe to new events.
+
+        Returns (subscription, snapshot, seq). With a last_seq the backlog still covers, the events after it are
+        queued on the subscription and snapshot is None; otherwise snapshot is the current state of every app.
+        seq is the last sequence number at the time of the call: events after it go to the subscription.
+        """
+        with self._lock:
+            _subscription = EventSubscription()
+            self._subscriptions.add(_subscription)
+            if last_seq is None or last_seq > self._seq or (self._backlog and last_seq < self._backlog[0]["seq"] - 1):
+                return _subscription, [{"aid": _aid, "seq": self._seq, **_state, "changes": []} for _aid, _state in self._states.items()], self._seq
+            for _event in self._backlog:
+                if _event["seq"] > last_seq:
+                    _subscription.push(dict(_event))
+            return _subscription, None, self._seq
+
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+    def get_metrics(self):
+        with self._lock:
+            return {**self._metrics, "seq": self._seq, "apps": len(self._states), "subscribers": len(self._subscriptions), "backlog": len(self._backlog)}
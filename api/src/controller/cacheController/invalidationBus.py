@@ -0,0 +1,227 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime, timezone
+import logging
+import sqlite3
+import threading
+import time
+from src.controller.cacheController.appCacheController import AppCacheController, PortCacheController
+from src.controller.cacheController.versionController import Collection, VersionController
+from src.model.app_manager import AppManager
+from src.model.change_manager import ChangeManager
+from src.model.db_manager import DBManager
+from src.utilities.settings import get_config
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+"""Spreads database changes to the caches of every worker.
+
+    Each worker (and each node working on the same database file) watches PRAGMA data_version on a
+    connection of its own, every invalidation_poll_interval seconds. The value moves whenever another
+    connection commits, so an idle database costs one pragma per poll. On a move the new entries of
+    the change journal (changeLog, filled by triggers) are read in version order and applied: changed
+    apps are reloaded into the app cache, the port cache is rebuilt, and the ETag versions of the
+    changed collections are bumped. The lag metrics compare the journal timestamp of each entry
+    with the time it was applied here.
+"""
+@singleton
+class InvalidationBus:
+    def __init__(self):
+        self.poll_interval = float(get_config("INVALIDATION_POLL_INTERVAL", 0.05))
+        self.batch_size = int(get_config("INVALIDATION_BATCH_SIZE", 1000))
+        self.app_cache = AppCacheController()
+        self.port_cache = PortCacheController()
+        self.versions = VersionController()
+        self.change_mgr = None
+        self.app_mgr = None
+
+        self._conn = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._poll_lock = threading.Lock()
+        self._last_version = 0
+        self._data_version = None
+        self._metrics_lock = threading.Lock()
+        self._metrics = {"polls": 0, "wakeups": 0, "entries": 0, "resyncs": 0, "errors": 0, "lag_total_ms": 0.0, "lag_max_ms": 0.0, "last_lag_ms": 0.0}
+
+
+    def start(self, base_dir, since=None):
+        """Start watching the database after journal version since, read before the caches were loaded.
+
+        Entries committed by other workers while the caches were loading are applied on the first poll.
+        Without since the bus starts from the latest journal version.
+        """
+        if self._thread is not None or self.poll_interval <= 0:
+            return
+        _database_mgr = DBManager(base_dir)
+        self.change_mgr = ChangeManager(base_dir)
+        self.app_mgr = AppManager(base_dir)
+        if since is None:
+            _range, _err = self.change_mgr.getVersionRange()
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.start.__name__}: {datetime.now()}]: [ERROR] - Cannot read the change journal, invalidation bus not started: {_err}")
+                return
+            since = _range[1]
+        self._last_version = since
+        self._conn = _database_mgr.open_watch_connection()
+        if self._conn is None:
+            return
+        # unknown, so the first poll reads the journal: the gap since the caches were loaded did not move data_version here
+        self._data_version = None
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="invalidation-bus", daemon=True)
+        self._thread.start()
+        logging.info(f"[{self.__class__.__name__}: {self.start.__name__}: {datetime.now()}]: [INFO] - Watching the database every {self.poll_interval}s from journal version {self._last_version}")
+
+
+    def stop(self):
+        """Stop watching."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.poll_interval * 10 + 1)
+        self._thread = None
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+        self._conn = None
+
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                _data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+                with self._metrics_lock:
+                    self._metrics["polls"] += 1
+                if _data_version == self._data_version:
+                    continue
+                self._data_version = _data_version
+                with self._metrics_lock:
+                    self._metrics["wakeups"] += 1
+                self.poll()
+            except Exception as e:
+                with self._metrics_lock:
+                    self._metrics["errors"] += 1
+                logging.error(f"[{self.__class__.__name__}: {self._run.__name__}: {datetime.now()}]: [ERROR] - Invalidation poll failed: {str(e)}")
+
+
+    def poll(self):
+        """Apply every journal entry after the last one handled. Returns the number of entries applied."""
+        _applied = 0
+        with self._poll_lock:
+            while True:
+                _entries, _err = self.change_mgr.getChangesAfter(self._last_version, self.batch_size)
+                if _err:
+                    raise _err
+                if not _entries:
+                    return _applied
+
+                if _entries[0]['version'] > self._last_version + 1 and self._is_pruned(self._last_version):
+                    # entries we never saw were pruned: rebuild everything
+                    self.resync()
+                else:
+                    self._apply(_entries)
+
+                self._last_version = _entries[-1]['version']
+                _applied += len(_entries)
+                self._record_lag(_entries)
+                if len(_entries) < self.batch_size:
+                    return _applied
+
+
+    def _is_pruned(self, version):
+        _range, _err = self.change_mgr.getVersionRange()
+        return not _err and _range[0] > version + 1
+
+
+    def _apply(self, entries):
+        _tables = {}
+        for _entry in entries:
+            _tables.setdefault(_entry['tbl'], set()).add(_entry['rid'])
+
+        _aids = _tables.pop(self.change_mgr.app, None)
+        if _aids:
+            _rows, _err = self.change_mgr.getRows(self.change_mgr.app, list(_aids))
+            if _err:
+                raise _err
+            # upsert / remove bump the application version themselves
+            for _aid in _aids:
+                if _aid in _rows:
+                    self.app_cache.upsert(_rows[_aid])
+                else:
+                    self.app_cache.remove(_aid)
+            self._reload_ports()
+
+        _collections = {self.change_mgr.appUnitTable: Collection.APP_UNIT, self.change_mgr.user: Collection.USER, self.change_mgr.company: Collection.COMPANY}
+        _changed = [_collections[_table] for _table in _tables if _table in _collections]
+        if _changed:
+            self.versions.bump(*_changed)
+
+
+    def _reload_ports(self):
+        _app_ports, _err = self.app_mgr.getAppPorts()
+        if _err:
+            raise _err
+        if _app_ports:
+            self.port_cache.create_port_cache(_app_ports)
+
+
+    def resync(self):
+        """Reload the app and port caches and invalidate every collection."""
+        _app_data, _err = self.app_mgr.getAllApps()
+        if _err:
+            raise _err
+        self.app_cache.create_app_cache(_app_data)
+        self._reload_ports()
+        self.versions.bump(Collection.APP_UNIT, Collection.USER, Collection.COMPANY)
+        with self._metrics_lock:
+            self._metrics["resyncs"] += 1
+        logging.warning(f"[{self.__class__.__name__}: {self.resync.__name__}: {datetime.now()}]: [WARNING] - Journal entries were pruned before they were applied, caches reloaded")
+
+
+    def _record_lag(self, entries):
+        _now = time.time()
+        with self._metrics_lock:
+            for _entry in entries:
+                try:
+                    _ts = datetime.strptime(_entry['ts'], "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc).timestamp()
+                except (TypeError, ValueError):
+                    continue
+                _lag = max((_now - _ts) * 1000, 0.0)
+                self._metrics["lag_total_ms"] += _lag
+                self._metrics["last_lag_ms"] = _lag
+                if _lag > self._metrics["lag_max_ms"]:
+                    self._metrics["lag_max_ms"] = _lag
+            self._metrics["entries"] += len(entries)
+
+
+    def get_metrics(self):
+        """Return the poll counters, the last applied journal version and the propagation lag."""
+        with self._metrics_lock:
+            _metrics = dict(self._metrics)
+        _metrics["lag_avg_ms"] = _metrics["lag_total_ms"] / _metrics["entries"] if _metrics["entries"] else 0.0
+        _metrics.update({"running": self._thread is not None, "poll_interval": self.poll_interval, "version": self._last_version})
+        return _metrics
@@ -0,0 +1,168 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import asyncio
+from datetime import datetime
+import logging
+import random
+import threading
+import time
+from src.controller.cacheController.appCacheController import AppCacheController
+from src.controller.cacheController.appEvents import AppEvents
+from src.utilities.circuit_breaker import CircuitOpenError
+from src.utilities.settings import get_config
+from src.utilities.upstream_client import UpstreamClient
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+"""Background scraper of the monitored apps.
+
+    Every scrape_interval seconds (plus or minus scrape_jitter of it) the /status and /info of each
+    enabled app in the app cache are fetched once and kept in memory, each target delayed by a random
+    part of the jitter window so the fleet is not hit at the same instant. The /app/{aid}/status and
+    /info routes answer from these snapshots, so upstream load follows the fleet size instead of the
+    number of dashboard viewers. A snapshot older than scrape_max_age is not served.
+"""
+@singleton
+class MetricsScraper:
+    def __init__(self):
+        self.app_cache = AppCacheController()
+        self.upstream = UpstreamClient()
+        self.app_events = AppEvents()
+        self.endpoints = {"status": "/status", "info": "/info"}
+        self.interval = float(get_config("SCRAPE_INTERVAL", 30))
+        self.jitter = float(get_config("SCRAPE_JITTER", 0.2))
+        self.concurrency = int(get_config("SCRAPE_CONCURRENCY", 50))
+        self.max_age = float(get_config("SCRAPE_MAX_AGE", self.interval * 3))
+
+        # (aid, endpoint) -> (data, status code, monotonic time of the scrape)
+        self._snapshots = {}
+        self._task = None
+        self._lock = threading.Lock()
+        self._metrics = {"rounds": 0, "scrapes": 0, "failures": 0, "last_round_ms": 0.0, "served": 0, "missed": 0}
+
+
+    def start(self):
+        """Start the scrape loop on the running event loop. A scrape_interval of 0 disables it."""
+        if self.interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logging.info(f"[{self.__class__.__name__}: {self.start.__name__}: {datetime.now()}]: [INFO] - Scraping enabled apps every {self.interval}s (jitter {self.jitter:.0%})")
+
+
+    async def stop(self):
+        """Stop the scrape loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+    async def _run(self):
+        while True:
+            _started = time.monotonic()
+            try:
+                await self.scrape_all()
+            except Exception as e:
+                logging.error(f"[{self.__class__.__name__}: {self._run.__name__}: {datetime.now()}]: [ERROR] - Scrape round failed: {str(e)}")
+
+            _delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter)) - (time.monotonic() - _started)
+            await asyncio.sleep(max(_delay, 0))
+
+
+    async def scrape_all(self):
+        """Scrape every enabled app once."""
+        _started = time.perf_counter()
+        # one read of the database per round when the cache does not hold every company
+        _apps = await self.app_cache.getEnabledAppsAsync()
+        _semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _scrape(app, endpoint):
+            await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+            async with _semaphore:
+                await self.scrape(app, endpoint)
+
+        await asyncio.gather(*[_scrape(_app, _endpoint) for _app in _apps for _endpoint in self.endpoints], return_exceptions=True)
+
+        # forget apps that were removed or disabled since the last round
+        _aids = {_app['aid'] for _app in _apps}
+        self.app_events.forget(_aids)
+        with self._lock:
+            for _key in [_key for _key in self._snapshots if _key[0] not in _aids]:
+                del self._snapshots[_key]
+            self._metrics["rounds"] += 1
+            self._metrics["last_round_ms"] = (time.perf_counter() - _started) * 1000
+
+
+    async def scrape(self, app, endpoint):
+        """Fetch one endpoint of an app and store the snapshot."""
+        _data, _status, _latency = None, 500, None
+        try:
+            # the record comes from this round's list, asking the cache again would read through per app
+            _key = app.hidden('key')
+            if _key is None:
+                return
+            _started = time.perf_counter()
+            _response = await self.upstream.get(f"http://{app['ip']}:{app['rest_port']}{self.endpoints[endpoint]}", headers={"apikey": _key})
+            _latency = (time.perf_counter() - _started) * 1000
+            if _response.status_code == 200:
+                _data, _status = _response.json(), 200
+            else:
+                logging.warning(f"[{self.__class__.__name__}: {self.scrape.__name__}: {datetime.now()}]: [WARNING] - App {app['aid']} answered {endpoint} with status code {_response.status_code}")
+
+        except CircuitOpenError:
+            # known to be down, the breaker logged it when it opened
+            _status = 503
+
+        except Exception as e:
+            logging.warning(f"[{self.__class__.__name__}: {self.scrape.__name__}: {datetime.now()}]: [WARNING] - Scraping {endpoint} of app {app['aid']} failed: {str(e)}")
+
+        self.app_events.observe(app['aid'], _status == 200, _latency)
+        with self._lock:
+            self._snapshots[(app['aid'], endpoint)] = (_data, _status, time.monotonic())
+            self._metrics["scrapes"] += 1
+            self._metrics["failures"] += _status != 200
+
+
+    def get_snapshot(self, aid, endpoint):
+        """Return (data, status code, age in seconds) of the latest scrape, or None when there is no fresh one."""
+        with self._lock:
+            _snapshot = self._snapshots.get((aid, endpoint))
+            _age = time.monotonic() - _snapshot[2] if _snapshot is not None else None
+            if _snapshot is None or _age > self.max_age:
+                self._metrics["missed"] += 1
+                return None
+            self._metrics["served"] += 1
+            return _snapshot[0], _snapshot[1], _age
+
+
+    def get_metrics(self):
+        """Return the scrape counters and the number of snapshots held."""
+        with self._lock:
+            _metrics = dict(self._metrics)
+            _metrics["snapshots"] = len(self._snapshots)
+        _metrics.update({"interval": self.interval, "jitter": self.jitter, "running": self._task is not None and not self._task.done()})
+        return _metrics
@@ -16,8 +16,13 @@ from datetime import datetime
 from typing import Optional
 from passlib.context import CryptContext
 import cachetools
+import os
 import secrets
+import threading
+import time
 from src.controller.base.types import UserInfoModel, UserType
+from src.controller.cacheController.sessionStore import MemorySessionStore, SQLiteConnections, SQLiteSessionStore, RevocationList
+from src.utilities.signed_token import TokenSigner
 from src.utilities.settings import  get_config
 # Some basic configuration
 
@@ -38,7 +43,74 @@ class SessionController:
     def __init__(self):
         # AUTH_CACHE_EXPIRE_MINUTES =  get_config("AUTH_CACHE_EXPIRE_MINUTES")
         # CACHE_MAX_SIZE = get_config("CACHE_MAX_SIZE")
-        self.token_cache = cachetools.TTLCache(maxsize=int(get_config("CACHE_MAX_SIZE")), ttl=int(get_config("AUTH_TOKEN_EXPIRE_MINUTES")) * 60)  
+        _ttl = int(get_config("AUTH_TOKEN_EXPIRE_MINUTES")) * 60
+        self._lock = threading.Lock()
+        self.store_type = get_config("SESSION_STORE", "memory").lower()
+        self.token_format = get_config("AUTH_TOKEN_FORMAT", "opaque").lower()
+        _base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+        _connections = None
+        if self.store_type == "sqlite" or self.token_format == "signed":
+            _connections = SQLiteConnections(os.path.join(_base_dir, 'db', f'{get_config("SESSION_DB_NAME", "sessions")}.db'))
+
+        if self.store_type == "sqlite":
+            # shared by all uvicorn workers, with a short-lived per-process copy in front of it
+            self.store = SQLiteSessionStore(_connections, _ttl, float(get_config("SESSION_SWEEP_INTERVAL", 60)))
+            self.token_cache = cachetools.TTLCache(maxsize=int(get_config("SESSION_LOCAL_CACHE_SIZE", 1000)), ttl=float(get_config("SESSION_LOCAL_CACHE_TTL", 5)))
+        else:
+            self.store = MemorySessionStore(int(get_config("CACHE_MAX_SIZE")), _ttl)
+            self.token_cache = None
+            if int(get_config("NO_OF_WORKERS", 1)) > 1 and self.token_format != "signed":
+                logging.warning(f"[{self.__class__.__name__}: __init__: {datetime.now()}]: [WARNING] - Memory session store with {get_config('NO_OF_WORKERS')} workers: a token is only known to the worker that issued it, set session_store = sqlite")
+
+        # signed tokens are validated without any lookup; opaque tokens issued before keep working
+        self.signer = None
+        self.revocations = None
+        if self.token_format == "signed":
+            _secret = get_config("AUTH_TOKEN_SECRET")
+            if not _secret:
+                # a per-process secret would make every worker reject the others' tokens
+                logging.error(f"[{self.__class__.__name__}: __init__: {datetime.now()}]: [ERROR] - AUTH_TOKEN_SECRET must be set when AUTH_TOKEN_FORMAT is signed")
+                raise ValueError("AUTH_TOKEN_SECRET must be set when AUTH_TOKEN_FORMAT is signed")
+            self.signer = TokenSigner(_secret.encode("utf-8"), _ttl)
+            self.revocations = RevocationList(
+                _connections,
+                int(get_config("REVOCATION_FILTER_BITS", 1 << 20)),
+                int(get_config("REVOCATION_FILTER_HASHES", 7)),
+                float(get_config("REVOCATION_REFRESH_INTERVAL", 1)),
+                float(get_config("REVOCATION_REBUILD_INTERVAL", 600)))
+
+    """Returns True when the token is a signed (self-contained) token."""
+    def is_signed_token(self, token: str):
+        return self.signer is not None and self.signer.is_signed(token)
+
+    """Returns True when a signed token, or the session it was renewed in (sid), has been revoked."""
+    def _is_revoked(self, claims: dict):
+        return self.revocations.is_revoked(claims["jti"]) or ("sid" in claims and self.revocations.is_revoked(claims["sid"]))
+
+    """Returns the user info carried by a signed token, None when it is invalid, expired or revoked."""
+    def _get_signed_session(self, token: str):
+        _claims = self.signer.verify(token)
+        if _claims is None or self._is_revoked(_claims):
+            return None
+        return UserInfoModel(uid=_claims["uid"], userName=_claims["name"], email=_claims["email"], userType=_claims["utid"], cid=_claims["cid"])
+
+    """Returns the user info of a token from the local cache or the session store, None when unknown or expired."""
+    def _get_session(self, token: str):
+        if self.is_signed_token(token):
+            return self._get_signed_session(token)
+        if self.token_cache is not None:
+            with self._lock:
+                _user_info = self.token_cache.get(token)
+            if _user_info is not None:
+                return _user_info
+        _data = self.store.get(token)
+        if _data is None:
+            return None
+        _user_info = _data if isinstance(_data, UserInfoModel) else UserInfoModel(**_data)
+        if self.token_cache is not None:
+            with self._lock:
+                self.token_cache[token] = _user_info
+        return _user_info
 
     """Verifies the type of authentication token."""
     def verify_auth_token_type(self, token):
@@ -55,7 +127,7 @@ class SessionController:
     """Verifies the authentication token."""
     def verify_auth_token(self, token):
         try:
-            _user_info = self.token_cache.get(token)
+            _user_info = self._get_session(token)
             if _user_info:
                 logging.info(f"[{self.__class__.__name__}: {self.verify_auth_token.__name__}: {datetime.now()}]: [INFO] - Authentication token verified successfully")
                 return True, None
@@ -69,8 +141,7 @@ class SessionController:
     """Verifies the authentication token and retrieves the user data."""
     def get_current_user_data(self, token: str) -> Optional[str]:
         try:
-            # print(self.token_cache)
-            _user_info = self.token_cache.get(token)
+            _user_info = self._get_session(token)
             if _user_info is None:
                 logging.warning(f"[{self.__class__.__name__}: {self.get_current_user_data.__name__}: {datetime.now()}]: [WARNING] - Token not found in cache")
                 return None, None
@@ -89,8 +160,21 @@ class SessionController:
     def remove_auth_token(self, token: str):
         try:
             logging.info(f"[{self.__class__.__name__}: {self.remove_auth_token.__name__}: {datetime.now()}]: [INFO] - Revoking authentication token for user")
-            if token in self.token_cache:
-                del self.token_cache[token]
+            if self.is_signed_token(token):
+                _claims = self.signer.verify(token)
+                if _claims is None or self._is_revoked(_claims):
+                    logging.warning(f"[{self.__class__.__name__}: {self.remove_auth_token.__name__}: {datetime.now()}]: [WARNING] - Authentication token not valid")
+                    return False, None
+                self.revocations.revoke(_claims["jti"], _claims["exp"])
+                if "sid" in _claims:
+                    # ends every token renewed in the session, none of them outlives a token issued now
+                    self.revocations.revoke(_claims["sid"], time.time() + self.signer.ttl)
+                logging.info(f"[{self.__class__.__name__}: {self.remove_auth_token.__name__}: {datetime.now()}]: [INFO] - Authentication token revoked successfully")
+                return True, None
+            if self.token_cache is not None:
+                with self._lock:
+                    self.token_cache.pop(token, None)
+            if self.store.delete(token):
                 logging.info(f"[{self.__class__.__name__}: {self.remove_auth_token.__name__}: {datetime.now()}]: [INFO] - Authentication token revoked successfully")
                 return True, None
             else:
@@ -103,9 +187,15 @@ class SessionController:
     """Generates an authentication token for a user."""
     def create_auth_token(self, user_data):
         try:
+            if self.signer is not None:
+                _auth_token = self.signer.issue({"uid": user_data["uid"], "name": user_data["name"], "email": user_data["email"], "utid": user_data["utid"], "cid": user_data["cid"],
+                                                 "sid": secrets.token_urlsafe(12)})
+                logging.info(f"[{self.__class__.__name__}: {self.create_auth_token.__name__}: {datetime.now()}]: [INFO] - Signed authentication token generated successfully")
+                return _auth_token, None
+
             _auth_token = secrets.token_urlsafe(32)
             _user_info = UserInfoModel(uid=user_data["uid"], userName=user_data["name"], email=user_data["email"], userType=user_data["utid"], cid=user_data["cid"])
-            self.token_cache[_auth_token] = _user_info
+            self.store.set(_auth_token, _user_info if self.token_cache is None else _user_info.dict())
             logging.info(f"[{self.__class__.__name__}: {self.create_auth_token.__name__}: {datetime.now()}]: [INFO] - Authentication token generated successfully")
             return _auth_token, None
         except Exception as _e:
@@ -116,10 +206,14 @@ class SessionController:
     """Extends the expiry of an authentication token."""
     def extend_auth_token_expiry(self, auth_token):
         try:
-            # Get the user info associated with the token
-            _user_info = self.token_cache.pop(auth_token)
-            # Re-insert the user info with the same token, effectively resetting the TTL
-            self.token_cache[auth_token] = _user_info
+            if self.is_signed_token(auth_token):
+                # the expiry is part of a signed token, refresh_auth_token() issues a new one
+                if self._get_signed_session(auth_token) is None:
+                    raise KeyError(auth_token)
+                return True
+            # resets the TTL of the session
+            if not self.store.touch(auth_token):
+                raise KeyError(auth_token)
             logging.info(f"[{self.__class__.__name__}: {self.extend_auth_token_expiry.__name__}: {datetime.now()}]: [INFO] - Authentication token expiry extended successfully")
             return True
         except KeyError:
@@ -130,6 +224,28 @@ class SessionController:
             return False
 
 
+    """Issues a new signed token for the user of a valid signed token.
+
+    The old token is not revoked: a client that keeps using it (the UI checks auth/validate every
+    minute with the token it holds) stays logged in until it expires, and a check writes nothing.
+    The new token keeps the session id (sid) of the old one, so logging out with any of them
+    revokes them all.
+    """
+    def refresh_auth_token(self, auth_token):
+        try:
+            _claims = self.signer.verify(auth_token) if self.is_signed_token(auth_token) else None
+            if _claims is None or self._is_revoked(_claims):
+                logging.warning(f"[{self.__class__.__name__}: {self.refresh_auth_token.__name__}: {datetime.now()}]: [WARNING] - Authentication token not valid")
+                return None, None
+            # tokens issued before sessions had an id start one here
+            _auth_token = self.signer.issue({**{_name: _claims[_name] for _name in ("uid", "name", "email", "utid", "cid")}, "sid": _claims.get("sid") or secrets.token_urlsafe(12)})
+            logging.info(f"[{self.__class__.__name__}: {self.refresh_auth_token.__name__}: {datetime.now()}]: [INFO] - Signed authentication token refreshed successfully")
+            return _auth_token, None
+        except Exception as _e:
+            logging.error(f"[{self.__class__.__name__}: {self.refresh_auth_token.__name__}: {datetime.now()}]: [ERROR] - An error occurred while refreshing authentication token: {str(_e)}")
+            return None, _e
+
+
 # @singleton
 # class AppCache:
 #     def __init__(self):
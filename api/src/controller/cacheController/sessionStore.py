@@ -0,0 +1,267 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Summary REST API and UI
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import cachetools
+from src.utilities.bloom_filter import BloomFilter
+
+
+"""Sessions of the running process only, the original token cache.
+
+    Enough for a single worker; with several uvicorn workers a token is only known to the worker
+    that issued it.
+"""
+class MemorySessionStore:
+    def __init__(self, max_size: int, ttl: float):
+        self.ttl = ttl
+        self._cache = cachetools.TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+
+
+    def get(self, token: str):
+        with self._lock:
+            return self._cache.get(token)
+
+
+    def set(self, token: str, data: dict):
+        with self._lock:
+            self._cache[token] = data
+
+
+    def delete(self, token: str):
+        with self._lock:
+            return self._cache.pop(token, None) is not None
+
+
+    def touch(self, token: str):
+        with self._lock:
+            _data = self._cache.pop(token, None)
+            if _data is None:
+                return False
+            # re-inserting resets the TTL
+            self._cache[token] = _data
+            return True
+
+
+    def count(self):
+        with self._lock:
+            return len(self._cache)
+
+
+    def close(self):
+        pass
+
+
+"""Per-thread connections to one SQLite database in WAL mode."""
+class SQLiteConnections:
+    def __init__(self, db_path: str, busy_timeout: int = 5000):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+        if not os.path.exists(os.path.dirname(db_path)):
+            os.makedirs(os.path.dirname(db_path))
+        self.get().execute("PRAGMA journal_mode = WAL")
+
+
+    def get(self):
+        _conn = getattr(self._local, "conn", None)
+        if _conn is None:
+            _conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.busy_timeout / 1000)
+            _conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+            # sessions are cheap to lose on a power cut, not worth a sync per login
+            _conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = _conn
+            with self._lock:
+                self._connections.append(_conn)
+        return _conn
+
+
+    def close(self):
+        with self._lock:
+            for _conn in self._connections:
+                try:
+                    _conn.close()
+                except sqlite3.Error:
+                    pass
+            self._connections.clear()
+        self._local = threading.local()
+
+
+"""Sessions shared by every worker through a SQLite database in WAL mode.
+
+    Lookups are primary-key reads on the hash of the token (the token itself is never written to
+    disk). Expired rows are ignored on read and deleted lazily: the row that was read, plus one
+    sweep of everything expired at most every sweep_interval seconds, run by whichever worker
+    writes next. Each thread keeps its own connection.
+"""
+class SQLiteSessionStore:
+    def __init__(self, connections: SQLiteConnections, ttl: float, sweep_interval: float = 60):
+        self.connections = connections
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._last_sweep = 0.0
+
+        _conn = self.connections.get()
+        _conn.execute("CREATE TABLE IF NOT EXISTS session (token TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL) WITHOUT ROWID")
+        _conn.execute("CREATE INDEX IF NOT EXISTS session_expires ON session (expires)")
+        _conn.commit()
+        logging.info(f"[{self.__class__.__name__}: __init__: {datetime.now()}]: [INFO] - Session store ready at {self.connections.db_path}")
+
+
+    def _key(self, token: str):
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+    def _sweep(self, conn, now: float):
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        _deleted = conn.execute("DELETE FROM session WHERE expires < ?", (now,)).rowcount
+        if _deleted:
+            logging.info(f"[{self.__class__.__name__}: {self._sweep.__name__}: {datetime.now()}]: [INFO] - {_deleted} expired session(s) removed")
+
+
+    def get(self, token: str):
+        _conn = self.connections.get()
+        _now = time.time()
+        _row = _conn.execute("SELECT data, expires FROM session WHERE token = ?", (self._key(token),)).fetchone()
+        if _row is None:
+            return None
+        if _row[1] < _now:
+            with _conn:
+                _conn.execute("DELETE FROM session WHERE token = ? AND expires < ?", (self._key(token), _now))
+            return None
+        return json.loads(_row[0])
+
+
+    def set(self, token: str, data: dict):
+        _conn = self.connections.get()
+        _now = time.time()
+        with _conn:
+            _conn.execute("INSERT OR REPLACE INTO session (token, data, expires) VALUES (?, ?, ?)", (self._key(token), json.dumps(data), _now + self.ttl))
+            self._sweep(_conn, _now)
+
+
+    def delete(self, token: str):
+        _conn = self.connections.get()
+        with _conn:
+            return _conn.execute("DELETE FROM session WHERE token = ?", (self._key(token),)).rowcount > 0
+
+
+    def touch(self, token: str):
+        _conn = self.connections.get()
+        _now = time.time()
+        with _conn:
+            return _conn.execute("UPDATE session SET expires = ? WHERE token = ? AND expires >= ?", (_now + self.ttl, self._key(token), _now)).rowcount > 0
+
+
+    def count(self):
+        return self.connections.get().execute("SELECT COUNT(*) FROM session WHERE expires >= ?", (time.time(),)).fetchone()[0]
+
+
+    def close(self):
+        self.connections.close()
+
+
+"""Revoked signed tokens, shared by every worker through the session database.
+
+    The revoked token ids (jti) live in the revoked table until the token expires. Each worker keeps
+    only a Bloom filter of them, topped up from the table every refresh_interval seconds: a token
+    not in the filter (nearly every request) is accepted without touching the database, a hit is
+    confirmed by a primary-key read of the table. Expired entries are pruned and the filter rebuilt
+    every rebuild_interval seconds.
+"""
+class RevocationList:
+    def __init__(self, connections: SQLiteConnections, bloom_bits: int, bloom_hashes: int, refresh_interval: float = 1, rebuild_interval: float = 600):
+        self.connections = connections
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._last_rowid = 0
+        self._last_refresh = 0.0
+        self._last_rebuild = 0.0
+        self._metrics = {"checks": 0, "filter_hits": 0, "revoked_hits": 0}
+
+        _conn = self.connections.get()
+        _conn.execute("CREATE TABLE IF NOT EXISTS revoked (jti TEXT PRIMARY KEY, expires REAL NOT NULL)")
+        _conn.commit()
+        self._rebuild(time.time())
+
+
+    def _rebuild(self, now: float):
+        _conn = self.connections.get()
+        with _conn:
+            _conn.execute("DELETE FROM revoked WHERE expires < ?", (now,))
+        _rows = _conn.execute("SELECT rowid, jti FROM revoked").fetchall()
+        _bloom = BloomFilter(self.bloom_bits, self.bloom_hashes)
+        for _row in _rows:
+            _bloom.add(_row[1])
+        with self._lock:
+            self._bloom = _bloom
+            self._last_rowid = max([_row[0] for _row in _rows], default=0)
+            self._last_refresh = self._last_rebuild = now
+
+
+    def _refresh(self, now: float):
+        if now - self._last_rebuild >= self.rebuild_interval:
+            self._rebuild(now)
+            return
+        if now - self._last_refresh < self.refresh_interval:
+            return
+        _rows = self.connections.get().execute("SELECT rowid, jti FROM revoked WHERE rowid > ?", (self._last_rowid,)).fetchall()
+        with self._lock:
+            for _row in _rows:
+                self._bloom.add(_row[1])
+                self._last_rowid = max(self._last_rowid, _row[0])
+            self._last_refresh = now
+
+
+    def revoke(self, jti: str, expires: float):
+        _conn = self.connections.get()
+        with _conn:
+            _conn.execute("INSERT OR IGNORE INTO revoked (jti, expires) VALUES (?, ?)", (jti, expires))
+        with self._lock:
+            self._bloom.add(jti)
+
+
+    def is_revoked(self, jti: str):
+        _now = time.time()
+        self._refresh(_now)
+        with self._lock:
+            self._metrics["checks"] += 1
+            if not self._bloom.might_contain(jti):
+                return False
+            self._metrics["filter_hits"] += 1
+        _revoked = self.connections.get().execute("SELECT 1 FROM revoked WHERE jti = ?", (jti,)).fetchone() is not None
+        if _revoked:
+            with self._lock:
+                self._metrics["revoked_hits"] += 1
+        return _revoked
+
+
+    def get_metrics(self):
+        with self._lock:
+            return {**self._metrics, "filter_additions": self._bloom.count, "filter_bits": self._bloom.size_bits}
@@ -0,0 +1,72 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import secrets
+import threading
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+"""Names of the versioned collections."""
+class Collection:
+    APPLICATION = "application"
+    APP_UNIT = "appunit"
+    COMPANY = "company"
+    USER = "user"
+
+
+"""Per-collection version counters backing the ETags of the list endpoints.
+
+    Every successful mutation of a collection bumps its counter, which changes the ETag of the
+    collection's list responses. The epoch keeps tags from an earlier process from matching
+    after a restart, when the counters start again from zero.
+"""
+@singleton
+class VersionController:
+    def __init__(self):
+        self._epoch = secrets.token_hex(4)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+
+    def get_version(self, collection):
+        """Return the current version of a collection."""
+        return self._versions.get(collection, 0)
+
+
+    def bump(self, *collections):
+        """Advance the version of the given collections and return the last new version."""
+        _version = 0
+        with self._lock:
+            for _collection in collections:
+                _version = self._versions.get(_collection, 0) + 1
+                self._versions[_collection] = _version
+        return _version
+
+
+    def get_etag(self, collection, *scope, version=None):
+        """Return the strong ETag of a collection view. The scope (cid, user type, ...) tells apart views of the same version.
+        Pass the version the payload was built from when it may have moved on since."""
+        if version is None:
+            version = self.get_version(collection)
+        _parts = [self._epoch, collection, str(version)] + [str(_part) for _part in scope]
+        return '"' + "-".join(_parts) + '"'
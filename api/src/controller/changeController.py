@@ -0,0 +1,120 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime
+import logging
+from src.controller.base.controllerBase import ControllerBase
+from src.controller.base.types import UserType
+from src.model.change_manager import ChangeManager
+from src.controller.cacheController.sessionController import SessionController
+from src.utilities.settings import get_config
+
+
+"""Incremental sync of the app, appUnit, user and company tables.
+
+    GET /<collection>/changes?since=<version> returns, for every row changed after the version the
+    client holds, either its current state (upsert) or a tombstone (delete), together with the new
+    version to send next time. Rows the caller can no longer see (moved to another company, disabled
+    for a plain user) are sent as tombstones. When the requested version is older than the journal
+    retention the response carries reset=true and the client reloads the full list, then continues
+    from the returned version.
+"""
+class ChangeController():
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.change_mgr = ChangeManager(base_dir)
+        self.session_mgr = SessionController()
+        self.controller_base = ControllerBase()
+        self.page_size = int(get_config("CHANGE_LOG_PAGE_SIZE", 1000))
+
+
+    """Return True when the user may read the row, mirroring the filters of the list endpoints."""
+    def _is_visible(self, table, row, user_info):
+        if user_info.userType == UserType.SUPER_ADMIN.value:
+            return True
+        if table == self.change_mgr.company:
+            return row['cid'] == user_info.cid
+        if row['cid'] != user_info.cid:
+            return False
+        if user_info.userType == UserType.USER.value and table in (self.change_mgr.app, self.change_mgr.user):
+            return row['enable'] == 1
+        return True
+
+    """
+    Retrieves the changes of a table since a version.
+
+    Args:
+        table (str): The journal table name (app, appUnit, user or company).
+        since (int): The version the client is synced to, 0 for everything.
+        limit (int): The maximum number of changes to return, capped at the page size.
+        token (str): The authentication header containing the token.
+
+    Returns:
+        JSONResponse: A JSON response containing {version, reset, more, changes} or an error message.
+    """
+    async def getChanges(self, table: str, since: int, limit: int, token: str):
+        try:
+            if since is None or since < 0 or (limit is not None and limit < 1):
+                logging.warning(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Invalid since or limit")
+                return self.controller_base.generate_response(None, 400)
+
+            _user_info, _err = self.session_mgr.get_current_user_data(token)
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [ERROR] - Error retrieving user type: {_err}")
+                return self.controller_base.generate_response(None, 500)
+            elif _user_info is None :
+                logging.warning(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
+                return self.controller_base.generate_response(None, 401)
+
+            # the upper bound is fixed first, so a change committed while we read is left for the next call
+            _range, _err = await self.change_mgr.getVersionRangeAsync()
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [ERROR] - Error retrieving change journal version: {str(_err)}")
+                return self.controller_base.generate_response(None, 500)
+            _oldest, _latest = _range
+
+            if since > _latest or (_oldest and since < _oldest - 1):
+                logging.info(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [INFO] - Version {since} of {table} is no longer in the journal, client has to reload")
+                return self.controller_base.generate_response({"version": _latest, "reset": True, "more": False, "changes": []}, 200)
+
+            _limit = min(limit or self.page_size, self.page_size)
+            _cid = None if _user_info.userType == UserType.SUPER_ADMIN.value else _user_info.cid
+            _changed, _err = await self.change_mgr.getChangesAsync(table, since, _latest, _limit, _cid)
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [ERROR] - Error retrieving changes: {str(_err)}")
+                return self.controller_base.generate_response(None, 500)
+            _changed = _changed or []
+
+            _rows, _err = await self.change_mgr.getRowsAsync(table, [_change['rid'] for _change in _changed])
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [ERROR] - Error retrieving changed rows: {str(_err)}")
+                return self.controller_base.generate_response(None, 500)
+
+            _changes = []
+            for _change in _changed:
+                _row = _rows.get(_change['rid'])
+                if _row is not None and self._is_visible(table, _row, _user_info):
+                    _changes.append({"version": _change['version'], "op": "upsert", "id": _change['rid'], "row": {k: v for k, v in _row.items() if k != 'key'}})
+                else:
+                    _changes.append({"version": _change['version'], "op": "delete", "id": _change['rid']})
+
+            # a full page means there may be more, the client continues from the last version it got
+            _more = len(_changed) == _limit
+            _version = _changed[-1]['version'] if _more else _latest
+
+            logging.info(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [INFO] - {len(_changes)} change(s) of {table} since version {since} retrieved successfully")
+            return self.controller_base.generate_response({"version": _version, "reset": False, "more": _more, "changes": _changes}, 200)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.getChanges.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
@@ -19,6 +19,7 @@ from src.controller.base.controllerBase import ControllerBase
 from src.controller.base.types import ResponseModel, UserType
 from src.model.company_manager import CompanyManager
 from src.controller.cacheController.sessionController import SessionController
+from src.controller.cacheController.versionController import Collection, VersionController
 
 
 class CompanyController():
@@ -27,17 +28,19 @@ class CompanyController():
         self.company_manager = CompanyManager(base_dir)
         self.session_mgr = SessionController()
         self.controller_base = ControllerBase()
+        self.versions = VersionController()
     
     """
     Retrieves all companies.
 
     Args:
         token (str): The authentication header containing the token.
+        if_none_match (str): The If-None-Match header of the request, if any.
 
     Returns:
-        JSONResponse: A JSON response containing the list of companies or an error message.
+        JSONResponse: A JSON response containing the list of companies, 304 when the client copy is current, or an error message.
     """
-    def getCompanies(self, token: str):
+    def getCompanies(self, token: str, if_none_match: str = None):
         try:
             _user_info, _err = self.session_mgr.get_current_user_data(token)
             if _err:
@@ -47,6 +50,11 @@ class CompanyController():
                 logging.warning(f"[{self.__class__.__name__}: {self.getCompanies.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
                 return self.controller_base.generate_response(None, 401)
             
+            # taken before the query, so a concurrent change can only make the tag older than the data
+            _etag = self.versions.get_etag(Collection.COMPANY, _user_info.userType, _user_info.cid)
+            if self.controller_base.is_not_modified(if_none_match, _etag):
+                return self.controller_base.generate_not_modified(_etag)
+
             # _company_data, _err = self.company_manager.getAllCompanies(_user_type)
             _company_data, _err = self.company_manager.getAllCompanies(_user_info.userType, _user_info.cid)
             if _err:
@@ -54,10 +62,10 @@ class CompanyController():
                 return self.controller_base.generate_response(None, 500)
             elif not _company_data:
                 logging.warning(f"[{self.__class__.__name__}: {self.getCompanies.__name__}: {datetime.now()}]: [WARNING] - Companies not found")
-                return self.controller_base.generate_response(_company_data, 200)
+                return self.controller_base.generate_response(_company_data, 200, {"ETag": _etag})
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.getCompanies.__name__}: {datetime.now()}]: [INFO] - Companies data retrieved successfully")
-                return self.controller_base.generate_response(_company_data, 200)
+                return self.controller_base.generate_response(_company_data, 200, {"ETag": _etag})
             
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.getCompanies.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -138,6 +146,7 @@ class CompanyController():
                 return self.controller_base.generate_response(_company_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.addCompany.__name__}: {datetime.now()}]: [INFO] - Company added successfully")
+                self.versions.bump(Collection.COMPANY, Collection.USER)
                 return self.controller_base.generate_response(_company_data, 200)
             
         except Exception as e:
@@ -181,6 +190,7 @@ class CompanyController():
                 return self.controller_base.generate_response(_company_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.updateCompany.__name__}: {datetime.now()}]: [INFO] - Company updated successfully")
+                self.versions.bump(Collection.COMPANY, Collection.USER)
                 return self.controller_base.generate_response(_company_data, 200)
 
         except Exception as e:
@@ -197,7 +207,7 @@ class CompanyController():
     Returns:
         JSONResponse: A JSON response indicating success or failure of the operation.
     """
-    def deleteCompany(self, cid, token: str):
+    async def deleteCompany(self, cid, token: str):
         try:
             # if any(param is None for param in (cid,)):
             #     logging.warning(f"[{self.__class__.__name__}: {self.deleteCompany.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
@@ -211,7 +221,7 @@ class CompanyController():
                 logging.warning(f"[{self.__class__.__name__}: {self.deleteCompany.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
                 return self.controller_base.generate_response(None, 401)
             
-            _company_data, _err = self.company_manager.deleteCompany(cid, _user_info.userType, _user_info.userName)
+            _company_data, _err = await self.company_manager.deleteCompanyAsync(cid, _user_info.userType, _user_info.userName)
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.deleteCompany.__name__}: {datetime.now()}]: [ERROR] - Error deleting company: {str(_err)}")
                 return self.controller_base.generate_response(None, 500)
@@ -220,6 +230,7 @@ class CompanyController():
                 return self.controller_base.generate_response(_company_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.deleteCompany.__name__}: {datetime.now()}]: [INFO] - Company deleted successfully")
+                self.versions.bump(Collection.COMPANY, Collection.USER)
                 return self.controller_base.generate_response(_company_data, 200)
         
         except Exception as e:
@@ -0,0 +1,122 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime
+import json
+import logging
+from starlette.background import BackgroundTask
+from src.controller.base.controllerBase import ControllerBase
+from src.controller.cacheController.sessionController import SessionController
+from src.controller.cacheController.appCacheController import AppCacheController
+from src.controller.cacheController.appEvents import AppEvents
+from src.utilities.settings import get_config
+
+
+class EventController():
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.session_mgr = SessionController()
+        self.app_cache = AppCacheController()
+        self.app_events = AppEvents()
+        self.controller_base = ControllerBase()
+        self.coalesce_window = float(get_config("EVENTS_COALESCE_WINDOW", 1))
+        self.keepalive = float(get_config("EVENTS_KEEPALIVE", 15))
+
+
+    """
+        Format an event as an SSE message.
+
+        Parameters:
+            event_type (str): The SSE event name (snapshot or change).
+            seq (int): The sequence number, sent in the event id.
+            data: The JSON payload.
+
+        Returns:
+            bytes: The SSE message.
+    """
+    def formatEvent(self, event_type: str, seq: int, data):
+        return f"id: {self.app_events.event_id(seq)}\nevent: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+    """
+        Stream the state transitions of the apps the user can see as server-sent events.
+
+        The stream opens with a snapshot event holding the current state of every visible app, or,
+        when Last-Event-ID was sent by this process and is still covered by the backlog, with the
+        changes missed since. It then sends one change event per app and coalesce window, merging
+        the transitions in between.
+
+        Parameters:
+            last_event_id (str): The Last-Event-ID header of a reconnecting client, or None.
+            accept_encoding (str): The Accept-Encoding header of the request.
+            token (str): Authorization header containing access token.
+
+        Returns:
+            StreamingResponse: The event stream, or a JSON error response.
+    """
+    async def streamEvents(self, last_event_id: str, accept_encoding: str, token: str):
+        try:
+            user_info, _err = self.session_mgr.get_current_user_data(token)
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.streamEvents.__name__}: {datetime.now()}]: [ERROR] - Error retrieving user type: {_err}")
+                return self.controller_base.generate_response(None, 500)
+            if user_info is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.streamEvents.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
+                return self.controller_base.generate_response(None, 401)
+
+            _last_seq = None
+            if last_event_id:
+                try:
+                    # an id from another worker or an earlier process gets a snapshot
+                    _last_seq = self.app_events.parse_event_id(last_event_id)
+                except ValueError:
+                    logging.warning(f"[{self.__class__.__name__}: {self.streamEvents.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Invalid Last-Event-ID {last_event_id}")
+                    return self.controller_base.generate_response(None, 400)
+
+            _subscription, _snapshot, _snapshot_seq = self.app_events.subscribe(_last_seq)
+
+            async def _visible(event):
+                # checked on every event, so a disabled or moved app disappears from the stream at once
+                return await self.app_cache.getAppByIdAsync(event["aid"], user_info.cid, user_info.userType) is not None
+
+            async def _events():
+                try:
+                    _sent = 0
+                    if _snapshot is not None:
+                        # the events published since subscribe() are already queued after it
+                        _sent = _snapshot_seq
+                        yield self.formatEvent("snapshot", _sent, [_event for _event in _snapshot if await _visible(_event)])
+                    while True:
+                        _batch = await _subscription.get(self.keepalive, self.coalesce_window)
+                        if not _batch:
+                            yield b": keepalive\n\n"
+                            continue
+                        for _event in _batch:
+                            # already part of the snapshot
+                            if _event["seq"] <= _sent or not await _visible(_event):
+                                continue
+                            yield self.formatEvent("change", _event["seq"], _event)
+                finally:
+                    self.app_events.unsubscribe(_subscription)
+
+            # runs even when the client left before the first event
+            async def _close():
+                self.app_events.unsubscribe(_subscription)
+
+            _headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            logging.info(f"[{self.__class__.__name__}: {self.streamEvents.__name__}: {datetime.now()}]: [INFO] - Streaming app events to {user_info.userName} (resume from {last_event_id})")
+            return self.controller_base.generate_stream_response(_events(), "text/event-stream", accept_encoding, _headers, BackgroundTask(_close))
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.streamEvents.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
+            return self.controller_base.generate_response(None, 500)
@@ -110,6 +110,17 @@ class LoginController():
         if not token:
             return self.controller_base.generate_response(None, 401)
         try:
+            if self.session_mgr.is_signed_token(token):
+                # a signed token carries its expiry: the client gets a fresh one in X-Auth-Token
+                _auth_token, _err = self.session_mgr.refresh_auth_token(token)
+                if _err:
+                    return self.controller_base.generate_response(None, 500)
+                if _auth_token is None:
+                    logging.info(f"[{self.__class__.__name__}: {self.validate_user.__name__}: {datetime.now()}]: [INFO] - User token validation and extension failed")
+                    return Response(status_code=401)
+                logging.info(f"[{self.__class__.__name__}: {self.validate_user.__name__}: {datetime.now()}]: [INFO] - User token validated and renewed successfully")
+                return Response(status_code=200, headers={"X-Auth-Token": _auth_token})
+
             _result = self.session_mgr.extend_auth_token_expiry(token)
             if _result:
                 logging.info(f"[{self.__class__.__name__}: {self.validate_user.__name__}: {datetime.now()}]: [INFO] - User token validated and extended successfully")
@@ -18,6 +18,7 @@ from fastapi.responses import JSONResponse
 from src.controller.base.controllerBase import ControllerBase
 from src.controller.base.types import ResponseModel
 from src.controller.cacheController.sessionController import SessionController
+from src.controller.cacheController.versionController import Collection, VersionController
 from src.model.user_manager import UserManager
 
 
@@ -27,17 +28,19 @@ class UserController(Routable):
         self.user_mgr = UserManager(base_dir)
         self.session_mgr = SessionController()
         self.controller_base = ControllerBase()
+        self.versions = VersionController()
     
     """
     Retrieves all users.
 
     Args:
         token (str): The authentication header containing the token.
+        if_none_match (str): The If-None-Match header of the request, if any.
 
     Returns:
-        JSONResponse: A JSON response containing the list of users or an error message.
+        JSONResponse: A JSON response containing the list of users, 304 when the client copy is current, or an error message.
     """
-    def getUsers(self, token: str):
+    def getUsers(self, token: str, if_none_match: str = None):
         try:
             _user_info, _err = self.session_mgr.get_current_user_data(token)
             if _err:
@@ -47,6 +50,11 @@ class UserController(Routable):
                 logging.warning(f"[{self.__class__.__name__}: {self.getUsers.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
                 return self.controller_base.generate_response(None, 401)
             
+            # taken before the query, so a concurrent change can only make the tag older than the data
+            _etag = self.versions.get_etag(Collection.USER, _user_info.userType, _user_info.uid)
+            if self.controller_base.is_not_modified(if_none_match, _etag):
+                return self.controller_base.generate_not_modified(_etag)
+
             _user_data, _err = self.user_mgr.getAllUsers(_user_info.userType, _user_info.uid)
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.getUsers.__name__}: {datetime.now()}]: [ERROR] - Error retrieving data: {str(_err)}")
@@ -56,7 +64,7 @@ class UserController(Routable):
                 return self.controller_base.generate_response(_user_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.getUsers.__name__}: {datetime.now()}]: [INFO] - Users retrieved successfully")
-                return self.controller_base.generate_response(_user_data, 200)
+                return self.controller_base.generate_response(_user_data, 200, {"ETag": _etag})
     
         except Exception as e:
             logging.error(f"[{self.__class__.__name__}: {self.getUsers.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
@@ -140,6 +148,7 @@ class UserController(Routable):
                 return self.controller_base.generate_response(_user_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.addUser.__name__}: {datetime.now()}]: [INFO] - User added successfully")
+                self.versions.bump(Collection.USER)
                 return self.controller_base.generate_response(_user_data, 200)
     
         except Exception as e:
@@ -185,6 +194,7 @@ class UserController(Routable):
                 return self.controller_base.generate_response(_user_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.updateUser.__name__}: {datetime.now()}]: [INFO] - User updated successfully")
+                self.versions.bump(Collection.USER)
                 return self.controller_base.generate_response(_user_data, 200)
     
         except Exception as e:
@@ -201,7 +211,7 @@ class UserController(Routable):
     Returns:
         JSONResponse: A JSON response indicating success or failure of the operation.
     """
-    def deleteUser(self, uid, token: str):
+    async def deleteUser(self, uid, token: str):
         try:
             # if any(param is None for param in (uid,)):
             #     logging.warning(f"[{self.__class__.__name__}: {self.deleteUser.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
@@ -215,7 +225,7 @@ class UserController(Routable):
                 logging.warning(f"[{self.__class__.__name__}: {self.deleteUser.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
                 return self.controller_base.generate_response(None, 401)
             
-            _user_data, _err = self.user_mgr.deleteUser(uid, _user_info.uid, _user_info.userType, _user_info.userName)
+            _user_data, _err = await self.user_mgr.deleteUserAsync(uid, _user_info.uid, _user_info.userType, _user_info.userName)
             if _err:
                 logging.error(f"[{self.__class__.__name__}: {self.deleteUser.__name__}: {datetime.now()}]: [ERROR] - Error deleting user: {str(_err)}")
                 return self.controller_base.generate_response(None, 500)
@@ -224,6 +234,7 @@ class UserController(Routable):
                 return self.controller_base.generate_response(_user_data, 404)
             else:
                 logging.info(f"[{self.__class__.__name__}: {self.deleteUser.__name__}: {datetime.now()}]: [INFO] - User deleted successfully")
+                self.versions.bump(Collection.USER)
                 return self.controller_base.generate_response(_user_data, 200)
         
         except Exception as e:
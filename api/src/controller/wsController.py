@@ -0,0 +1,82 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from datetime import datetime
+import logging
+import re
+from fastapi import WebSocket
+from src.controller.cacheController.sessionController import SessionController
+from src.controller.cacheController.appCacheController import AppCacheController
+from src.utilities.settings import get_config
+from src.ws.websocket_proxy import websocket_proxy
+
+
+class WsController():
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.session_mgr = SessionController()
+        self.app_cache = AppCacheController()
+        self.heartbeat_interval = float(get_config("WS_HEARTBEAT_INTERVAL", 15))
+        self.send_timeout = float(get_config("WS_SEND_TIMEOUT", 10))
+        self.endpoint_pattern = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+    """
+        Relay an app WebSocket stream to a dashboard socket.
+
+        The token comes from the query string (browsers cannot set headers on a WebSocket) and the
+        app address from the app cache, never from the client. Frames go through the hub, so all
+        viewers of the same stream share one upstream connection; a heartbeat frame is sent when the
+        app is quiet and a socket that does not take a frame within the send timeout is closed.
+
+        Parameters:
+            ws (WebSocket): The dashboard socket, not accepted yet.
+            aid (int): Application ID.
+            endpoint (str): The app stream name, relayed from ws://<ip>:<ws_port>/app/<endpoint>.
+            token (str): The access token.
+
+        Returns:
+            None: returns when either side closes. Refused sockets are closed with 1008 (unauthorized) or 4404 (unknown app).
+    """
+    async def proxyAppStream(self, ws: WebSocket, aid: int, endpoint: str, token: str):
+        try:
+            user_info, _err = self.session_mgr.get_current_user_data(token) if token else (None, None)
+            if _err:
+                logging.error(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [ERROR] - Error retrieving user type: {_err}")
+                await ws.close(code=1011)
+                return
+            if user_info is None:
+                logging.warning(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [WARNING] - Unauthorized: Invalid access token")
+                await ws.close(code=1008)
+                return
+
+            _app = await self.app_cache.getAppByIdAsync(aid, user_info.cid, user_info.userType)
+            _key = await self.app_cache.get_app_key_async(aid, user_info.cid) if _app is not None else None
+            if _key is None or not self.endpoint_pattern.match(endpoint):
+                logging.warning(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [WARNING] - Application {aid} or stream {endpoint} not found")
+                await ws.close(code=4404)
+                return
+
+            _client = f"{ws.client.host}:{ws.client.port}" if ws.client else None
+            logging.info(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [INFO] - Streaming {endpoint} of app {aid} to {_client}")
+            await websocket_proxy(
+                _app['ip'], _app['ws_port'], endpoint, ws,
+                key=(aid, endpoint),
+                headers={"apikey": _key},
+                info={"aid": aid, "endpoint": endpoint, "user": user_info.userName, "client": _client},
+                heartbeat_interval=self.heartbeat_interval,
+                send_timeout=self.send_timeout)
+            logging.info(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [INFO] - Stream {endpoint} of app {aid} to {_client} closed")
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.proxyAppStream.__name__}: {datetime.now()}]: [ERROR] - An unexpected error occurred: {str(e)}")
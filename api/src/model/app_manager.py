@@ -27,6 +27,16 @@ class AppManager:
         self.appUnitTable = get_config("APP_UNIT_TABLE")
 
 
+    def transaction(self):
+        """
+        Opens a unit of work so several app / app unit changes are committed together.
+
+        Returns:
+            Transaction: Context manager usable with `with` and `async with`.
+        """
+        return self.database_mgr.transaction()
+
+
     def getAllApps(self):
         """
         Retrieves all apps from the database.
@@ -48,6 +58,46 @@ class AppManager:
         else:
             return None, None
         
+    def getAppById(self, aid: int):
+        """
+        Retrieves a single app, with its company name, from the database.
+
+        Args:
+            aid (int): The ID of the app.
+
+        Returns:
+            Tuple: A tuple containing a list with the app (empty when it does not exist) and any potential error.
+        """
+
+        _sqlQuery = f'''
+            SELECT a.*, c.name AS cname
+            FROM {self.app} a
+            LEFT JOIN {self.company} c ON a.cid = c.cid
+            WHERE a.aid = ?
+        '''
+
+        return self.database_mgr.executeQuery(_sqlQuery, (aid,))
+
+    def getAppsByCid(self, cid: int):
+        """
+        Retrieves the apps of a company, with the company name, from the database.
+
+        Args:
+            cid (int): The ID of the company.
+
+        Returns:
+            Tuple: A tuple containing a list of apps and any potential error.
+        """
+
+        _sqlQuery = f'''
+            SELECT a.*, c.name AS cname
+            FROM {self.app} a
+            LEFT JOIN {self.company} c ON a.cid = c.cid
+            WHERE a.cid = ?
+        '''
+
+        return self.database_mgr.executeQuery(_sqlQuery, (cid,))
+        
     def addApp(self, name: str, ip: str, rest_port: int, ws_port: int, prof_port:int, zid: str, key: str, desc: str, enable: int, cid: int,  user_type: str, user_cid: int, user_name):
         """
         Adds an app to the database.
@@ -70,17 +120,15 @@ class AppManager:
             Tuple: A tuple containing the _result of the operation and any potential error.
         """
         if user_type == UserType.SUPER_ADMIN.value:
-            _sqlQuery = f"INSERT INTO {self.app} (name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-            _params = (name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid)
-            _result, _err = self.database_mgr.executeQuery(_sqlQuery, _params)
+            _values = {"name": name, "ip": ip, "rest_port": rest_port, "ws_port": ws_port, "prof_port": prof_port, "zid": zid, "key": key, "desc": desc, "enable": enable, "cid": cid}
+            _result, _err = self.database_mgr.executeInsert(self.app, _values)
             print_log(AuditEntry(self.base_dir, user_name, user_type, name, "Add Application", _result, _err ))
             return _result, _err
         elif user_type == UserType.ADMIN.value:
             if user_cid != cid:
                 return None, "App belongs to another company"
-            _sqlQuery = f"INSERT INTO {self.app} (name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
-            _params = (name, ip, rest_port, ws_port, prof_port, zid, key, desc, enable, cid)
-            _result, _err = self.database_mgr.executeQuery(_sqlQuery, _params)
+            _values = {"name": name, "ip": ip, "rest_port": rest_port, "ws_port": ws_port, "prof_port": prof_port, "zid": zid, "key": key, "desc": desc, "enable": enable, "cid": cid}
+            _result, _err = self.database_mgr.executeInsert(self.app, _values)
             print_log(AuditEntry(self.base_dir, user_name, user_type, name, "Add Application", _result, _err ))
             return _result, _err
         
@@ -166,7 +214,36 @@ class AppManager:
         _result, _err = self.database_mgr.executeQuery(_sqlQuery)
         return _result, _err
 
-        
+
+    # Async variants, executed on the database executor so the event loop is never blocked
+
+    async def getAllAppsAsync(self):
+        return await self.database_mgr.run_async(self.getAllApps)
+
+    async def getAppByIdAsync(self, aid: int):
+        return await self.database_mgr.run_async(self.getAppById, aid)
+
+    async def getAppsByCidAsync(self, cid: int):
+        return await self.database_mgr.run_async(self.getAppsByCid, cid)
+
+    async def addAppAsync(self, *args):
+        return await self.database_mgr.run_async(self.addApp, *args)
+
+    async def updateAppAsync(self, *args):
+        return await self.database_mgr.run_async(self.updateApp, *args)
+
+    async def deleteAppAsync(self, *args):
+        return await self.database_mgr.run_async(self.deleteApp, *args)
+
+    async def getAppPortsAsync(self):
+        return await self.database_mgr.run_async(self.getAppPorts)
+
+    async def getAllAppUnitsAsync(self, user_type: str, cid: int, zid: int):
+        _sqlQuery = "SELECT * FROM {} WHERE cid = ? AND zid = ?".format(self.appUnitTable)
+        return await self.database_mgr.fetch(_sqlQuery, (cid, zid))
+
+    async def getAppUnitAsync(self, user_type: str, cid: int, id: int):
+        return await self.database_mgr.run_async(self.getAppUnit, user_type, cid, id)
         
 
     # App Units
@@ -229,9 +306,8 @@ class AppManager:
         """
 
         if user_type == UserType.SUPER_ADMIN.value or user_type == UserType.ADMIN.value:
-            _sqlQuery = f"INSERT INTO {self.appUnitTable} (zid, uname, pool_size, ifname, path, name, enable, cid) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
-            _params = (zid, uname, pool_size, ifname, path, name, enable, cid)
-            _result, _err = self.database_mgr.executeQuery(_sqlQuery, _params)
+            _values = {"zid": zid, "uname": uname, "pool_size": pool_size, "ifname": ifname, "path": path, "name": name, "enable": enable, "cid": cid}
+            _result, _err = await self.database_mgr.insert(self.appUnitTable, _values)
             print_log(AuditEntry(self.base_dir, user_name, user_type, name, "Add App Unit", bool(_result), _err ))
             return _result, _err
 
@@ -256,7 +332,7 @@ class AppManager:
                 _sqlQuery = f""" UPDATE {self.appUnitTable} SET uname = ?,  pool_size = ?, enable = ? WHERE id= ? AND cid = ? """
                 _params = (uname, pool_size, enable, id, cid)
 
-            _result, _err =  self.database_mgr.executeNonQuery(_sqlQuery, _params)
+            _result, _err = await self.database_mgr.execute(_sqlQuery, _params)
             print_log(AuditEntry(self.base_dir, user_name, user_type, id, "Modify App Unit", _result, _err ))
             return _result, _err
 
@@ -274,7 +350,7 @@ class AppManager:
         """
         if user_type == UserType.SUPER_ADMIN.value or user_type == UserType.ADMIN.value:
             _sqlQuery = "DELETE FROM {} WHERE cid = ? AND id = ?".format(self.appUnitTable)
-            _result, _err =  self.database_mgr.executeNonQuery(_sqlQuery, (cid, id))
+            _result, _err = await self.database_mgr.execute(_sqlQuery, (cid, id))
             print_log(AuditEntry(self.base_dir, user_name, user_type, id, "Delete App Unit", _result, _err ))
             return _result, _err
 
@@ -294,7 +370,7 @@ class AppManager:
         """
         if user_type == UserType.SUPER_ADMIN.value or  user_type == UserType.ADMIN.value:
             _sqlQuery = "DELETE FROM {} WHERE cid = ? AND zid = ?".format(self.appUnitTable)
-            _result, _err = self.database_mgr.executeNonQuery(_sqlQuery, (cid, zid))
+            _result, _err = await self.database_mgr.execute(_sqlQuery, (cid, zid))
             print_log(AuditEntry(self.base_dir, user_name, user_type, cid, "Delete App Unit", _result, _err))
             return _result, _err
         else:
@@ -0,0 +1,143 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from src.model.db_manager import DBManager
+from src.utilities.settings import get_config
+
+
+class ChangeManager:
+    def __init__(self, base_dir):
+        self.database_mgr = DBManager(base_dir)
+        self.base_dir = base_dir
+        self.changeLog = get_config("CHANGE_LOG_TABLE", "changeLog")
+        self.app = get_config("APP_TABLE")
+        self.appUnitTable = get_config("APP_UNIT_TABLE")
+        self.user = get_config("USER_TABLE")
+        self.company = get_config("COMPANY_TABLE")
+
+        # journal table -> (primary key, query returning the current rows for a list of keys)
+        self.collections = {
+            self.app: ("aid", f'''
+                SELECT a.*, c.name AS cname
+                FROM {self.app} a
+                LEFT JOIN {self.company} c ON a.cid = c.cid
+                WHERE a.aid IN ({{}})
+            '''),
+            self.appUnitTable: ("id", f"SELECT * FROM {self.appUnitTable} WHERE id IN ({{}})"),
+            self.user: ("uid", f'''
+                SELECT u.uid, u.utid, u.cid, u.name, u.email, u.enable, c.name AS cname
+                FROM {self.user} u
+                LEFT JOIN {self.company} c ON u.cid = c.cid
+                WHERE u.uid IN ({{}})
+            '''),
+            self.company: ("cid", f"SELECT * FROM {self.company} WHERE cid IN ({{}})"),
+        }
+
+    def getVersionRange(self):
+        """
+        Retrieves the oldest and the latest version kept in the change journal.
+
+        Returns:
+            Tuple: A tuple containing (oldest, latest), both 0 when the journal is empty, and any potential error.
+        """
+        _sqlQuery = f"SELECT COALESCE(MIN(version), 0) AS oldest, COALESCE(MAX(version), 0) AS latest FROM {self.changeLog}"
+        _result, _err = self.database_mgr.executeQuery(_sqlQuery)
+        if _err:
+            return None, _err
+        return (_result[0]['oldest'], _result[0]['latest']), None
+
+    def getChanges(self, table: str, since: int, until: int, limit: int, cid=None):
+        """
+        Retrieves the rows of a table changed in the version range (since, until], newest change per row.
+
+        Args:
+            table (str): The journal table name (app, appUnit, user or company).
+            since (int): The version the client is synced to.
+            until (int): The last version to include.
+            limit (int): The maximum number of rows to return.
+            cid (int): Only return changes of this company, None for every company.
+
+        Returns:
+            Tuple: A tuple containing a list of (rid, version, op) rows ordered by version and any potential error.
+        """
+        _sqlQuery = f"SELECT rid, MAX(version) AS version, op FROM {self.changeLog} WHERE tbl = ? AND version > ? AND version <= ?"
+        _params = [table, since, until]
+        if cid is not None:
+            _sqlQuery += " AND cid = ?"
+            _params.append(cid)
+        _sqlQuery += " GROUP BY rid ORDER BY version LIMIT ?"
+        _params.append(limit)
+
+        return self.database_mgr.executeQuery(_sqlQuery, tuple(_params))
+
+    def getChangesAfter(self, since: int, limit: int):
+        """
+        Retrieves the journal entries of every table after a version, one per change.
+
+        Args:
+            since (int): The last version already handled.
+            limit (int): The maximum number of entries to return.
+
+        Returns:
+            Tuple: A tuple containing a list of (version, tbl, rid, op, ts) rows ordered by version and any potential error.
+        """
+        _sqlQuery = f"SELECT version, tbl, rid, op, ts FROM {self.changeLog} WHERE version > ? ORDER BY version LIMIT ?"
+        return self.database_mgr.executeQuery(_sqlQuery, (since, limit))
+
+    def getRows(self, table: str, keys: list):
+        """
+        Retrieves the current rows of a table for a list of primary keys.
+
+        Args:
+            table (str): The journal table name (app, appUnit, user or company).
+            keys (list): The primary keys to read.
+
+        Returns:
+            Tuple: A tuple containing a dict of primary key -> row (missing keys were deleted) and any potential error.
+        """
+        _key_column, _sqlQuery = self.collections[table]
+        _rows = {}
+        # stay well below SQLite's bound parameter limit
+        for _start in range(0, len(keys), 500):
+            _chunk = keys[_start:_start + 500]
+            _result, _err = self.database_mgr.executeQuery(_sqlQuery.format(", ".join("?" * len(_chunk))), tuple(_chunk))
+            if _err:
+                return None, _err
+            for _row in _result or []:
+                _rows[_row[_key_column]] = _row
+        return _rows, None
+
+    def pruneChanges(self, keep: int):
+        """
+        Deletes the oldest journal entries, keeping the latest ones.
+
+        Args:
+            keep (int): The number of entries to keep.
+
+        Returns:
+            Tuple: A tuple containing the result of the operation and any potential error.
+        """
+        _sqlQuery = f"DELETE FROM {self.changeLog} WHERE version <= (SELECT MAX(version) FROM {self.changeLog}) - ?"
+        return self.database_mgr.executeNonQuery(_sqlQuery, (keep,))
+
+
+    # Async variants, executed on the database executor so the event loop is never blocked
+
+    async def getVersionRangeAsync(self):
+        return await self.database_mgr.run_async(self.getVersionRange)
+
+    async def getChangesAsync(self, table: str, since: int, until: int, limit: int, cid=None):
+        return await self.database_mgr.run_async(self.getChanges, table, since, until, limit, cid)
+
+    async def getRowsAsync(self, table: str, keys: list):
+        return await self.database_mgr.run_async(self.getRows, table, keys)
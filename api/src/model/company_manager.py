@@ -70,9 +70,7 @@ class CompanyManager:
             Tuple: A tuple containing the _result of the operation and any potential error.
         """
         if user_type in [UserType.SUPER_ADMIN.value, UserType.ADMIN.value]:
-            _sqlQuery = f"INSERT INTO {self.company} (name, enable) VALUES (?, ?)"
-            _params = (name, enable)
-            _result, _err = self.database_mgr.executeQuery(_sqlQuery, _params)
+            _result, _err = self.database_mgr.executeInsert(self.company, {"name": name, "enable": enable})
             print_log(AuditEntry(self.base_dir, user_name, user_type, name, "Add Company", _result, _err ))
             return _result, _err
 
@@ -125,3 +123,21 @@ class CompanyManager:
 
             print_log(AuditEntry(self.base_dir, user_name, user_type, cid, "Delete Company", _result , _err))
             return _result, _err
+
+
+    # Async variants, executed on the database executor so the event loop is never blocked
+
+    async def getAllCompaniesAsync(self, user_type: str, cid):
+        return await self.database_mgr.run_async(self.getAllCompanies, user_type, cid)
+
+    async def getCompanyByIdAsync(self, cid: int, user_type: str):
+        return await self.database_mgr.run_async(self.getCompanyById, cid, user_type)
+
+    async def addCompanyAsync(self, name: str, enable: int, user_type: str, user_name: str):
+        return await self.database_mgr.run_async(self.addCompany, name, enable, user_type, user_name)
+
+    async def updateCompanyAsync(self, cid: int, name: str, enable: int, user_type: str, user_name: str):
+        return await self.database_mgr.run_async(self.updateCompany, cid, name, enable, user_type, user_name)
+
+    async def deleteCompanyAsync(self, cid: int, user_type: str, user_name: str):
+        return await self.database_mgr.run_async(self.deleteCompany, cid, user_type, user_name)
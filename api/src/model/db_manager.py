@@ -11,13 +11,19 @@
 
 # #######################################################################################################
 
+import asyncio
+from contextlib import contextmanager
+import contextvars
 from datetime import datetime
 import sqlite3
 import os
 import logging
 from concurrent.futures import ThreadPoolExecutor
 import threading
+import time
 
+from src.model.db_pool import ConnectionPool, PoolTimeoutError
+from src.model.migration_manager import MigrationManager
 from src.utilities.settings import get_config
 
 def singleton(cls):
@@ -30,12 +36,90 @@ def singleton(cls):
 
     return get_instance
 
+
+# INSERT ... RETURNING is available from SQLite 3.35
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Transaction bound to the current thread / asyncio task, see DBManager.transaction()
+_active_transaction = contextvars.ContextVar("db_transaction", default=None)
+
+
+"""Unit of work that commits several statements at once.
+
+    Statements executed through the DBManager inside the with / async with block share one
+    connection and are committed together when the block exits. The transaction is rolled back
+    instead when the block raises, when one of its statements fails or when rollback() is called.
+    Opening a transaction inside another one joins the outer transaction.
+"""
+class Transaction:
+    def __init__(self, db_mgr):
+        self.db_mgr = db_mgr
+        self.conn = None
+        self.statements = 0
+        self.failed = None
+        self.rollback_only = False
+        self.started = None
+        self._outer = None
+        self._token = None
+
+
+    """Mark the transaction so it is rolled back instead of committed when the block exits."""
+    def rollback(self):
+        self.rollback_only = True
+
+
+    def __enter__(self):
+        self._outer = _active_transaction.get()
+        if self._outer is not None:
+            return self._outer
+
+        self.db_mgr._begin_transaction(self)
+        self._token = _active_transaction.set(self)
+        return self
+
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._outer is not None:
+            if exc_type is not None:
+                self._outer.rollback()
+            return False
+
+        _active_transaction.reset(self._token)
+        self.db_mgr._end_transaction(self, exc)
+        return False
+
+
+    async def __aenter__(self):
+        self._outer = _active_transaction.get()
+        if self._outer is not None:
+            return self._outer
+
+        await self.db_mgr.run_async(self.db_mgr._begin_transaction, self)
+        self._token = _active_transaction.set(self)
+        return self
+
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._outer is not None:
+            if exc_type is not None:
+                self._outer.rollback()
+            return False
+
+        try:
+            # Finish on the transaction thread: the executor threads may all be waiting on the write lock held here
+            await self.db_mgr.run_async(self.db_mgr._end_transaction, self, exc)
+        finally:
+            _active_transaction.reset(self._token)
+        return False
+
+
 """Singleton class for managing SQLite database connections and queries."""
 @singleton
 class DBManager:
     def __init__(self, base_dir, max_workers=10):
         self.base_dir = base_dir
-        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Dedicated executor backing the awaitable API (fetch/execute) so blocking SQLite calls stay off the event loop
+        self.thread_pool = ThreadPoolExecutor(max_workers=int(get_config("DB_EXECUTOR_WORKERS", max_workers)), thread_name_prefix="db-executor")
         self._db_path = None
         self.db_connected = False
         self.conn = None
@@ -44,6 +128,21 @@ class DBManager:
         self.encryption_key = get_config("ENCRYPTION_KEY")
         # Create a threading lock
         self.lock = threading.Lock()
+        # Connection pool (WAL mode) used instead of the shared connection when DB_POOL_SIZE > 0
+        self.pool = None
+        self.pool_size = int(get_config("DB_POOL_SIZE", 0))
+        # also bounds the wait for the shared connection lock when there is no pool
+        self.pool_timeout = float(get_config("DB_POOL_TIMEOUT", 5))
+        # Only one transaction can hold the write connection at a time, so its statements share one thread
+        self._tx_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-transaction")
+        self._tx_metrics_lock = threading.Lock()
+        self._tx_metrics = {
+            "committed": 0,
+            "rolled_back": 0,
+            "statements": 0,
+            "duration_total_ms": 0.0,
+            "duration_max_ms": 0.0,
+        }
 
 
         
@@ -57,6 +156,7 @@ class DBManager:
             del self.db_connected
             del self.conn
             del self.cursor
+            del self.pool
         except:
             pass
         pass
@@ -119,6 +219,16 @@ class DBManager:
                         logging.error(f"[{self.__class__.__name__}: {self.connect.__name__}: {datetime.now()}]: [ERROR] - Schema file '{schema_file_path}' not found. Cannot create database.")
                         self.db_connected = False
 
+                if self.db_connected:
+                    # Bring new and existing databases up to the latest schema version
+                    _version, _err = MigrationManager(self.base_dir).migrate(self.conn)
+                    if _err:
+                        self.db_connected = False
+                        return False, _err
+
+                if self.db_connected and self.pool_size > 0:
+                    self._create_pool()
+
                 return self.db_connected, None
 
         except sqlite3.Error as e:
@@ -133,11 +243,51 @@ class DBManager:
             return False, exp
 
 
+    """Switch from the shared bootstrap connection to the WAL connection pool."""
+    def _create_pool(self):
+        if self.pool:
+            self.pool.close()
+        self.pool = ConnectionPool(self._db_path, self.pool_size, self.pool_timeout)
+
+        # The bootstrap connection was only needed to create/open the schema
+        self.conn.close()
+        self.conn = None
+        self.cursor = None
+        logging.info(f"[{self.__class__.__name__}: {self._create_pool.__name__}: {datetime.now()}]: [INFO] - Connection pool mode enabled (pool size: {self.pool_size})")
+
+
+    """Return connection pool metrics, or None when the pool mode is disabled."""
+    def get_pool_metrics(self):
+        if self.pool is None:
+            return None
+        return self.pool.get_metrics()
+
+
+    """Open a separate read-only connection to the database, owned by the caller.
+
+    PRAGMA data_version is per connection, so a watcher needs one that stays its own.
+    """
+    def open_watch_connection(self):
+        if self._db_path is None:
+            return None
+        _conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        _conn.execute("PRAGMA query_only = 1")
+        return _conn
+
+
     """Close the connection to the SQLite database."""
     def close_connection(self):
         try:
+            self.thread_pool.shutdown(wait=False)
+            self._tx_executor.shutdown(wait=False)
             with self.lock:
-                if self.conn:
+                if self.pool:
+                    self.pool.close()
+                    self.pool = None
+                    logging.info(f"[{self.__class__.__name__}: {self.close_connection.__name__}: {datetime.now()}]: [INFO] - Connection pool closed")
+                    self.db_connected = False
+                    return True
+                elif self.conn:
                     self.conn.close()
                     logging.info(f"[{self.__class__.__name__}: {self.executeNonQuery.__name__}: {datetime.now()}]: [INFO] - Connection to SQLite Database closed")
                     self.db_connected = False
@@ -151,6 +301,38 @@ class DBManager:
             return False
 
 
+    """Check whether a statement only reads data and can be served by a pooled reader connection."""
+    def _is_read_query(self, sqlQuery: str):
+        return sqlQuery.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+    """Build the (data) result of an executed query from the given cursor.
+
+    Args:
+        cursor (sqlite3.Cursor): The cursor the query was executed on.
+        sqlQuery (str): The executed SQL query.
+
+    Returns:
+        list: The result rows as a list of dictionaries.
+    """
+    def _fetch_result(self, cursor, sqlQuery: str):
+        if cursor.description is None and sqlQuery.strip().upper().startswith("INSERT"):
+            # INSERT without RETURNING: read the row back by the rowid of this cursor's insert
+            table_name = sqlQuery.split("INTO")[1].split("(")[0].strip()
+            select_query = f"SELECT * FROM {table_name} WHERE ROWID = ?"
+
+            # Execute the SELECT query
+            cursor.execute(select_query, (cursor.lastrowid,))
+
+            # Fetch the inserted row
+            _columns = [column[0] for column in cursor.description]
+            _row = cursor.fetchone()
+            return [dict(zip(_columns, _row))]
+
+        _columns  = [column[0] for column in cursor.description]
+        return [dict(zip(_columns , row)) for row in cursor.fetchall()]
+
+
     """Execute a SQL query.
 
     Args:
@@ -161,48 +343,23 @@ class DBManager:
         tuple: A tuple containing the query results and any error encountered during execution.
     """
     def executeQuery(self, sqlQuery: str, params: tuple = ()):
+        if _active_transaction.get() is not None:
+            return self._executeInTransaction(sqlQuery, params, fetch=True)
+
         try:
-            # if not self.lock.locked():
-            #     self.lock.acquire()
+            if self.pool:
+                return self._executePooledQuery(sqlQuery, params), None
 
-            with self.lock:
+            with self._locked():
                 if not self.db_connected:
                     self.connect(self.db_name)
 
                 # Execute the SQL query
                 self.cursor.execute(sqlQuery, params)
+                _result = self._fetch_result(self.cursor, sqlQuery)
                 self.conn.commit()
-                # rows = self.cursor.fetchall()
                 logging.info(f"[{self.__class__.__name__}: {self.executeQuery.__name__}: {datetime.now()}]: [INFO] - Query executed successfully")
-                # return rows, None
-
-                if sqlQuery.strip().upper().startswith("INSERT"):
-                    # Get the last inserted row ID
-                    last_row_id = self.cursor.lastrowid
-
-                    # Construct a SELECT query to retrieve the inserted row
-                    table_name = sqlQuery.split("INTO")[1].split("(")[0].strip()
-                    # select_query = f"SELECT * FROM {table_name} WHERE id = {last_row_id}"
-                    # self.cursor.execute(f"SELECT * FROM {table_name} WHERE ROWID IN (SELECT max(ROWID) FROM {table_name});")
-                    # last_row = self.cursor.fetchone()
-                    # return last_row, None
-
-                    select_query = f"SELECT * FROM {table_name} WHERE ROWID IN (SELECT max(ROWID) FROM {table_name});"
-                    last_row = self.cursor.fetchone()
-
-                     # Execute the SELECT query
-                    self.cursor.execute(select_query)
-
-                    # Fetch the inserted row
-                    _columns = [column[0] for column in self.cursor.description]
-                    _row = self.cursor.fetchone()
-                    _data = [dict(zip(_columns, _row))]
-                    return _data, None
-            
-                else:
-                    _columns  = [column[0] for column in self.cursor.description]
-                    _data = [dict(zip(_columns , row)) for row in self.cursor.fetchall()]
-                    return _data, None
+                return _result, None
 
         except sqlite3.Error as e:
             logging.error(f"[{self.__class__.__name__}: {self.executeQuery.__name__}: {datetime.now()}]: [ERROR] - SQLite error occurred: {str(e)}")
@@ -216,6 +373,33 @@ class DBManager:
             return None, exp
 
 
+    """Execute a SQL query on a pooled connection. Reads use a reader connection, everything else the writer."""
+    def _executePooledQuery(self, sqlQuery: str, params: tuple = ()):
+        if self._is_read_query(sqlQuery):
+            with self.pool.reader() as _conn:
+                _cursor = _conn.cursor()
+                try:
+                    _cursor.execute(sqlQuery, params)
+                    logging.info(f"[{self.__class__.__name__}: {self.executeQuery.__name__}: {datetime.now()}]: [INFO] - Query executed successfully")
+                    return self._fetch_result(_cursor, sqlQuery)
+                finally:
+                    _cursor.close()
+
+        with self.pool.writer() as _conn:
+            _cursor = _conn.cursor()
+            try:
+                _cursor.execute(sqlQuery, params)
+                _result = self._fetch_result(_cursor, sqlQuery)
+                _conn.commit()
+                logging.info(f"[{self.__class__.__name__}: {self.executeQuery.__name__}: {datetime.now()}]: [INFO] - Query executed successfully")
+                return _result
+            except Exception:
+                _conn.rollback()
+                raise
+            finally:
+                _cursor.close()
+
+
     """Execute a non-query SQL statement.
 
     Args:
@@ -226,11 +410,14 @@ class DBManager:
         tuple: A tuple containing a boolean indicating the execution status and any error encountered.
     """
     def executeNonQuery(self, sqlQuery: str, params: tuple = ()):
-        try:
-            # if not self.lock.locked():
-            #     self.lock.acquire()
+        if _active_transaction.get() is not None:
+            return self._executeInTransaction(sqlQuery, params, fetch=False)
 
-            with self.lock:
+        if self.pool:
+            return self._executePooledNonQuery(sqlQuery, params)
+
+        try:
+            with self._locked():
                 if not self.db_connected:
                     self.connect(self.db_name)
     
@@ -255,3 +442,254 @@ class DBManager:
             return False, exp
 
 
+    """Execute a non-query SQL statement on the pooled writer connection."""
+    def _executePooledNonQuery(self, sqlQuery: str, params: tuple = ()):
+        try:
+            with self.pool.writer() as _conn:
+                _cursor = _conn.cursor()
+                try:
+                    _cursor.execute(sqlQuery, params)
+                    _conn.commit()
+                    logging.info(f"[{self.__class__.__name__}: {self.executeNonQuery.__name__}: {datetime.now()}]: [INFO] - Non-query executed successfully")
+                    return True, None
+                except Exception:
+                    _conn.rollback()
+                    raise
+                finally:
+                    _cursor.close()
+
+        except sqlite3.Error as e:
+            logging.error(f"[{self.__class__.__name__}: {self.executeNonQuery.__name__}: {datetime.now()}]: [ERROR] - SQLite error occurred: {str(e)}")
+            logging.error(f"SQLite error code: {e.args[0]}")
+            return False, e
+
+        except Exception as exp:
+            logging.error(f"[{self.__class__.__name__}: {self.executeNonQuery.__name__}: {datetime.now()}]: [ERROR] - Error executing non-query: {str(exp)}")
+            logging.error(exp, stack_info=True, exc_info=True)
+            logging.error(exp.__traceback__)
+            return False, exp
+
+
+    """Run a blocking database call on the database executor.
+
+    Args:
+        func (callable): The blocking function to run.
+        *args: Positional arguments passed to the function.
+
+    Returns:
+        Any: The value returned by the function.
+    """
+    async def run_async(self, func, *args):
+        _loop = asyncio.get_running_loop()
+        # Copy the context so an open transaction is visible to the executor thread
+        _ctx = contextvars.copy_context()
+        _executor = self._tx_executor if _active_transaction.get() is not None else self.thread_pool
+        return await _loop.run_in_executor(_executor, _ctx.run, func, *args)
+
+
+    """Awaitable variant of executeQuery.
+
+    Args:
+        sqlQuery (str): The SQL query to execute.
+        params (tuple, optional): Parameters for the query. Defaults to ().
+
+    Returns:
+        tuple: A tuple containing the query results and any error encountered during execution.
+    """
+    async def fetch(self, sqlQuery: str, params: tuple = ()):
+        return await self.run_async(self.executeQuery, sqlQuery, params)
+
+
+    """Awaitable variant of executeNonQuery.
+
+    Args:
+        sqlQuery (str): The SQL statement to execute.
+        params (tuple, optional): Parameters for the statement. Defaults to ().
+
+    Returns:
+        tuple: A tuple containing a boolean indicating the execution status and any error encountered.
+    """
+    async def execute(self, sqlQuery: str, params: tuple = ()):
+        return await self.run_async(self.executeNonQuery, sqlQuery, params)
+
+
+    """Open a unit of work. Use as `with db.transaction() as tx:` or `async with db.transaction() as tx:`.
+
+    Returns:
+        Transaction: The transaction context manager.
+    """
+    def transaction(self):
+        return Transaction(self)
+
+
+    """Take the write connection and start the transaction."""
+    def _begin_transaction(self, tx: Transaction):
+        if self.pool:
+            tx.conn = self.pool.acquire_writer()
+        else:
+            if not self.db_connected:
+                self.connect(self.db_name)
+            self._acquire_lock()
+            tx.conn = self.conn
+
+        try:
+            # IMMEDIATE takes the write lock up front so the transaction cannot fail half way on SQLITE_BUSY
+            tx.conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._release_transaction()
+            raise
+        tx.started = time.perf_counter()
+
+
+    """Commit or roll back the transaction and hand back the write connection."""
+    def _end_transaction(self, tx: Transaction, exc=None):
+        _committed = False
+        try:
+            if exc is not None or tx.failed is not None or tx.rollback_only:
+                tx.conn.rollback()
+            else:
+                tx.conn.commit()
+                _committed = True
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self._end_transaction.__name__}: {datetime.now()}]: [ERROR] - Commit failed, rolling back: {str(e)}")
+            tx.conn.rollback()
+            raise
+        finally:
+            self._release_transaction()
+            self._record_transaction(tx, _committed)
+
+
+    """Take the shared connection lock, waiting at most pool_timeout seconds like a pooled writer checkout."""
+    def _acquire_lock(self):
+        if not self.lock.acquire(timeout=self.pool_timeout):
+            raise PoolTimeoutError(f"Database connection not available within {self.pool_timeout}s")
+
+
+    """Hold the shared connection lock for the duration of the with block."""
+    @contextmanager
+    def _locked(self):
+        self._acquire_lock()
+        try:
+            yield
+        finally:
+            self.lock.release()
+
+
+    def _release_transaction(self):
+        if self.pool:
+            self.pool.release_writer()
+        else:
+            self.lock.release()
+
+
+    def _record_transaction(self, tx: Transaction, committed: bool):
+        _duration_ms = (time.perf_counter() - tx.started) * 1000 if tx.started else 0.0
+        with self._tx_metrics_lock:
+            self._tx_metrics["committed" if committed else "rolled_back"] += 1
+            self._tx_metrics["statements"] += tx.statements
+            self._tx_metrics["duration_total_ms"] += _duration_ms
+            if _duration_ms > self._tx_metrics["duration_max_ms"]:
+                self._tx_metrics["duration_max_ms"] = _duration_ms
+
+        _state = "committed" if committed else "rolled back"
+        logging.info(f"[{self.__class__.__name__}: {self._record_transaction.__name__}: {datetime.now()}]: [INFO] - Transaction {_state} ({tx.statements} statement(s), {_duration_ms:.2f} ms)")
+
+
+    """Return transaction counts and timing statistics."""
+    def get_transaction_metrics(self):
+        with self._tx_metrics_lock:
+            _metrics = dict(self._tx_metrics)
+
+        _total = _metrics["committed"] + _metrics["rolled_back"]
+        _metrics["duration_avg_ms"] = _metrics["duration_total_ms"] / _total if _total else 0.0
+        return _metrics
+
+
+    """Execute a statement on the connection of the open transaction, without committing.
+
+    Args:
+        sqlQuery (str): The SQL statement to execute.
+        params (tuple): Parameters for the statement.
+        fetch (bool): Return the result rows (executeQuery) instead of a status flag (executeNonQuery).
+
+    Returns:
+        tuple: A tuple containing the result and any error encountered. An error marks the transaction for rollback.
+    """
+    def _executeInTransaction(self, sqlQuery: str, params: tuple, fetch: bool):
+        _tx = _active_transaction.get()
+        _cursor = _tx.conn.cursor()
+        try:
+            _cursor.execute(sqlQuery, params)
+            _tx.statements += 1
+            logging.info(f"[{self.__class__.__name__}: {self._executeInTransaction.__name__}: {datetime.now()}]: [INFO] - Statement executed in transaction")
+            if fetch:
+                return self._fetch_result(_cursor, sqlQuery), None
+            return True, None
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self._executeInTransaction.__name__}: {datetime.now()}]: [ERROR] - Statement failed, transaction will be rolled back: {str(e)}")
+            _tx.failed = e
+            return (None if fetch else False), e
+
+        finally:
+            _cursor.close()
+
+
+    """Insert a row and return it, read back in the same statement.
+
+    Args:
+        table (str): The table to insert into.
+        values (dict): Column names mapped to the values to insert.
+
+    Returns:
+        tuple: A tuple containing a list with the inserted row and any error encountered during execution.
+    """
+    def executeInsert(self, table: str, values: dict):
+        _columns = ", ".join(values.keys())
+        _placeholders = ", ".join("?" for _ in values)
+        _sqlQuery = f"INSERT INTO {table} ({_columns}) VALUES ({_placeholders})"
+        if _SUPPORTS_RETURNING:
+            _sqlQuery += " RETURNING *"
+        # Older SQLite versions fall back to a lookup by lastrowid in _fetch_result
+        return self.executeQuery(_sqlQuery, tuple(values.values()))
+
+
+    """Insert many rows with a single executemany call, committed once.
+
+    Args:
+        table (str): The table to insert into.
+        columns (list): The column names.
+        rows (list): The rows to insert, one tuple of values per row in column order.
+
+    Returns:
+        tuple: A tuple containing the number of inserted rows and any error encountered during execution.
+    """
+    def executeMany(self, table: str, columns: list, rows: list):
+        _sqlQuery = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+        try:
+            with self.transaction() as _tx:
+                _cursor = _tx.conn.cursor()
+                try:
+                    _cursor.executemany(_sqlQuery, rows)
+                    _tx.statements += 1
+                    logging.info(f"[{self.__class__.__name__}: {self.executeMany.__name__}: {datetime.now()}]: [INFO] - Inserted {_cursor.rowcount} row(s) into {table}")
+                    return _cursor.rowcount, None
+                except Exception as e:
+                    _tx.failed = e
+                    raise
+                finally:
+                    _cursor.close()
+
+        except Exception as exp:
+            logging.error(f"[{self.__class__.__name__}: {self.executeMany.__name__}: {datetime.now()}]: [ERROR] - Error executing bulk insert: {str(exp)}")
+            return 0, exp
+
+
+    """Awaitable variant of executeInsert."""
+    async def insert(self, table: str, values: dict):
+        return await self.run_async(self.executeInsert, table, values)
+
+
+    """Awaitable variant of executeMany."""
+    async def insertMany(self, table: str, columns: list, rows: list):
+        return await self.run_async(self.executeMany, table, columns, rows)
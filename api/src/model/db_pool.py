@@ -0,0 +1,158 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes available within the checkout timeout."""
+
+
+"""SQLite connection pool running in WAL mode.
+
+    Readers are served from a fixed set of connections so they never wait on each other,
+    while every write goes through a single connection guarded by a lock (SQLite only
+    allows one writer at a time, WAL lets the readers keep going while it runs).
+"""
+class ConnectionPool:
+    def __init__(self, db_path: str, pool_size: int, checkout_timeout: float, busy_timeout: int = 5000):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.busy_timeout = busy_timeout
+
+        self._readers = queue.Queue(maxsize=pool_size)
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._closed = False
+
+        self._metrics = {
+            "read_checkouts": 0,
+            "write_checkouts": 0,
+            "checkout_timeouts": 0,
+            "read_wait_total_ms": 0.0,
+            "read_wait_max_ms": 0.0,
+            "write_wait_total_ms": 0.0,
+            "write_wait_max_ms": 0.0,
+        }
+
+        self._writer = self._open_connection(read_only=False)
+        for _ in range(pool_size):
+            self._readers.put(self._open_connection(read_only=True))
+
+        logging.info(f"[{self.__class__.__name__}: __init__: {datetime.now()}]: [INFO] - Connection pool ready with {pool_size} reader(s) and 1 writer in WAL mode")
+
+
+    def _open_connection(self, read_only: bool):
+        _conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.busy_timeout / 1000)
+        _conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if read_only:
+            _conn.execute("PRAGMA query_only = 1")
+        else:
+            _conn.execute("PRAGMA journal_mode = WAL")
+        return _conn
+
+
+    def _record_wait(self, kind: str, waited_ms: float):
+        with self._metrics_lock:
+            self._metrics[f"{kind}_checkouts"] += 1
+            self._metrics[f"{kind}_wait_total_ms"] += waited_ms
+            if waited_ms > self._metrics[f"{kind}_wait_max_ms"]:
+                self._metrics[f"{kind}_wait_max_ms"] = waited_ms
+
+
+    def _record_timeout(self):
+        with self._metrics_lock:
+            self._metrics["checkout_timeouts"] += 1
+
+
+    """Check out a read-only connection for the duration of the with block."""
+    @contextmanager
+    def reader(self):
+        _started = time.perf_counter()
+        try:
+            _conn = self._readers.get(timeout=self.checkout_timeout)
+        except queue.Empty:
+            self._record_timeout()
+            raise PoolTimeoutError(f"No reader connection available within {self.checkout_timeout}s")
+
+        self._record_wait("read", (time.perf_counter() - _started) * 1000)
+        try:
+            yield _conn
+        finally:
+            self._readers.put(_conn)
+
+
+    """Check out the single writer connection. Must be handed back with release_writer()."""
+    def acquire_writer(self):
+        _started = time.perf_counter()
+        if not self._write_lock.acquire(timeout=self.checkout_timeout):
+            self._record_timeout()
+            raise PoolTimeoutError(f"Writer connection not available within {self.checkout_timeout}s")
+
+        self._record_wait("write", (time.perf_counter() - _started) * 1000)
+        return self._writer
+
+
+    """Hand the writer connection back to the pool."""
+    def release_writer(self):
+        self._write_lock.release()
+
+
+    """Check out the single writer connection for the duration of the with block."""
+    @contextmanager
+    def writer(self):
+        _conn = self.acquire_writer()
+        try:
+            yield _conn
+        finally:
+            self.release_writer()
+
+
+    """Return pool size, current usage and checkout wait statistics."""
+    def get_metrics(self):
+        with self._metrics_lock:
+            _metrics = dict(self._metrics)
+
+        _metrics["pool_size"] = self.pool_size
+        _metrics["readers_idle"] = self._readers.qsize()
+        _metrics["readers_in_use"] = self.pool_size - self._readers.qsize()
+        _metrics["writer_in_use"] = self._write_lock.locked()
+        _metrics["read_wait_avg_ms"] = _metrics["read_wait_total_ms"] / _metrics["read_checkouts"] if _metrics["read_checkouts"] else 0.0
+        _metrics["write_wait_avg_ms"] = _metrics["write_wait_total_ms"] / _metrics["write_checkouts"] if _metrics["write_checkouts"] else 0.0
+        return _metrics
+
+
+    """Close every pooled connection."""
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+        with self._write_lock:
+            if self._writer:
+                self._writer.close()
+                self._writer = None
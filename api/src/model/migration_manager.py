@@ -0,0 +1,120 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+import os
+import re
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory file locks (Windows): workers are not serialized
+    fcntl = None
+
+
+"""Versioned schema migrations.
+
+    Migrations are SQL files named <version>_<description>.sql in config/migrations. The version
+    of the database is kept in PRAGMA user_version; every migration above it is applied in order,
+    each one in its own transaction together with the version bump, so an existing database is
+    upgraded in place at startup and a failed migration leaves it at the previous version.
+    Every uvicorn worker migrates at startup, so a run holds db/<name>.migrate.lock and reads the
+    version only once it has it: a worker that waited finds the migrations already applied.
+"""
+class MigrationManager:
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.migrations_dir = os.path.join(base_dir, 'config', 'migrations')
+
+
+    """List the available migrations.
+
+    Returns:
+        list: (version, file path) tuples sorted by version.
+    """
+    def get_migrations(self):
+        _migrations = []
+        if not os.path.isdir(self.migrations_dir):
+            return _migrations
+
+        for _file_name in os.listdir(self.migrations_dir):
+            _match = re.match(r"^(\d+)_.+\.sql$", _file_name)
+            if _match:
+                _migrations.append((int(_match.group(1)), os.path.join(self.migrations_dir, _file_name)))
+        return sorted(_migrations)
+
+
+    """Return the schema version of the database."""
+    def get_version(self, conn):
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+    """Hold the exclusive migration lock of the database file for the duration of the with block."""
+    @contextmanager
+    def _locked(self, conn):
+        _db_file = conn.execute("PRAGMA database_list").fetchone()[2]
+        if fcntl is None or not _db_file:
+            # in-memory database, nobody else can see it
+            yield
+            return
+
+        with open(f"{os.path.splitext(_db_file)[0]}.migrate.lock", "a") as _lock_file:
+            fcntl.flock(_lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(_lock_file.fileno(), fcntl.LOCK_UN)
+
+
+    """Apply every pending migration, one process at a time.
+
+    Args:
+        conn (sqlite3.Connection): Connection to the database to upgrade.
+
+    Returns:
+        tuple: A tuple containing the resulting schema version and any error encountered.
+    """
+    def migrate(self, conn):
+        with self._locked(conn):
+            return self._migrate(conn)
+
+
+    def _migrate(self, conn):
+        _version = self.get_version(conn)
+        _pending = [_migration for _migration in self.get_migrations() if _migration[0] > _version]
+        if not _pending:
+            logging.info(f"[{self.__class__.__name__}: {self.migrate.__name__}: {datetime.now()}]: [INFO] - Database schema is up to date (version {_version})")
+            return _version, None
+
+        for _target, _path in _pending:
+            with open(_path, "r") as _migration_file:
+                _script = _migration_file.read()
+
+            try:
+                # executescript commits any open transaction first, so the script carries its own BEGIN/COMMIT
+                conn.executescript(f"BEGIN IMMEDIATE;\n{_script}\nPRAGMA user_version = {_target};\nCOMMIT;")
+                _version = _target
+                logging.info(f"[{self.__class__.__name__}: {self.migrate.__name__}: {datetime.now()}]: [INFO] - Applied migration {os.path.basename(_path)} (version {_version})")
+
+            except Exception as e:
+                if conn.in_transaction:
+                    conn.rollback()
+                logging.error(f"[{self.__class__.__name__}: {self.migrate.__name__}: {datetime.now()}]: [ERROR] - Migration {os.path.basename(_path)} failed, database left at version {_version}: {str(e)}")
+                return _version, e
+
+        # Refresh the query planner statistics for the new indexes
+        conn.execute("PRAGMA optimize")
+        return _version, None
@@ -108,9 +108,8 @@ class UserManager:
         """
         _hashed_password = self.auth_mgr.hash_password(password)
         if user_type in [UserType.SUPER_ADMIN.value, UserType.ADMIN.value]:
-            _sqlQuery = f"INSERT INTO {self.user} (name, email, hashed_password, enable, cid, utid) VALUES (?, ?, ?, ?, ?, ?)"
-            _params = (name, email, _hashed_password, enable, cid, utid)
-            _result, _err = self.database_mgr.executeQuery(_sqlQuery, _params)
+            _values = {"name": name, "email": email, "hashed_password": _hashed_password, "enable": enable, "cid": cid, "utid": utid}
+            _result, _err = self.database_mgr.executeInsert(self.user, _values)
             if _result:
                 del _result[0]['hashed_password']
                 
@@ -188,3 +187,21 @@ class UserManager:
         else:
             print_log(AuditEntry(self.base_dir, user_name, user_type, uid, "Delete User", _result, _err ))
             return None, "User has not access to delete"
+
+
+    # Async variants, executed on the database executor so the event loop is never blocked
+
+    async def getAllUsersAsync(self, user_type: str, log_uid: str):
+        return await self.database_mgr.run_async(self.getAllUsers, user_type, log_uid)
+
+    async def getUserByIdAsync(self, uid: int, user_type: str, log_uid: str):
+        return await self.database_mgr.run_async(self.getUserById, uid, user_type, log_uid)
+
+    async def addUserAsync(self, *args):
+        return await self.database_mgr.run_async(self.addUser, *args)
+
+    async def updateUserAsync(self, *args):
+        return await self.database_mgr.run_async(self.updateUser, *args)
+
+    async def deleteUserAsync(self, uid: int, log_uid: str, user_type: str, user_name: str):
+        return await self.database_mgr.run_async(self.deleteUser, uid, log_uid, user_type, user_name)
@@ -0,0 +1,193 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+# #######################################################################################################
+
+from datetime import datetime
+import logging
+from classy_fastapi import Routable, get, post
+from fastapi import HTTPException, Request
+from src.routers.base.routeBase import ResponseModel, RouteBase
+from src.controller.adminController import AdminController
+
+
+class AdminRoute(Routable):
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.adminController = AdminController(base_dir)
+        self.routeBase = RouteBase()
+
+
+    """API route to retrieve the database connection pool metrics.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the pool size and checkout wait metrics.
+    """
+    @get("/db-pool", response_model=ResponseModel)
+    def get_db_pool_metrics(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_db_pool_metrics.__name__}: {datetime.now()}]: [INFO] - Retrieving database pool metrics")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getDbPoolMetrics(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_db_pool_metrics.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to retrieve the metrics of the upstream client used to call the monitored apps.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the request counters, per-host latency and pooled connections.
+    """
+    @get("/upstream", response_model=ResponseModel)
+    def get_upstream_metrics(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_upstream_metrics.__name__}: {datetime.now()}]: [INFO] - Retrieving upstream client metrics")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getUpstreamMetrics(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_upstream_metrics.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to retrieve the circuit breaker state of the monitored apps.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the state of every circuit breaker.
+    """
+    @get("/circuit-breakers", response_model=ResponseModel)
+    def get_circuit_breakers(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_circuit_breakers.__name__}: {datetime.now()}]: [INFO] - Retrieving circuit breaker state")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getCircuitBreakers(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_circuit_breakers.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to retrieve the shared app WebSocket streams and the throughput of every dashboard connection.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the upstream streams and per-connection counters.
+    """
+    @get("/websockets", response_model=ResponseModel)
+    def get_websocket_metrics(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_websocket_metrics.__name__}: {datetime.now()}]: [INFO] - Retrieving WebSocket metrics")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getWebSocketMetrics(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_websocket_metrics.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to rebuild the app cache from the database.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the number of cached apps.
+    """
+    @post("/app-cache/resync", response_model=ResponseModel)
+    async def resync_app_cache(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.resync_app_cache.__name__}: {datetime.now()}]: [INFO] - Resyncing app cache")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return await self.adminController.resyncAppCache(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.resync_app_cache.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to retrieve the metrics of the cache invalidation bus.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the poll counters, the last applied journal version and the propagation lag.
+    """
+    @get("/invalidation", response_model=ResponseModel)
+    def get_invalidation_metrics(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_invalidation_metrics.__name__}: {datetime.now()}]: [INFO] - Retrieving invalidation bus metrics")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getInvalidationMetrics(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_invalidation_metrics.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+    """API route to retrieve the size of the app cache against its bounds.
+
+    Args:
+        req (Request): The HTTP request.
+
+    Returns:
+        ResponseModel: A response containing the cached rows, approximate bytes, resident companies and read-through counters.
+    """
+    @get("/app-cache", response_model=ResponseModel)
+    def get_app_cache_metrics(self, req: Request):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_app_cache_metrics.__name__}: {datetime.now()}]: [INFO] - Retrieving app cache metrics")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return self.adminController.getAppCacheMetrics(_token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_app_cache_metrics.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -12,15 +12,14 @@
 ########################################################################################################
 
 #from urllib.request import Request
-import asyncio
 from datetime import datetime
 import logging
-from classy_fastapi import Routable, post, delete, post, put
-from fastapi import HTTPException, APIRouter, Request
+from classy_fastapi import Routable, get, post, delete, post, put
+from fastapi import HTTPException, APIRouter, Query, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from src.routers.base.routeBase import ResponseModel, App, RouteBase
+from src.routers.base.routeBase import ResponseModel, App, AppBatch, RouteBase
 from src.controller.appController import AppController
 # from appController import AppController
 
@@ -31,6 +30,15 @@ class AppRoute(Routable):
         self.security = HTTPBearer()
         self.routeBase = RouteBase()
         
+    """ API route to query the status / info of several apps, streamed as NDJSON """ 
+    @post("/batch")
+    async def batch_request(self, batch: AppBatch, req: Request):
+        _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+        if _token is None:
+            return self.routeBase.generate_response(None, 401)
+        else:
+            return await self.appController.batchRequest(batch.aids, batch.endpoints, _token)
+
     """ API route to retrieve app info """ 
     @post("/{aid}/info", response_model = ResponseModel)
     async def get_app_info(self, aid: int, app: App, req: Request):
@@ -41,14 +49,11 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         
-        # return self.appController.getAppInfo(aid, app.ip, app.rest_port, _token)
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, self.appController.getAppInfo, aid, app.ip, app.rest_port, _token)
-        return response
+        return await self.appController.getAppInfo(aid, app.ip, app.rest_port, _token)
         
     """ API route to retrieve app """ 
     @post("/{aid}/status", response_model = ResponseModel)
-    def get_app_status(self, aid: int, app: App, req: Request):
+    async def get_app_status(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.get_app_status.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -56,13 +61,13 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.getAppStatus(aid, app.ip, app.rest_port, _token)
+            return await self.appController.getAppStatus(aid, app.ip, app.rest_port, _token)
 
         
 
     """ API route for live monitoring """ 
     @post("/{aid}/live", response_model=ResponseModel)
-    def live_monitoring(self, aid: int, app: App, req: Request):
+    async def live_monitoring(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.live_monitoring.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -70,13 +75,13 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.liveMonitoring(aid, app.ip, app.rest_port, _token)
+            return await self.appController.liveMonitoring(aid, app.ip, app.rest_port, _token)
 
         
 
     """ API route to retrieve logs """ 
     @post("/{aid}/logs", response_model=ResponseModel)
-    def retrieve_logs(self, aid: int, app: App, req: Request):
+    async def retrieve_logs(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.retrieve_logs.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -84,13 +89,23 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.retrieveLogs(aid, app.ip, app.rest_port, _token)
+            return await self.appController.retrieveLogs(aid, app.ip, app.rest_port, _token)
 
         
 
+    """ API route to stream app logs: ?tail=N&offset=<bytes>&follow=true, SSE when format=sse or Accept: text/event-stream; ?token= for EventSource clients """ 
+    @get("/{aid}/logs/stream")
+    async def stream_logs(self, aid: int, req: Request, tail: int = Query(None), offset: int = Query(0), follow: bool = Query(False), format: str = Query(None), token: str = Query(None)):
+        _token = token if token is not None else self.routeBase.verify_auth_token_type(req.headers.get("authorization", ""))
+        if _token is None:
+            return self.routeBase.generate_response(None, 401)
+        else:
+            _sse = format == "sse" or (format is None and "text/event-stream" in req.headers.get("accept", ""))
+            return await self.appController.streamLogs(aid, tail, offset, follow, _sse, req.headers.get("last-event-id"), req.headers.get("accept-encoding"), _token)
+
     """ API route to reload configuration """ 
     @post("/{aid}/config-reload", response_model=ResponseModel)
-    def reload_configuration(self, aid: int, app: App, req: Request):
+    async def reload_configuration(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.reload_configuration.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -98,13 +113,13 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.reloadConfiguration(aid, app.ip, app.rest_port, _token)
+            return await self.appController.reloadConfiguration(aid, app.ip, app.rest_port, _token)
 
         
 
     """ API route to stop WSMonitor """ 
     @post("/{aid}/WSMonitor-stop", response_model=ResponseModel)
-    def stop_WSMonitor(self, aid: int, app: App, req: Request):
+    async def stop_WSMonitor(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.stop_WSMonitor.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -112,12 +127,12 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.stopWSMonitor(aid, app.ip, app.rest_port, _token)
+            return await self.appController.stopWSMonitor(aid, app.ip, app.rest_port, _token)
 
 
     """ API route to start WSMonitor """ 
     @post("/{aid}/WSMonitor-start", response_model=ResponseModel)
-    def start_WSMonitor(self, aid: int, app: App, req: Request):
+    async def start_WSMonitor(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.start_WSMonitor.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -125,12 +140,12 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.startWSMonitor(aid, app.ip, app.rest_port, _token)
+            return await self.appController.startWSMonitor(aid, app.ip, app.rest_port, _token)
 
 
     """ API route to stop Profiler """ 
     @post("/{aid}/Profiler-stop", response_model=ResponseModel)
-    def stop_profiler(self, aid: int, app: App, req: Request):
+    async def stop_profiler(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.stop_profiler.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -138,12 +153,12 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.stopProfiler(aid, app.ip, app.rest_port, _token)
+            return await self.appController.stopProfiler(aid, app.ip, app.rest_port, _token)
 
 
     """ API route to start Profiler """ 
     @post("/{aid}/Profiler-start", response_model=ResponseModel)
-    def start_profiler(self, aid: int, app: App, req: Request):
+    async def start_profiler(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.start_profiler.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -151,12 +166,12 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.startProfiler(aid, app.ip, app.rest_port, _token)
+            return await self.appController.startProfiler(aid, app.ip, app.rest_port, _token)
 
 
     """ API route to save configuration """ 
     @post("/{aid}/config-save", response_model=ResponseModel)
-    def save_configuration(self, aid: int, app: App, req: Request):
+    async def save_configuration(self, aid: int, app: App, req: Request):
         # if any(param is None for param in (aid,)):
         #     logging.warning(f"[{self.__class__.__name__}: {self.save_configuration.__name__}: {datetime.now()}]: [WARNING] - Bad Request: Missing input parameter")
         #     return self.routeBase.generate_response(None, 400)
@@ -164,7 +179,7 @@ class AppRoute(Routable):
         if _token is None:
             return self.routeBase.generate_response(None, 401)
         else:
-            return self.appController.saveConfiguration(aid, app.ip, app.rest_port, _token)
+            return await self.appController.saveConfiguration(aid, app.ip, app.rest_port, _token)
         
 
 
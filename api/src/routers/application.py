@@ -23,6 +23,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from src.routers.base.routeBase import Appunit, ResponseModel, ApplicationModel, RouteBase
 from src.controller.applicationController import ApplicationController
 from src.controller.appUnitController import AppUnitController
+from src.controller.changeController import ChangeController
 # from applicationController import ApplicationController
 
 # from routes.base.routeBase import ResponseModel
@@ -31,6 +32,7 @@ class ApplicationRoute(Routable):
         super().__init__()
         self.appController = ApplicationController(base_dir, configuration)
         self.appUnitController = AppUnitController(base_dir, configuration)
+        self.changeController = ChangeController(base_dir)
         self.security = HTTPBearer()
         self.routeBase = RouteBase()
         
@@ -49,7 +51,7 @@ class ApplicationRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return self.appController.getApps(_token)
+                return await self.appController.getApps(_token, self.routeBase.get_if_none_match(req))
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -60,6 +62,56 @@ class ApplicationRoute(Routable):
         finally:
             del _token
 
+    """API route to retrieve the apps changed since a version, for incremental sync.
+
+    Args:
+        req (Request): The HTTP request.
+        since (int): The change version the client holds, 0 for a full sync.
+        limit (int): The maximum number of changes to return.
+
+    Returns:
+        ResponseModel: A response containing the new version and the upserted and deleted apps.
+    """
+    @get("/changes", response_model=ResponseModel)
+    async def get_app_changes(self, req: Request, since: int = Query(0), limit: int = Query(None)):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_app_changes.__name__}: {datetime.now()}]: [INFO] - Retrieving apps changed since version {since}")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return await self.changeController.getChanges(self.changeController.change_mgr.app, since, limit, _token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_app_changes.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    """API route to retrieve the app units changed since a version, for incremental sync.
+
+    Args:
+        req (Request): The HTTP request.
+        since (int): The change version the client holds, 0 for a full sync.
+        limit (int): The maximum number of changes to return.
+
+    Returns:
+        ResponseModel: A response containing the new version and the upserted and deleted app units.
+    """
+    @get("/appunits/changes", response_model=ResponseModel)
+    async def get_app_unit_changes(self, req: Request, since: int = Query(0), limit: int = Query(None)):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_app_unit_changes.__name__}: {datetime.now()}]: [INFO] - Retrieving app units changed since version {since}")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return await self.changeController.getChanges(self.changeController.change_mgr.appUnitTable, since, limit, _token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_app_unit_changes.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
     """API route to retrieve a specific application.
 
     Args:
@@ -137,7 +189,7 @@ class ApplicationRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
             
             if _token is not None:
-                return self.appController.updateApp(aid, application.name, application.ip, application.rest_port, application.ws_port, application.zid, application.key, application.desc, application.enable, application.cid, _token)
+                return await self.appController.updateApp(aid, application.name, application.ip, application.rest_port, application.ws_port, application.zid, application.key, application.desc, application.enable, application.cid, _token)
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -248,7 +300,7 @@ class ApplicationRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return await self.appUnitController.getAppUnits( _token, zid, cid)
+                return await self.appUnitController.getAppUnits( _token, zid, cid, self.routeBase.get_if_none_match(req))
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -36,6 +36,11 @@ class RouteBase:
         return _token
 
 
+    """Returns the If-None-Match header of the request, or None when the client sent none."""
+    def get_if_none_match(self, req):
+        return req.headers.get("if-none-match")
+
+
     """Generates a JSON response.
 
     Args:
@@ -99,6 +104,10 @@ class App(BaseModel):
     ip: str
     rest_port: int
 
+class AppBatch(BaseModel):
+    aids: list[int]
+    endpoints: list[str] = ["status", "info"]
+
 class CompanyModel(BaseModel):
     name: str
     enable: int
@@ -14,16 +14,18 @@
 from datetime import datetime
 import logging
 from classy_fastapi import Routable, get, delete, post, put
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from src.routers.base.routeBase import ResponseModel, CompanyModel, RouteBase
 from src.controller.companyController import CompanyController
+from src.controller.changeController import ChangeController
 
 # from routes.base.routeBase import ResponseModel
 class CompanyRoute(Routable):
     def __init__(self, base_dir) -> None:
         super().__init__()
         self.companyController = CompanyController(base_dir)
+        self.changeController = ChangeController(base_dir)
         self.routeBase = RouteBase()
 
 
@@ -42,7 +44,7 @@ class CompanyRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return self.companyController.getCompanies(_token)
+                return self.companyController.getCompanies(_token, self.routeBase.get_if_none_match(req))
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -51,6 +53,31 @@ class CompanyRoute(Routable):
             raise HTTPException(status_code=500, detail="Internal Server Error")
     
 
+    """API route to retrieve the companies changed since a version, for incremental sync.
+
+    Args:
+        req (Request): The HTTP request.
+        since (int): The change version the client holds, 0 for a full sync.
+        limit (int): The maximum number of changes to return.
+
+    Returns:
+        ResponseModel: A response containing the new version and the upserted and deleted companies.
+    """
+    @get("/changes", response_model=ResponseModel)
+    async def get_company_changes(self, req: Request, since: int = Query(0), limit: int = Query(None)):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_company_changes.__name__}: {datetime.now()}]: [INFO] - Retrieving companies changed since version {since}")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return await self.changeController.getChanges(self.changeController.change_mgr.company, since, limit, _token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_company_changes.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
     """API route to retrieve a specific company.
 
     Args:
@@ -142,7 +169,7 @@ class CompanyRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return self.companyController.deleteCompany(cid, _token)
+                return await self.companyController.deleteCompany(cid, _token)
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -0,0 +1,35 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from classy_fastapi import Routable, get
+from fastapi import Query, Request
+from src.routers.base.routeBase import RouteBase
+from src.controller.eventController import EventController
+
+
+class EventRoute(Routable):
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.eventController = EventController(base_dir)
+        self.routeBase = RouteBase()
+
+
+    """ API route streaming app state transitions (up/down, latency class, config reload) as server-sent events; ?token= for EventSource clients """
+    @get("")
+    async def stream_events(self, req: Request, token: str = Query(None)):
+        if token is None:
+            token = self.routeBase.verify_auth_token_type(req.headers.get("authorization", ""))
+        if token is None:
+            return self.routeBase.generate_response(None, 401)
+        else:
+            return await self.eventController.streamEvents(req.headers.get("last-event-id"), req.headers.get("accept-encoding"), token)
@@ -14,16 +14,18 @@
 from datetime import datetime
 import logging
 from classy_fastapi import Routable, get, delete, post, put
-from fastapi import HTTPException, Request
+from fastapi import HTTPException, Query, Request
 from fastapi.responses import JSONResponse
 from src.routers.base.routeBase import ResponseModel, RouteBase, UserModel
 from src.controller.userController import UserController
+from src.controller.changeController import ChangeController
 
 # from routes.base.routeBase import ResponseModel
 class UserRoute(Routable):
     def __init__(self, base_dir) -> None:
         super().__init__()
         self.userController = UserController(base_dir)
+        self.changeController = ChangeController(base_dir)
         self.routeBase = RouteBase()
 
         
@@ -43,7 +45,7 @@ class UserRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return self.userController.getUsers(_token)
+                return self.userController.getUsers(_token, self.routeBase.get_if_none_match(req))
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -52,6 +54,31 @@ class UserRoute(Routable):
             logging.error(f"[{self.__class__.__name__}: {self.get_all_users.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal Server Error")
 
+    """API route to retrieve the users changed since a version, for incremental sync.
+
+    Args:
+        req (Request): The HTTP request.
+        since (int): The change version the client holds, 0 for a full sync.
+        limit (int): The maximum number of changes to return.
+
+    Returns:
+        ResponseModel: A response containing the new version and the upserted and deleted users.
+    """
+    @get("/changes", response_model=ResponseModel)
+    async def get_user_changes(self, req: Request, since: int = Query(0), limit: int = Query(None)):
+        try:
+            logging.info(f"[{self.__class__.__name__}: {self.get_user_changes.__name__}: {datetime.now()}]: [INFO] - Retrieving users changed since version {since}")
+            _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
+
+            if _token is not None:
+                return await self.changeController.getChanges(self.changeController.change_mgr.user, since, limit, _token)
+            else:
+                return self.routeBase.generate_response(None, 401)
+
+        except Exception as e:
+            logging.error(f"[{self.__class__.__name__}: {self.get_user_changes.__name__}: {datetime.now()}]: [ERROR] - An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal Server Error")
+
     """API route to retrieve a specific user.
 
     Args:
@@ -144,7 +171,7 @@ class UserRoute(Routable):
             _token = self.routeBase.verify_auth_token_type(req.headers["authorization"])
 
             if _token is not None:
-                return self.userController.deleteUser(uid, _token)
+                return await self.userController.deleteUser(uid, _token)
             else:
                 return self.routeBase.generate_response(None, 401)
 
@@ -0,0 +1,33 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+from classy_fastapi import Routable
+from classy_fastapi.decorators import websocket
+from fastapi import Query, WebSocket
+from src.routers.base.routeBase import RouteBase
+from src.controller.wsController import WsController
+
+
+class WsRoute(Routable):
+    def __init__(self, base_dir) -> None:
+        super().__init__()
+        self.wsController = WsController(base_dir)
+        self.routeBase = RouteBase()
+
+
+    """ WebSocket route relaying an app stream: /ws/app/{aid}/{endpoint}?token=<access token> (or an Authorization: Bearer header) """
+    @websocket("/app/{aid}/{endpoint}")
+    async def app_stream(self, ws: WebSocket, aid: int, endpoint: str, token: str = Query(None)):
+        if token is None and "authorization" in ws.headers:
+            token = self.routeBase.verify_auth_token_type(ws.headers["authorization"])
+        await self.wsController.proxyAppStream(ws, aid, endpoint, token)
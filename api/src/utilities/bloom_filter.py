@@ -0,0 +1,45 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import hashlib
+
+
+"""Bloom filter over strings.
+
+    might_contain() never answers False for an added item; it answers True for an item that was
+    not added with a probability that grows with the fill (about 1% at 10 bits per item and 7 hashes).
+    The k positions come from one SHA-256 digest (double hashing).
+"""
+class BloomFilter:
+    def __init__(self, size_bits: int, hashes: int):
+        self.size_bits = max(int(size_bits), 8)
+        self.hashes = max(int(hashes), 1)
+        self.count = 0
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+
+    def _positions(self, item: str):
+        _digest = hashlib.sha256(item.encode("utf-8")).digest()
+        _h1 = int.from_bytes(_digest[:8], "little")
+        _h2 = int.from_bytes(_digest[8:16], "little") | 1
+        return [(_h1 + _i * _h2) % self.size_bits for _i in range(self.hashes)]
+
+
+    def add(self, item: str):
+        for _position in self._positions(item):
+            self._bits[_position >> 3] |= 1 << (_position & 7)
+        self.count += 1
+
+
+    def might_contain(self, item: str):
+        return all(self._bits[_position >> 3] & (1 << (_position & 7)) for _position in self._positions(item))
@@ -0,0 +1,134 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import threading
+import time
+import httpx
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of calling a target whose circuit is open."""
+
+    def __init__(self, target: str, retry_in: float):
+        super().__init__(f"Circuit open for {target}, retry in {retry_in:.1f}s")
+        self.target = target
+        self.retry_in = retry_in
+
+
+"""Circuit breaker of one upstream target.
+
+    closed     calls go through; failure_threshold consecutive failures open the circuit.
+    open       calls are rejected without touching the network until reset_timeout has passed.
+               The failure is remembered (negative cache), so a dead target costs nothing per call.
+    half_open  a single probe call is let through: success closes the circuit, failure opens it
+               again for twice as long, up to max_reset_timeout.
+"""
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, target: str, failure_threshold: int, reset_timeout: float, max_reset_timeout: float):
+        self.target = target
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._open_for = reset_timeout
+        self._retry_at = 0.0
+        self._probing = False
+        self._last_error = None
+        self._last_failure = None
+        self._opened = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+
+    def allow(self):
+        """Return True when a call may go through, reserving the probe of a half-open circuit."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() >= self._retry_at:
+                self._state = self.HALF_OPEN
+                self._probing = False
+
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+
+            self._rejected += 1
+            return False
+
+
+    def retry_in(self):
+        """Seconds until the next call is let through."""
+        with self._lock:
+            return max(self._retry_at - time.monotonic(), 0.0) if self._state != self.CLOSED else 0.0
+
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._open_for = self.reset_timeout
+            self._probing = False
+
+
+    def record_failure(self, error: str):
+        """Count a failed call. Returns True when it opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            self._last_failure = time.time()
+
+            if self._state == self.HALF_OPEN:
+                self._open_for = min(self._open_for * 2, self.max_reset_timeout)
+                self._trip()
+                return True
+            elif self._state == self.CLOSED and self._failures >= self.failure_threshold:
+                self._trip()
+                return True
+            return False
+
+
+    def release(self):
+        """Give back the probe of a half-open circuit when the call ended without a result (cancelled)."""
+        with self._lock:
+            self._probing = False
+
+
+    def _trip(self):
+        # caller holds the lock
+        self._state = self.OPEN
+        self._retry_at = time.monotonic() + self._open_for
+        self._probing = False
+        self._opened += 1
+
+
+    def get_state(self):
+        """Return the state, counters and last error of the circuit."""
+        with self._lock:
+            return {
+                "target": self.target,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in": max(self._retry_at - time.monotonic(), 0.0) if self._state != self.CLOSED else 0.0,
+                "open_for": self._open_for,
+                "opened": self._opened,
+                "rejected": self._rejected,
+                "last_error": self._last_error,
+                "last_failure": self._last_failure,
+            }
@@ -0,0 +1,105 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import json
+import sys
+import threading
+
+
+"""Compact read-only row of a cached table.
+
+    One slot per column instead of a dict per row (no per-row hash table), made by record_class for
+    a table and its column list. Hidden columns (the app key) are kept in their slot but are not
+    readable by item and never projected. The JSON of the projection is encoded once, when the
+    record is made, so a response is written from it without building a dict.
+
+    Reading by item (record['ip'], record.get('ip')) works as on the row dict it replaces.
+"""
+class Record:
+    __slots__ = ("json",)
+    _columns = ()
+    _public = ()
+    _readable = frozenset()
+
+    def __init__(self, *values):
+        for _column, _value in zip(self._columns, values):
+            object.__setattr__(self, _column, _value)
+        object.__setattr__(self, "json", json.dumps({_column: getattr(self, _column) for _column in self._public},
+                                                    ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8"))
+
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is read-only")
+
+
+    def __getitem__(self, column):
+        if column not in self._readable:
+            raise KeyError(column)
+        return getattr(self, column)
+
+
+    def __contains__(self, column):
+        return column in self._readable
+
+
+    def get(self, column, default=None):
+        return getattr(self, column) if column in self._readable else default
+
+
+    def hidden(self, column, default=None):
+        """Return a hidden column (or any other)."""
+        return getattr(self, column, default)
+
+
+    def as_dict(self, hidden=False):
+        """Return the row as a new dict, with the hidden columns when asked for."""
+        return {_column: getattr(self, _column) for _column in (self._columns if hidden else self._public)}
+
+
+    def size(self):
+        """Approximate bytes held by the record, its values and its JSON."""
+        return sys.getsizeof(self) + sys.getsizeof(self.json) + sum(sys.getsizeof(getattr(self, _column)) for _column in self._columns)
+
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.as_dict()})"
+
+
+_record_classes = {}
+_record_classes_lock = threading.Lock()
+
+
+def record_class(table: str, columns, hidden=()):
+    """Return the record class of a table for a column list, made on first use."""
+    _key = (table, tuple(columns), tuple(hidden))
+    _cls = _record_classes.get(_key)
+    if _cls is None:
+        with _record_classes_lock:
+            _cls = _record_classes.get(_key)
+            if _cls is None:
+                _clashes = [_column for _column in _key[1] if not _column.isidentifier() or hasattr(Record, _column)]
+                if _clashes:
+                    raise ValueError(f"Columns {_clashes} of {table} cannot be record slots")
+                _cls = type(f"{table[:1].upper()}{table[1:]}Record", (Record,), {
+                    "__slots__": _key[1],
+                    "_columns": _key[1],
+                    "_public": tuple(_column for _column in _key[1] if _column not in _key[2]),
+                    "_readable": frozenset(_column for _column in _key[1] if _column not in _key[2]),
+                })
+                _record_classes[_key] = _cls
+    return _cls
+
+
+def make_record(table: str, row: dict, hidden=()):
+    """Return the record of a row dict (as read by DBManager.executeQuery)."""
+    return record_class(table, row.keys(), hidden)(*row.values())
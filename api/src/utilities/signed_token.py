@@ -0,0 +1,75 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import base64
+import hashlib
+import hmac
+import json
+import math
+import secrets
+import time
+
+
+def _b64encode(data: bytes):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+"""Self-contained auth tokens signed with HMAC-SHA256.
+
+    A token is v1.<payload>.<signature>, both parts base64url without padding. The payload is the
+    JSON of the claims plus exp (expiry, epoch seconds) and jti (random id used for revocation), so
+    any worker holding the secret validates a token without a lookup. The payload is signed, not
+    encrypted.
+"""
+class TokenSigner:
+    PREFIX = "v1."
+
+    def __init__(self, secret: bytes, ttl: float):
+        self.secret = secret
+        self.ttl = ttl
+
+
+    def _sign(self, payload: str):
+        return _b64encode(hmac.new(self.secret, (self.PREFIX + payload).encode("ascii"), hashlib.sha256).digest())
+
+
+    def is_signed(self, token: str):
+        return token.startswith(self.PREFIX)
+
+
+    def issue(self, claims: dict):
+        """Return a token for claims, valid for ttl seconds."""
+        _claims = {**claims, "exp": math.floor(time.time() + self.ttl), "jti": _b64encode(secrets.token_bytes(12))}
+        _payload = _b64encode(json.dumps(_claims, separators=(",", ":")).encode("utf-8"))
+        return f"{self.PREFIX}{_payload}.{self._sign(_payload)}"
+
+
+    def verify(self, token: str):
+        """Return the claims of a token, or None when it is malformed, forged or expired."""
+        if not self.is_signed(token):
+            return None
+        _payload, _, _signature = token[len(self.PREFIX):].partition(".")
+        try:
+            if not _payload or not _signature or not hmac.compare_digest(_signature.encode("ascii"), self._sign(_payload).encode("ascii")):
+                return None
+            _claims = json.loads(_b64decode(_payload))
+        except ValueError:
+            # not ascii, not base64 or not JSON
+            return None
+        if not isinstance(_claims, dict) or _claims.get("exp", 0) < time.time():
+            return None
+        return _claims
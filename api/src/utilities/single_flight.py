@@ -0,0 +1,94 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import asyncio
+from functools import partial
+import threading
+import time
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+"""Coalesces concurrent identical calls.
+
+    The first caller for a key runs the call as a task; callers arriving while it is in flight
+    await the same task instead of starting their own. With a ttl above 0 a successful result is
+    also reused for that many seconds after it completes. The task is shielded, so a caller that
+    is cancelled (client disconnect, deadline) does not cancel the call for the others.
+"""
+class SingleFlight:
+    def __init__(self, ttl: float = 0.0, max_results: int = 4096):
+        self.ttl = ttl
+        self.max_results = max_results
+        self._calls = {}
+        self._results = {}
+        self._metrics = {"calls": 0, "executed": 0, "shared": 0, "ttl_hits": 0}
+
+
+    async def do(self, key, fn):
+        """Return the result of fn() for the key, sharing an in-flight or recent call when there is one."""
+        self._metrics["calls"] += 1
+
+        _cached = self._results.get(key)
+        if _cached is not None and _cached[1] > time.monotonic():
+            self._metrics["ttl_hits"] += 1
+            return _cached[0]
+
+        _task = self._calls.get(key)
+        if _task is None:
+            _task = asyncio.ensure_future(fn())
+            self._calls[key] = _task
+            _task.add_done_callback(partial(self._done, key))
+            self._metrics["executed"] += 1
+        else:
+            self._metrics["shared"] += 1
+
+        return await asyncio.shield(_task)
+
+
+    def _done(self, key, task):
+        self._calls.pop(key, None)
+        # reading the exception also marks it retrieved when nobody is left waiting
+        if task.cancelled() or task.exception() is not None or self.ttl <= 0:
+            return
+
+        _now = time.monotonic()
+        if len(self._results) >= self.max_results:
+            self._results = {_key: _value for _key, _value in self._results.items() if _value[1] > _now}
+        if len(self._results) < self.max_results:
+            self._results[key] = (task.result(), _now + self.ttl)
+
+
+    def get_metrics(self):
+        """Return the call counters and the share of calls answered without a new upstream call."""
+        _metrics = dict(self._metrics)
+        _metrics["hit_rate"] = (_metrics["shared"] + _metrics["ttl_hits"]) / _metrics["calls"] if _metrics["calls"] else 0.0
+        _metrics["in_flight"] = len(self._calls)
+        _metrics["ttl"] = self.ttl
+        return _metrics
+
+
+"""Return the process-wide SingleFlight registered under the name, creating it on first use."""
+def get_single_flight(name: str, ttl: float = 0.0):
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = SingleFlight(ttl)
+        return _groups[name]
+
+
+"""Return the metrics of every registered SingleFlight."""
+def get_single_flight_metrics():
+    with _groups_lock:
+        return {_name: _group.get_metrics() for _name, _group in _groups.items()}
@@ -0,0 +1,229 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+import logging
+import threading
+import time
+import httpx
+from src.utilities.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utilities.settings import get_config
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+"""Shared async HTTP client for the calls made to the monitored apps.
+
+    One httpx.AsyncClient is kept per process, so connections to each app (host:port) stay open
+    between requests instead of a new TCP connection per call. Connection limits and timeouts come
+    from the [upstream] config section. The client is bound to the event loop it was created on and
+    is recreated if it is used from another one. Every target (host:port) has a circuit breaker, so
+    calls to an app that keeps failing raise CircuitOpenError at once instead of waiting for a timeout.
+"""
+@singleton
+class UpstreamClient:
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=int(get_config("UPSTREAM_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(get_config("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", 20)),
+            keepalive_expiry=float(get_config("UPSTREAM_KEEPALIVE_EXPIRY", 30)),
+        )
+        self.timeout = httpx.Timeout(
+            float(get_config("UPSTREAM_TIMEOUT", 5)),
+            connect=float(get_config("UPSTREAM_CONNECT_TIMEOUT", 2)),
+            pool=float(get_config("UPSTREAM_POOL_TIMEOUT", 5)),
+        )
+
+        self.breaker_failure_threshold = int(get_config("BREAKER_FAILURE_THRESHOLD", 3))
+        self.breaker_reset_timeout = float(get_config("BREAKER_RESET_TIMEOUT", 10))
+        self.breaker_max_reset_timeout = float(get_config("BREAKER_MAX_RESET_TIMEOUT", 120))
+
+        self._client = None
+        self._breakers = {}
+        self._loop = None
+        self._lock = threading.Lock()
+        self._metrics = {"requests": 0, "errors": 0, "timeouts": 0, "in_flight": 0}
+        self._hosts = {}
+
+
+    def _get_client(self):
+        _loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not _loop:
+            self._client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._loop = _loop
+            logging.info(f"[{self.__class__.__name__}: {self._get_client.__name__}: {datetime.now()}]: [INFO] - Upstream client created with {self.limits.max_connections} connection(s), {self.limits.max_keepalive_connections} kept alive")
+        return self._client
+
+
+    def _get_breaker(self, host: str):
+        with self._lock:
+            _breaker = self._breakers.get(host)
+            if _breaker is None:
+                _breaker = CircuitBreaker(host, self.breaker_failure_threshold, self.breaker_reset_timeout, self.breaker_max_reset_timeout)
+                self._breakers[host] = _breaker
+            return _breaker
+
+
+    def _record_failure(self, breaker, error: str):
+        if breaker.record_failure(error):
+            logging.warning(f"[{self.__class__.__name__}: {self._record_failure.__name__}: {datetime.now()}]: [WARNING] - Circuit opened for {breaker.target} for {breaker.retry_in():.0f}s after: {error}")
+
+
+    def _record(self, host: str, elapsed_ms: float, error: bool = False, timeout: bool = False):
+        with self._lock:
+            self._metrics["requests"] += 1
+            self._metrics["in_flight"] -= 1
+            self._metrics["errors"] += error
+            self._metrics["timeouts"] += timeout
+
+            _host = self._hosts.setdefault(host, {"requests": 0, "errors": 0, "timeouts": 0, "latency_total_ms": 0.0, "latency_max_ms": 0.0})
+            _host["requests"] += 1
+            _host["errors"] += error
+            _host["timeouts"] += timeout
+            _host["latency_total_ms"] += elapsed_ms
+            if elapsed_ms > _host["latency_max_ms"]:
+                _host["latency_max_ms"] = elapsed_ms
+
+
+    async def request(self, method: str, url: str, **kwargs):
+        """Send a request through the shared client. Raises httpx.HTTPError on failure, CircuitOpenError without calling when the target's circuit is open."""
+        _client = self._get_client()
+        _host = httpx.URL(url).netloc.decode("ascii")
+        _breaker = self._get_breaker(_host)
+        if not _breaker.allow():
+            raise CircuitOpenError(_host, _breaker.retry_in())
+
+        with self._lock:
+            self._metrics["in_flight"] += 1
+
+        _started = time.perf_counter()
+        try:
+            _response = await _client.request(method, url, **kwargs)
+        except httpx.TimeoutException as e:
+            self._record(_host, (time.perf_counter() - _started) * 1000, error=True, timeout=True)
+            self._record_failure(_breaker, f"{type(e).__name__}: {str(e)}")
+            raise
+        except Exception as e:
+            self._record(_host, (time.perf_counter() - _started) * 1000, error=True)
+            self._record_failure(_breaker, f"{type(e).__name__}: {str(e)}")
+            raise
+        except BaseException:
+            # cancelled: no verdict on the target
+            self._record(_host, (time.perf_counter() - _started) * 1000)
+            _breaker.release()
+            raise
+
+        self._record(_host, (time.perf_counter() - _started) * 1000, error=_response.status_code >= 500)
+        if _response.status_code >= 500:
+            self._record_failure(_breaker, f"HTTP {_response.status_code}")
+        else:
+            _breaker.record_success()
+        return _response
+
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs):
+        """Send a request and yield the response before its body is read (httpx streaming). Same errors as request()."""
+        _client = self._get_client()
+        _host = httpx.URL(url).netloc.decode("ascii")
+        _breaker = self._get_breaker(_host)
+        if not _breaker.allow():
+            raise CircuitOpenError(_host, _breaker.retry_in())
+
+        with self._lock:
+            self._metrics["in_flight"] += 1
+
+        _started = time.perf_counter()
+        _error, _timeout = False, False
+        try:
+            async with _client.stream(method, url, **kwargs) as _response:
+                if _response.status_code >= 500:
+                    _error = True
+                    self._record_failure(_breaker, f"HTTP {_response.status_code}")
+                else:
+                    _breaker.record_success()
+                yield _response
+        except httpx.TimeoutException as e:
+            _error, _timeout = True, True
+            self._record_failure(_breaker, f"{type(e).__name__}: {str(e)}")
+            raise
+        except httpx.HTTPError as e:
+            _error = True
+            self._record_failure(_breaker, f"{type(e).__name__}: {str(e)}")
+            raise
+        except BaseException:
+            # cancelled or failed on our side: no verdict on the target
+            _breaker.release()
+            raise
+        finally:
+            self._record(_host, (time.perf_counter() - _started) * 1000, error=_error, timeout=_timeout)
+
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+
+    def get_metrics(self):
+        """Return request counters, per-host latency and the open connections of the pool."""
+        with self._lock:
+            _metrics = dict(self._metrics)
+            _hosts = {_host: dict(_values) for _host, _values in self._hosts.items()}
+
+        for _values in _hosts.values():
+            _values["latency_avg_ms"] = _values["latency_total_ms"] / _values["requests"] if _values["requests"] else 0.0
+
+        _connections = {"open": 0, "idle": 0}
+        _pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        for _connection in getattr(_pool, "connections", []):
+            _host = f"{_connection._origin.host.decode('ascii')}:{_connection._origin.port}"
+            _idle = _connection.is_idle()
+            _connections["open"] += 1
+            _connections["idle"] += _idle
+            _host_metrics = _hosts.setdefault(_host, {})
+            _host_metrics["connections_open"] = _host_metrics.get("connections_open", 0) + 1
+            _host_metrics["connections_idle"] = _host_metrics.get("connections_idle", 0) + _idle
+
+        _metrics.update({
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry": self.limits.keepalive_expiry,
+            "connections": _connections,
+            "hosts": _hosts,
+        })
+        return _metrics
+
+
+    def get_breakers(self):
+        """Return the circuit breaker state of every target called so far."""
+        with self._lock:
+            _breakers = list(self._breakers.values())
+        return [_breaker.get_state() for _breaker in _breakers]
+
+
+    async def close(self):
+        """Close every pooled connection."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
@@ -0,0 +1,286 @@
+#######################################################################################################
+# Author        :   K.G.Lahiru GImhana Dayananda  | 19/03/2024
+# Copyright     :   Zaion.AI 2024
+# Class/module  :   Agent assist monitoring REST API
+# Objective     :   Create the FastAPI server API endpoints
+#######################################################################################################
+# Author                        Date        Action      Description
+#------------------------------------------------------------------------------------------------------
+# K.G.Lahiru GImhana Dayananda  19/03/2024  Created     Created the initial version
+#
+
+# #######################################################################################################
+
+import asyncio
+from collections import deque
+from datetime import datetime
+import logging
+import random
+import time
+import websockets
+from src.utilities.settings import get_config
+
+
+def singleton(cls):
+    instances = {}
+
+    def get_instance():
+        if cls not in instances:
+            instances[cls] = cls()
+        return instances[cls]
+
+    return get_instance
+
+
+class SubscriptionClosed(Exception):
+    """Raised by Subscription.get once the subscription is closed."""
+
+
+"""One viewer of an upstream stream.
+
+    Frames wait in a bounded queue; when it is full the oldest frame is dropped, so a slow
+    browser only loses its own backlog and never holds up the upstream reader or other viewers.
+"""
+class Subscription:
+    def __init__(self, key, queue_size: int, info: dict = None):
+        self.key = key
+        self.info = info or {}
+        self.created = time.time()
+        self.heartbeats = 0
+        self.frames_in = 0
+        self.frames_out = 0
+        self.bytes_out = 0
+        self.dropped = 0
+        self._queue = deque(maxlen=queue_size)
+        self._ready = asyncio.Event()
+        self._closed = False
+
+
+    def push(self, frame):
+        if self._closed:
+            return
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append(frame)
+        self.frames_in += 1
+        self._ready.set()
+
+
+    async def get(self, timeout: float = None):
+        """Wait for the next frame. Returns None when timeout passes without one."""
+        while not self._queue:
+            if self._closed:
+                raise SubscriptionClosed()
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        _frame = self._queue.popleft()
+        self.frames_out += 1
+        self.bytes_out += len(_frame)
+        return _frame
+
+
+    def close(self):
+        self._closed = True
+        self._ready.set()
+
+
+    def get_metrics(self):
+        _elapsed = max(time.time() - self.created, 1e-3)
+        return {
+            **self.info,
+            "key": list(self.key),
+            "connected_for": _elapsed,
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "bytes_out": self.bytes_out,
+            "frames_per_second": self.frames_out / _elapsed,
+            "bytes_per_second": self.bytes_out / _elapsed,
+            "dropped": self.dropped,
+            "queued": len(self._queue),
+            "heartbeats": self.heartbeats,
+        }
+
+
+"""One upstream WebSocket shared by every subscription to the same (app, endpoint)."""
+class UpstreamStream:
+    def __init__(self, key, url: str, headers: dict, queue_size: int):
+        self.key = key
+        self.url = url
+        self.headers = headers
+        self.queue_size = queue_size
+        self.subscriptions = set()
+        self.task = None
+        self.idle_handle = None
+        self.connected = False
+        self.connects = 0
+        self.frames_in = 0
+        self.bytes_in = 0
+        self.last_error = None
+
+
+    def broadcast(self, frame):
+        self.frames_in += 1
+        self.bytes_in += len(frame)
+        for _subscription in list(self.subscriptions):
+            _subscription.push(frame)
+
+
+    async def run(self, reconnect_delay: float, max_reconnect_delay: float):
+        """Relay upstream frames to the subscriptions, reconnecting with backoff, until cancelled."""
+        _delay = reconnect_delay
+        while True:
+            try:
+                async with websockets.connect(self.url, extra_headers=self.headers, open_timeout=10, max_size=None) as _remote:
+                    self.connected = True
+                    self.connects += 1
+                    _delay = reconnect_delay
+                    logging.info(f"[{self.__class__.__name__}: {self.run.__name__}: {datetime.now()}]: [INFO] - Upstream {self.url} connected for {len(self.subscriptions)} viewer(s)")
+                    async for _frame in _remote:
+                        self.broadcast(_frame)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {str(e)}"
+                logging.warning(f"[{self.__class__.__name__}: {self.run.__name__}: {datetime.now()}]: [WARNING] - Upstream {self.url} failed: {self.last_error}")
+            finally:
+                self.connected = False
+
+            await asyncio.sleep(_delay * random.uniform(0.8, 1.2))
+            _delay = min(_delay * 2, max_reconnect_delay)
+
+
+    def get_metrics(self):
+        return {
+            "key": list(self.key),
+            "url": self.url,
+            "connected": self.connected,
+            "connects": self.connects,
+            "subscribers": len(self.subscriptions),
+            "frames_in": self.frames_in,
+            "bytes_in": self.bytes_in,
+            "last_error": self.last_error,
+            "idle_closing": self.idle_handle is not None,
+        }
+
+
+"""Fan-out of monitored-app WebSocket streams.
+
+    The hub holds at most one upstream connection per (aid, endpoint) and broadcasts every frame
+    to all its subscriptions. Subscriptions are reference counted: when the last one leaves, the
+    upstream is kept for ws_idle_timeout seconds so a page reload or a quick tab switch reuses it,
+    then closed.
+"""
+@singleton
+class WebSocketHub:
+    def __init__(self):
+        self.queue_size = int(get_config("WS_QUEUE_SIZE", 100))
+        self.idle_timeout = float(get_config("WS_IDLE_TIMEOUT", 30))
+        self.reconnect_delay = float(get_config("WS_RECONNECT_DELAY", 1))
+        self.max_reconnect_delay = float(get_config("WS_MAX_RECONNECT_DELAY", 30))
+        self._streams = {}
+        self._loop = None
+
+
+    def subscribe(self, key, url: str, headers: dict = None, info: dict = None):
+        """Subscribe to the stream of key, connecting upstream if nobody is subscribed yet. info is reported with the subscription metrics."""
+        self._loop = asyncio.get_running_loop()
+        _stream = self._streams.get(key)
+        if _stream is None or _stream.url != url:
+            if _stream is not None:
+                # the app moved (new ip / port): the old upstream goes, its viewers move over
+                self._close_stream(_stream)
+            _stream = UpstreamStream(key, url, headers or {}, self.queue_size)
+            self._streams[key] = _stream
+
+        if _stream.idle_handle is not None:
+            _stream.idle_handle.cancel()
+            _stream.idle_handle = None
+        if _stream.task is None:
+            _stream.task = asyncio.get_running_loop().create_task(_stream.run(self.reconnect_delay, self.max_reconnect_delay))
+
+        _subscription = Subscription(key, self.queue_size, info)
+        _stream.subscriptions.add(_subscription)
+        return _subscription
+
+
+    def unsubscribe(self, subscription):
+        """Drop a subscription; the upstream is closed once it stayed without subscribers for idle_timeout."""
+        subscription.close()
+        _stream = self._streams.get(subscription.key)
+        if _stream is None:
+            return
+        _stream.subscriptions.discard(subscription)
+        if not _stream.subscriptions and _stream.idle_handle is None:
+            _stream.idle_handle = asyncio.get_running_loop().call_later(self.idle_timeout, self._close_if_idle, _stream)
+
+
+    def _close_if_idle(self, stream):
+        stream.idle_handle = None
+        if not stream.subscriptions and self._streams.get(stream.key) is stream:
+            self._close_stream(stream)
+
+
+    def _close_stream(self, stream):
+        if self._streams.get(stream.key) is stream:
+            del self._streams[stream.key]
+        if stream.idle_handle is not None:
+            stream.idle_handle.cancel()
+            stream.idle_handle = None
+        if stream.task is not None:
+            stream.task.cancel()
+        for _subscription in list(stream.subscriptions):
+            _subscription.close()
+        logging.info(f"[{self.__class__.__name__}: {self._close_stream.__name__}: {datetime.now()}]: [INFO] - Upstream {stream.url} closed")
+
+
+    def close_key(self, key):
+        """Close the upstream of key and end its subscriptions (app removed or disabled)."""
+        _stream = self._streams.get(key)
+        if _stream is not None:
+            self._close_stream(_stream)
+
+
+    def close_app(self, aid):
+        """Close every upstream of an app (keys are (aid, endpoint)). Safe to call from any thread, e.g. the invalidation bus."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            _running = asyncio.get_running_loop()
+        except RuntimeError:
+            _running = None
+        if _running is self._loop:
+            self._close_app(aid)
+        else:
+            self._loop.call_soon_threadsafe(self._close_app, aid)
+
+
+    def _close_app(self, aid):
+        for _key in [_key for _key in self._streams if _key[0] == aid]:
+            self.close_key(_key)
+
+
+    async def close(self):
+        """Close every upstream."""
+        _tasks = [_stream.task for _stream in self._streams.values() if _stream.task is not None]
+        for _stream in list(self._streams.values()):
+            self._close_stream(_stream)
+        await asyncio.gather(*_tasks, return_exceptions=True)
+
+
+    def get_metrics(self):
+        """Return the state of every upstream and the throughput counters of every subscription."""
+        _streams = [_stream.get_metrics() for _stream in list(self._streams.values())]
+        _connections = [_subscription.get_metrics() for _stream in list(self._streams.values()) for _subscription in list(_stream.subscriptions)]
+        return {
+            "upstreams": len(_streams),
+            "connected": sum(1 for _stream in _streams if _stream["connected"]),
+            "subscribers": sum(_stream["subscribers"] for _stream in _streams),
+            "queue_size": self.queue_size,
+            "idle_timeout": self.idle_timeout,
+            "streams": _streams,
+            "connections": _connections,
+        }
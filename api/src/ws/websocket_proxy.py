@@ -1,24 +1,54 @@
 # websocket_proxy.py
 import asyncio
+import time
 from fastapi import WebSocket, WebSocketDisconnect
-import websockets
+from src.ws.websocket_hub import WebSocketHub, SubscriptionClosed
 
-async def websocket_proxy(ip, port, endpoint, ws: WebSocket):
+async def websocket_proxy(ip, port, endpoint, ws: WebSocket, key=None, headers=None, info=None, heartbeat_interval=None, send_timeout=None):
+    # every viewer of the same app stream shares one upstream connection held by the hub
+    hub = WebSocketHub()
+    subscription = hub.subscribe(key or (ip, port, endpoint), f"ws://{ip}:{port}/app/{endpoint}", headers, info)
     try:
-        async with websockets.connect(f"ws://{ip}:{port}/app/{endpoint}") as remote_ws:
-            await ws.accept()
+        await ws.accept()
+
+        async def send(text):
+            # a browser that does not take a frame in time is dropped instead of holding its queue forever
+            await asyncio.wait_for(ws.send_text(text), send_timeout)
+
+        async def forward():
             while True:
-                response = await remote_ws.recv()
-                print(f"Received response from server: {response}")
-                await ws.send_text(f"{endpoint}: {response}")
-                if ws.client_state.name != "CONNECTED":
-                        break
-                # message = await ws.receive_text()
-                # await remote_ws.send(message)
-                # response = await remote_ws.recv()
-                # await ws.send_text(f"{endpoint}: {response}")
-    except websockets.exceptions.ConnectionClosedOK:
+                response = await subscription.get(heartbeat_interval)
+                if response is None:
+                    # nothing from the app for a while: tell the browser the link is still alive
+                    subscription.heartbeats += 1
+                    await send(f"heartbeat: {int(time.time())}")
+                    continue
+                await send(f"{endpoint}: {response if isinstance(response, str) else response.decode('utf-8', 'replace')}")
+
+        async def drain():
+            # nothing is sent upstream; reading only notices the browser going away
+            while True:
+                await ws.receive_text()
+
+        tasks = [asyncio.create_task(forward()), asyncio.create_task(drain())]
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            task.result()
+    except SubscriptionClosed:
+        # upstream closed by the hub (app removed or moved)
+        try:
+            await ws.close(code=1001)
+        except RuntimeError:
+            pass
+    except asyncio.TimeoutError:
+        try:
+            await ws.close(code=1008, reason="too slow")
+        except RuntimeError:
+            pass
+    except (WebSocketDisconnect, RuntimeError):
         pass
-    except WebSocketDisconnect as e:
-        # Handle WebSocket disconnect gracefully
-        print(f"WebSocket disconnected with code {e.code}.")
+    finally:
+        hub.unsubscribe(subscription)
@@ -13,6 +13,14 @@ const ProtectedRoute = () => {
     let interval;
     let timeout;
 
+    // signed tokens are renewed on validate, the new one comes back in X-Auth-Token
+    const storeRenewedToken = (response) => {
+      const renewedToken = response.headers?.["x-auth-token"];
+      if (renewedToken) {
+        sessionStorage.setItem("authToken", renewedToken);
+      }
+    };
+
     const checkAuthToken = async () => {
       const authToken = sessionStorage.getItem("authToken");
       if (!authToken) {
@@ -29,6 +37,7 @@ const ProtectedRoute = () => {
             setIsAuthenticated(false);
             logout();
           } else {
+            storeRenewedToken(response);
             clearTimeout(timeout); // Clear the timeout if response received successfully
             setRetrying(false);
           }
@@ -44,6 +53,7 @@ const ProtectedRoute = () => {
             try {
               const response = await authClient.get("auth/validate", authToken);
               if (response.status === 200) {
+                storeRenewedToken(response);
                 clearTimeout(timeout); // Clear the timeout if response received successfully
                 setRetrying(false); // Hide retrying message and spinner
                 retryCount = 0;